@@ -88,9 +88,110 @@ def organizar_arquivos(dataset_path, train_ratio=0.8):
     print(f"Total de imagens de validação: {num_val}")
     print("Dataset pronto para o treinamento.")
 
+# Classes do dataset unificado: as do contador de itens são mantidas e a
+# caixa (classe 0 do detector de ROI) passa a ser a classe 2
+CLASSES_UNIFICADO = ['item', 'divisor', 'caixa']
+MAPA_CLASSES_ROI = {0: 2}
+
+def _indexar_arquivos(diretorio, extensoes):
+    """Mapeia nome-base -> caminho para todos os arquivos (recursivo) com as extensões dadas."""
+    indice = {}
+    for raiz, _, arquivos in os.walk(diretorio):
+        for filename in arquivos:
+            base_name, ext = os.path.splitext(filename)
+            if ext.lower() in extensoes:
+                indice[base_name] = os.path.join(raiz, filename)
+    return indice
+
+def _ler_rotulos(caminho, mapa_classes=None):
+    """Lê as linhas de um rótulo YOLO, remapeando as classes se necessário."""
+    linhas = []
+    with open(caminho, 'r') as f:
+        for linha in f:
+            partes = linha.split()
+            if not partes:
+                continue
+            if mapa_classes:
+                partes[0] = str(mapa_classes.get(int(partes[0]), int(partes[0])))
+            linhas.append(' '.join(partes))
+    return linhas
+
+def mesclar_datasets(item_path, roi_path, destino_path, somente_comuns=True):
+    """
+    Mescla os datasets do contador de itens e do detector de ROI em um único
+    dataset de 3 classes (item, divisor, caixa) para treinar um modelo único.
+
+    Imagens presentes nos dois datasets recebem os rótulos de ambos. Imagens
+    anotadas em apenas um deles têm anotação parcial (ex.: caixa visível mas
+    não rotulada) e ensinariam o modelo a ignorar objetos reais; por isso só
+    são incluídas com somente_comuns=False.
+
+    O resultado fica em destino_path/images e destino_path/labels, pronto para
+    organizar_arquivos(), junto de um data.yaml.
+    """
+    print(f"--- Mesclando '{item_path}' + '{roi_path}' em '{destino_path}' ---")
+    extensoes_img = ('.jpg', '.jpeg', '.png')
+
+    imagens = _indexar_arquivos(os.path.join(item_path, 'images'), extensoes_img)
+    imagens.update(_indexar_arquivos(os.path.join(roi_path, 'images'), extensoes_img))
+    rotulos_itens = _indexar_arquivos(os.path.join(item_path, 'labels'), ('.txt',))
+    rotulos_roi = _indexar_arquivos(os.path.join(roi_path, 'labels'), ('.txt',))
+
+    comuns = set(rotulos_itens) & set(rotulos_roi)
+    candidatos = comuns if somente_comuns else set(rotulos_itens) | set(rotulos_roi)
+    parciais = len(set(rotulos_itens) ^ set(rotulos_roi))
+
+    dest_img_dir = os.path.join(destino_path, 'images')
+    dest_lbl_dir = os.path.join(destino_path, 'labels')
+    os.makedirs(dest_img_dir, exist_ok=True)
+    os.makedirs(dest_lbl_dir, exist_ok=True)
+
+    total = 0
+    for base_name in sorted(candidatos):
+        if base_name not in imagens:
+            print(f"[AVISO] Rótulo '{base_name}' sem imagem correspondente. Pulando.")
+            continue
+
+        linhas = []
+        if base_name in rotulos_itens:
+            linhas += _ler_rotulos(rotulos_itens[base_name])
+        if base_name in rotulos_roi:
+            linhas += _ler_rotulos(rotulos_roi[base_name], MAPA_CLASSES_ROI)
+
+        src_img_path = imagens[base_name]
+        shutil.copy2(src_img_path, os.path.join(dest_img_dir, os.path.basename(src_img_path)))
+        with open(os.path.join(dest_lbl_dir, f"{base_name}.txt"), 'w') as f:
+            f.write('\n'.join(linhas) + ('\n' if linhas else ''))
+        total += 1
+
+    data_yaml = os.path.join(destino_path, 'data.yaml')
+    with open(data_yaml, 'w') as f:
+        f.write("# Dataset unificado: contador de itens + detector de ROI\n")
+        f.write(f"path: '{os.path.abspath(destino_path)}'\n\n")
+        f.write("train: images/train\n")
+        f.write("val: images/val\n\n")
+        f.write(f"nc: {len(CLASSES_UNIFICADO)}\n")
+        f.write(f"names: {CLASSES_UNIFICADO}\n")
+
+    print("\n--- Mesclagem Concluída ---")
+    print(f"Imagens anotadas nos dois datasets: {len(comuns)}")
+    if somente_comuns and parciais:
+        print(f"[AVISO] {parciais} imagens anotadas em apenas um dataset foram ignoradas (anotação parcial).")
+    print(f"Total de imagens no dataset unificado: {total}")
+    print(f"Configuração gerada em: {data_yaml}")
+    return data_yaml
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Organiza um dataset YOLO em pastas de treino e validação.")
     parser.add_argument('--path', type=str, required=True, help='Caminho para o diretório raiz do dataset (ex: dataset/1_item_counter).')
+    parser.add_argument('--mesclar', nargs=2, metavar=('ITEM_DATASET', 'ROI_DATASET'),
+                        help='Mescla os datasets de itens e de ROI em um dataset de 3 classes no caminho --path.')
+    parser.add_argument('--incluir-parciais', action='store_true',
+                        help='Na mesclagem, inclui imagens anotadas em apenas um dos datasets.')
     args = parser.parse_args()
 
+    if args.mesclar:
+        mesclar_datasets(args.mesclar[0], args.mesclar[1], args.path,
+                         somente_comuns=not args.incluir_parciais)
+
     organizar_arquivos(args.path)
@@ -2,6 +2,13 @@ from ultralytics import YOLO
 import argparse
 import os
 
+from organizar_dataset import mesclar_datasets, organizar_arquivos
+
+# Datasets usados para montar o modelo unificado de 3 classes (caixa, item, divisor)
+DATASET_ITENS = 'dataset/1_item_counter'
+DATASET_ROI = 'dataset/2_roi_detector'
+DATASET_UNIFICADO = 'dataset/3_unificado'
+
 def treinar_modelo(data_path, epochs, imgsz, run_name):
     """
     Carrega um modelo YOLO pré-treinado e inicia o treinamento
@@ -34,17 +41,38 @@ def treinar_modelo(data_path, epochs, imgsz, run_name):
     print("\n-- Treinamento Concluído --")
     print(f"Resultados salvos em: {results.save_dir}")
 
+def preparar_dataset_unificado(destino=DATASET_UNIFICADO, incluir_parciais=False):
+    """
+    Mescla os datasets de itens e de ROI em um único dataset de 3 classes e
+    o divide em treino/validação. Retorna o caminho do data.yaml gerado.
+    """
+    data_path = mesclar_datasets(DATASET_ITENS, DATASET_ROI, destino,
+                                 somente_comuns=not incluir_parciais)
+    organizar_arquivos(destino)
+    return data_path
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Script para treinar um modelo YOLOv8.")
-    parser.add_argument('--data', type=str, required=True, help="Caminho para o arquivo data.yaml do dataset.")
+    parser.add_argument('--data', type=str, help="Caminho para o arquivo data.yaml do dataset.")
+    parser.add_argument('--unificado', action='store_true',
+                        help="Mescla 1_item_counter e 2_roi_detector e treina um modelo único de 3 classes (ignora --data).")
+    parser.add_argument('--incluir-parciais', action='store_true',
+                        help="Com --unificado, inclui imagens anotadas em apenas um dos datasets.")
     parser.add_argument('--epochs', type=int, default=100, help="Número de épocas para o treinamento.")
     parser.add_argument('--imgsz', type=int, default=640, help="Tamanho da imagem (altura e largura) para o treinamento.")
     parser.add_argument('--name', type=str, default='train', help="Nome da execução específica (run) que será salva dentro de 'runs/detect'.")
 
     args = parser.parse_args()
 
+    if args.unificado:
+        data_path = preparar_dataset_unificado(incluir_parciais=args.incluir_parciais)
+    elif args.data:
+        data_path = args.data
+    else:
+        parser.error("Informe --data ou --unificado.")
+
     treinar_modelo(
-        data_path=args.data,
+        data_path=data_path,
         epochs=args.epochs, 
         imgsz=args.imgsz,
         run_name=args.name
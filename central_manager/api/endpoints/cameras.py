@@ -3,6 +3,7 @@ Endpoints para gerenciamento de câmeras
 """
 
 import asyncio
+import time
 import cv2
 from fastapi import APIRouter, Request, HTTPException, Response
 from starlette.responses import StreamingResponse
@@ -76,24 +77,51 @@ async def stop_camera(camera_id: int, request: Request):
     orchestrator.stop_processor(camera_id)
     return {"message": f"Camera {camera_id} stopped."}
 
+@router.post("/{camera_id}/produto/{product_id}")
+async def change_camera_product(camera_id: int, product_id: int, request: Request):
+    """Troca o produto (e os modelos) de uma câmera."""
+    orchestrator = request.app.state.orchestrator
+    try:
+        await asyncio.to_thread(orchestrator.trocar_produto, camera_id, product_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Câmera {camera_id} não encontrada ou não está ativa.")
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": f"Camera {camera_id} switched to product {product_id}."}
+
 async def frame_generator(camera_id: int, orchestrator):
-    """Yields frames from a camera's output queue for streaming."""
+    """Yields the newest frames from a camera's shared-memory ring for streaming."""
     camera_data = orchestrator.get_camera_data(camera_id)
     if not camera_data:
         print(f"Error: No data for camera {camera_id} for streaming.")
         return
 
-    output_queue = camera_data.get('queue')
-    while True:
+    # Each stream has its own cursor: several clients never steal frames from each other
+    anel = camera_data['anel']
+    relogio_de_parede = camera_data['processor'].relogio_de_parede
+    leitor = anel.leitor()
+    while not anel.fechado:
         try:
-            data = await asyncio.to_thread(output_queue.get, timeout=1.0)
-            frame = data['frame']
-            _, buffer = cv2.imencode('.jpg', frame)
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            quadro = await asyncio.to_thread(leitor.proximo, 1.0)
+            if quadro is None:
+                continue
+            _, buffer = cv2.imencode('.jpg', quadro.frame)
+            if not leitor.valido(quadro):
+                continue  # Slot overwritten while encoding: skip the torn frame
+            # Capture sequence/instant (time.monotonic() of the camera host) travel with each part
+            cabecalhos = (f"Content-Type: image/jpeg\r\n"
+                          f"X-Capture-Sequence: {quadro.sequencia_captura}\r\n"
+                          f"X-Capture-Timestamp: {quadro.instante_captura:.6f}\r\n")
+            if relogio_de_parede:  # Omitted for video replayed at max speed: its clock runs ahead of ours
+                idade_ms = (time.monotonic() - quadro.instante_captura) * 1000
+                cabecalhos += f"X-Frame-Age-Ms: {idade_ms:.1f}\r\n"
+            cabecalhos = (cabecalhos + "\r\n").encode()
+            yield b'--frame\r\n' + cabecalhos + buffer.tobytes() + b'\r\n'
         except Exception:
-            # If queue is empty or another error, keep trying
+            if anel.fechado:
+                break  # Ring closed while reading
             await asyncio.sleep(0.1)
+    # Camera removed or orchestrator stopped: end the response instead of spinning on a dead ring
 
 @router.get("/{camera_id}/stream")
 async def camera_stream(camera_id: int, request: Request):
@@ -24,3 +24,15 @@ async def get_dashboard_overview(request: Request):
         "cameras_total": total_cameras,
         "alerts_pending": 0, # Placeholder
     }
+
+@router.get("/dashboard/inference")
+async def get_inference_overview(request: Request):
+    """Retorna métricas da inferência compartilhada, modelos em memória e orçamento de CPU."""
+    orchestrator = request.app.state.orchestrator
+    return orchestrator.get_inference_status()
+
+@router.get("/dashboard/startup")
+async def get_startup_overview(request: Request):
+    """Retorna a duração de cada etapa da partida (modelos, abertura e primeiro frame por câmera)."""
+    orchestrator = request.app.state.orchestrator
+    return orchestrator.get_inicializacao_status()
@@ -40,9 +40,14 @@ def create_app():
         orchestrator = Orchestrator()
         app.state.orchestrator = orchestrator
         
-        # Adiciona todas as câmeras registradas ao orquestrador
+        # Adiciona todas as câmeras registradas (índices USB) ao orquestrador. A linha da tabela
+        # `cameras` do mesmo dispositivo, se houver uma única ativa, traz a configuração da câmera
+        # (resolução/FPS, máscara de inferência, limiar de movimento)
         for cam_id in REGISTERED_CAMERAS:
-            orchestrator.add_camera(cam_id)
+            linhas = orchestrator.config_loader.find_camera_ids(device_index=cam_id)
+            if len(linhas) > 1:
+                print(f"Aviso: Câmeras {linhas} do banco usam o dispositivo {cam_id} - usando a configuração padrão.")
+            orchestrator.add_camera(cam_id, camera_id=linhas[0] if len(linhas) == 1 else None)
         
         orchestrator.start()
         print("Orchestrator started.")
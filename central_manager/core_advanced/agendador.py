@@ -0,0 +1,87 @@
+import time
+
+from .config import AGENDADOR_CONFIG, STATE_CONFIG
+
+
+class AgendadorInferencia:
+    """Decide, por câmera, se e quais modelos rodam em cada frame conforme o estado.
+
+    Em estados ociosos (ex.: AGUARDANDO_CAIXA) a inferência é limitada a
+    `taxa_hz` e só o modelo de ROI roda. Quando a ROI observada diverge da
+    esperada para o estado (caixa chegou ou foi retirada), o agendador volta
+    à taxa da câmera por `tamanho_buffer_estabilizacao` frames, para que os
+    buffers de `_obter_valores_estabilizados` encham sem atraso.
+    """
+
+    def __init__(self, config=None, tamanho_buffer=None):
+        self.config = config or AGENDADOR_CONFIG
+        self.tamanho_buffer = tamanho_buffer or STATE_CONFIG['tamanho_buffer_estabilizacao']
+        self.habilitado = self.config.get('habilitado', True)
+        self.ultima_inferencia = 0.0
+        self.frames_rajada = 0  # Frames restantes na taxa cheia após mudança de cena
+        self.politica_atual = None
+        # --- Métricas ---
+        self.frames_inferidos = 0
+        self.frames_pulados = 0
+
+    def _politica(self, status_sistema):
+        if isinstance(status_sistema, str):
+            return self.config['politicas'].get(status_sistema, self.config['politica_padrao'])
+        return self._politica_mais_exigente([self._politica(status) for status in status_sistema])
+
+    @staticmethod
+    def _politica_mais_exigente(politicas):
+        """Combina as políticas de várias caixas: maior taxa e todos os modelos se alguma pedir."""
+        if len(politicas) == 1:
+            return politicas[0]
+        taxas = [politica.get('taxa_hz') for politica in politicas]
+        esperadas = {politica.get('roi_esperada') for politica in politicas}
+        return {
+            'taxa_hz': None if None in taxas else max(taxas),
+            'modelos': 'todos' if any(politica.get('modelos', 'todos') == 'todos' for politica in politicas) else 'roi',
+            # Rajada só quando todas as caixas esperam o mesmo (senão qualquer observação diverge)
+            'roi_esperada': esperadas.pop() if len(esperadas) == 1 else None,
+        }
+
+    def decidir(self, status_sistema, agora=None):
+        """Retorna os modelos a rodar neste frame ('roi' ou 'todos'), ou None para pular.
+
+        `status_sistema` é o estado do state manager, ou uma lista de estados
+        (uma caixa por state manager): vale a política mais exigente entre eles.
+        """
+        if not self.habilitado:
+            self.frames_inferidos += 1
+            return 'todos'
+
+        agora = time.monotonic() if agora is None else agora
+        self.politica_atual = self._politica(status_sistema)
+        taxa_hz = self.politica_atual.get('taxa_hz')
+
+        if taxa_hz and self.frames_rajada == 0 and (agora - self.ultima_inferencia) < 1.0 / taxa_hz:
+            self.frames_pulados += 1
+            return None
+
+        self.ultima_inferencia = agora
+        self.frames_inferidos += 1
+        return self.politica_atual.get('modelos', 'todos')
+
+    def registrar(self, roi_presente):
+        """Informa o resultado da inferência; mudança de cena ativa a taxa cheia."""
+        if self.politica_atual is None:
+            return
+        roi_esperada = self.politica_atual.get('roi_esperada')
+        if roi_esperada is not None and roi_presente != roi_esperada:
+            self.frames_rajada = self.tamanho_buffer
+        elif self.frames_rajada > 0:
+            self.frames_rajada -= 1
+
+    def get_status(self):
+        """Retorna a política em uso e os contadores de frames."""
+        return {
+            "habilitado": self.habilitado,
+            "taxa_hz": self.politica_atual.get('taxa_hz') if self.politica_atual else None,
+            "modelos": self.politica_atual.get('modelos') if self.politica_atual else None,
+            "rajada": self.frames_rajada > 0,
+            "frames_inferidos": self.frames_inferidos,
+            "frames_pulados": self.frames_pulados,
+        }
@@ -0,0 +1,112 @@
+"""
+Ajuste automático do tamanho de inferência (imgsz) por produto.
+
+Reproduz os vídeos gravados pelo YOLODetector em cada tamanho candidato e
+compara as contagens estabilizadas (ROI, itens na ROI e divisor, com os
+mesmos buffers do state manager) com as do maior tamanho. O menor tamanho
+que mantém a concordância é gravado no `config_json` do produto (chave
+'imgsz'), usado pelo registro de modelos em tempo de execução.
+
+Uso (a partir da raiz do projeto):
+    python -m central_manager.core_advanced.ajuste_imgsz --produto 1
+    python -m central_manager.core_advanced.ajuste_imgsz --produto 1 --videos "videos_test/*.mp4" --nao-salvar
+"""
+
+import argparse
+import glob
+import time
+
+from ..shared.config_loader import ConfigLoader
+
+from .benchmark import carregar_frames
+from .camera_processor import filtrar_itens_na_roi
+from .config import DETECTOR_CONFIG
+from .detector import YOLODetector
+from .state_manager_advanced_layer_01 import SimpleStateManager
+
+TAMANHOS_CANDIDATOS = [640, 480, 416, 320]
+
+
+def contagens_estabilizadas(detector, frames):
+    """(roi_estavel, contagem_estabilizada, divisor_estavel) por frame, como no state manager."""
+    estabilizador = SimpleStateManager()
+    sequencia = []
+    for frame in frames:
+        caixas, itens, divisores = detector.detectar_objetos(frame)
+        estabilizador.buffer_roi.append(len(caixas) > 0)
+        estabilizador.buffer_contagem_itens.append(len(filtrar_itens_na_roi(itens, caixas)))
+        estabilizador.buffer_divisor_presente.append(len(divisores) > 0)
+        sequencia.append(estabilizador._obter_valores_estabilizados())
+    return sequencia
+
+
+def avaliar_tamanho(imgsz, videos, config_json):
+    """Roda todos os vídeos em um tamanho e retorna (fps, contagens estabilizadas por vídeo)."""
+    detector = YOLODetector(backend=config_json.get('backend', DETECTOR_CONFIG['backend']),
+                            modelo_unificado=config_json.get('modelo_unificado', DETECTOR_CONFIG['modelo_unificado']),
+                            caminhos=config_json.get('modelos'), imgsz=imgsz)
+    detector.aquecer()
+
+    total_frames = 0
+    inicio = time.perf_counter()
+    sequencias = []
+    for frames in videos:
+        sequencias.append(contagens_estabilizadas(detector, frames))
+        total_frames += len(frames)
+    duracao = time.perf_counter() - inicio
+    return (total_frames / duracao if duracao > 0 else 0.0), sequencias
+
+
+def concordancia(sequencias, referencia):
+    """Fração dos frames com a mesma contagem estabilizada da referência."""
+    iguais = total = 0
+    for seq, seq_ref in zip(sequencias, referencia):
+        iguais += sum(1 for a, b in zip(seq, seq_ref) if a == b)
+        total += len(seq_ref)
+    return iguais / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escolhe o menor imgsz que preserva as contagens do produto.")
+    parser.add_argument('--produto', type=int, required=True, help="ID do produto (tabela produtos).")
+    parser.add_argument('--videos', type=str, default='videos_test/*.mp4', help="Padrão glob dos vídeos gravados.")
+    parser.add_argument('--frames', type=int, default=300, help="Máximo de frames por vídeo.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_CANDIDATOS,
+                        help="Tamanhos candidatos (o maior é a referência).")
+    parser.add_argument('--concordancia', type=float, default=0.99,
+                        help="Fração mínima de frames com contagem igual à referência.")
+    parser.add_argument('--nao-salvar', action='store_true', help="Apenas mostra o resultado, sem gravar no banco.")
+    args = parser.parse_args()
+
+    config_loader = ConfigLoader()
+    config_json = config_loader.load_product_config(args.produto).get('config_json', {})
+
+    caminhos = sorted(glob.glob(args.videos))
+    videos = [frames for frames in (carregar_frames(c, args.frames) for c in caminhos) if frames]
+    if not videos:
+        print(f"[ERRO] Nenhum vídeo lido de '{args.videos}'.")
+        return
+
+    tamanhos = sorted(set(args.tamanhos), reverse=True)
+    resultados = {imgsz: avaliar_tamanho(imgsz, videos, config_json) for imgsz in tamanhos}
+    _, referencia = resultados[tamanhos[0]]
+
+    print(f"\n--- Ajuste de imgsz ({len(videos)} vídeos, referência: {tamanhos[0]}) ---")
+    print(f"{'imgsz':>6} {'FPS':>8} {'concordância':>14}")
+    escolhido = anterior = tamanhos[0]
+    for imgsz in tamanhos:
+        fps, sequencias = resultados[imgsz]
+        taxa = concordancia(sequencias, referencia)
+        print(f"{imgsz:>6} {fps:>8.1f} {taxa:>13.1%}")
+        if taxa >= args.concordancia and escolhido == anterior:
+            escolhido = imgsz  # Só desce enquanto todos os maiores também concordam
+        anterior = imgsz
+
+    print(f"\n✅ imgsz escolhido para o produto {args.produto}: {escolhido}")
+    if not args.nao_salvar:
+        config_loader.save_product_config_json(args.produto, {'imgsz': escolhido})
+        print("💾 Gravado em produtos.config_json")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""
+Anel de frames em memória compartilhada (um por câmera).
+
+O CameraProcessor escreve cada frame desenhado em um de `slots` slots de
+tamanho fixo, com número de sequência e instante de captura. Qualquer número
+de leitores (stream da API, gravador, visualizador local), no mesmo processo
+ou em outros, lê sem copiar e sem consumir: cada `LeitorAnel` tem seu próprio
+cursor de sequência.
+
+Não há lock: o slot é marcado como "em escrita" (sequência -1) antes da cópia
+e recebe a sequência nova depois dela. Um leitor que usa a view do frame deve
+confirmar com `valido(sequencia)` que o slot não foi sobrescrito no meio do
+caminho (o que só acontece após `slots - 1` novos frames).
+"""
+
+import re
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .config import ANEL_CONFIG
+
+_PALAVRAS_CABECALHO = 4       # int64: última sequência escrita, slots, tamanho do slot, reservado
+_PALAVRAS_CABECALHO_SLOT = 8  # int64: sequência, altura, largura, canais, instante (float64), sequência de captura, reservados
+
+
+def nome_anel(camera_source):
+    """Nome previsível do anel de uma câmera, para leitores de outros processos (ex.: gravador)."""
+    return "siac_" + re.sub(r'[^A-Za-z0-9]+', '_', str(camera_source)).strip('_')
+
+
+class QuadroLido:
+    """Frame lido do anel: `frame` é uma view somente leitura sobre a memória compartilhada.
+
+    `sequencia` é a posição no anel; `sequencia_captura` e `instante_captura`
+    (time.monotonic() do processo da câmera) identificam o frame na captura.
+    """
+    __slots__ = ('sequencia', 'instante_captura', 'sequencia_captura', 'frame')
+
+    def __init__(self, sequencia, instante_captura, sequencia_captura, frame):
+        self.sequencia = sequencia
+        self.instante_captura = instante_captura
+        self.sequencia_captura = sequencia_captura
+        self.frame = frame
+
+
+class AnelQuadros:
+    """Anel de `slots` frames de até `tamanho_slot` bytes em memória compartilhada."""
+
+    def __init__(self, nome, slots=None, tamanho_slot=None, criar=True):
+        self.criador = criar
+        slots = slots or ANEL_CONFIG['slots']
+        tamanho_slot = tamanho_slot or ANEL_CONFIG['tamanho_slot']
+        if criar:
+            tamanho = (_PALAVRAS_CABECALHO + slots * _PALAVRAS_CABECALHO_SLOT) * 8 + slots * tamanho_slot
+            try:
+                self.shm = shared_memory.SharedMemory(name=nome, create=True, size=tamanho)
+            except FileExistsError:
+                # Sobra de uma execução anterior que não finalizou
+                antigo = shared_memory.SharedMemory(name=nome)
+                antigo.close()
+                antigo.unlink()
+                self.shm = shared_memory.SharedMemory(name=nome, create=True, size=tamanho)
+        else:
+            self.shm = shared_memory.SharedMemory(name=nome)
+            # Quem só se conecta não deve apagar o segmento ao sair (ver bpo-39959)
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.nome = nome
+        self.fechado = False  # Após fechar(): leitores devem parar (as views não existem mais)
+
+        self._cabecalho = np.ndarray((_PALAVRAS_CABECALHO,), dtype=np.int64, buffer=self.shm.buf)
+        if criar:
+            self._cabecalho[:] = (0, slots, tamanho_slot, 0)
+        self.slots, self.tamanho_slot = int(self._cabecalho[1]), int(self._cabecalho[2])
+
+        deslocamento = _PALAVRAS_CABECALHO * 8
+        self._cabecalhos_slot = np.ndarray((self.slots, _PALAVRAS_CABECALHO_SLOT), dtype=np.int64,
+                                           buffer=self.shm.buf, offset=deslocamento)
+        self._instantes = self._cabecalhos_slot.view(np.float64)[:, 4]
+        deslocamento += self.slots * _PALAVRAS_CABECALHO_SLOT * 8
+        self._dados = np.ndarray((self.slots, self.tamanho_slot), dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=deslocamento)
+        if criar:
+            self._cabecalhos_slot[:] = 0
+        self._reservada = 0
+        # --- Métricas (do escritor) ---
+        self.frames_grandes_demais = 0
+
+    @property
+    def ultima_sequencia(self):
+        return int(self._cabecalho[0])
+
+    def reservar(self, forma):
+        """Marca o próximo slot como em escrita e retorna uma view gravável dele com a `forma` dada.
+
+        O escritor monta o frame direto no slot (sem frame intermediário) e o
+        publica com `confirmar`. Retorna None se o frame não cabe no slot.
+        """
+        nbytes = int(np.prod(forma))
+        if nbytes > self.tamanho_slot:
+            self.frames_grandes_demais += 1
+            return None
+        self._reservada = self.ultima_sequencia + 1
+        cabecalho = self._cabecalhos_slot[self._reservada % self.slots]
+        cabecalho[0] = -1  # Em escrita: leitores ignoram o slot
+        cabecalho[1] = forma[0]
+        cabecalho[2] = forma[1]
+        cabecalho[3] = forma[2] if len(forma) == 3 else 1
+        return self._dados[self._reservada % self.slots, :nbytes].reshape(forma)
+
+    def confirmar(self, instante_captura, sequencia_captura=0):
+        """Publica o slot reservado; retorna a sua sequência."""
+        sequencia = self._reservada
+        indice = sequencia % self.slots
+        self._instantes[indice] = instante_captura
+        self._cabecalhos_slot[indice][5] = sequencia_captura
+        self._cabecalhos_slot[indice][0] = sequencia
+        self._cabecalho[0] = sequencia
+        return sequencia
+
+    def escrever(self, frame, instante_captura, sequencia_captura=0):
+        """Copia o frame para o próximo slot; retorna a sequência, ou 0 se o frame não cabe no slot."""
+        destino = self.reservar(frame.shape)
+        if destino is None:
+            return 0
+        np.copyto(destino, frame)
+        return self.confirmar(instante_captura, sequencia_captura)
+
+    def ler(self, sequencia):
+        """View do frame de uma sequência ainda presente no anel, ou None."""
+        indice = sequencia % self.slots
+        cabecalho = self._cabecalhos_slot[indice]
+        if sequencia <= 0 or cabecalho[0] != sequencia:
+            return None
+        altura, largura, canais = (int(v) for v in cabecalho[1:4])
+        instante = float(self._instantes[indice])
+        sequencia_captura = int(cabecalho[5])
+        frame = self._dados[indice, :altura * largura * canais].reshape((altura, largura, canais))
+        frame.flags.writeable = False
+        if cabecalho[0] != sequencia:
+            return None
+        return QuadroLido(sequencia, instante, sequencia_captura, frame)
+
+    def valido(self, sequencia):
+        """True se o slot da sequência ainda não foi sobrescrito (confirma uma leitura sem cópia)."""
+        return sequencia > 0 and self._cabecalhos_slot[sequencia % self.slots][0] == sequencia
+
+    def leitor(self):
+        return LeitorAnel(self)
+
+    def fechar(self):
+        self.fechado = True
+        del self._cabecalho, self._cabecalhos_slot, self._instantes, self._dados  # Views saem antes do close
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # Um leitor deste processo ainda segura uma view; o mapeamento sai com ela
+        if self.criador:
+            # Um worker (spawn) compartilha o resource_tracker e já desfez o registro ao se conectar
+            resource_tracker.register(self.shm._name, 'shared_memory')
+            self.shm.unlink()
+
+    def get_status(self):
+        return {
+            "nome": self.nome,
+            "slots": self.slots,
+            "ultima_sequencia": self.ultima_sequencia,
+            "frames_grandes_demais": self.frames_grandes_demais,
+        }
+
+
+class LeitorAnel:
+    """Cursor independente sobre um AnelQuadros: cada leitor vê o frame mais novo, sem roubar de outros."""
+
+    def __init__(self, anel):
+        self.anel = anel
+        self.sequencia = 0
+        self.frames_lidos = 0
+        self.frames_pulados = 0  # Frames escritos que este leitor não chegou a ver
+
+    def proximo(self, timeout=None, todos=False, intervalo=0.005):
+        """Aguarda um frame mais novo que o último lido e retorna um QuadroLido, ou None no timeout
+        (ou com o anel fechado).
+
+        Por padrão salta direto para o frame mais recente (stream, visualizador);
+        com `todos` (gravador) segue a sequência enquanto os frames ainda estão no anel.
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        while not self.anel.fechado:
+            ultima = self.anel.ultima_sequencia
+            if ultima > self.sequencia:
+                alvo = ultima
+                if todos and self.sequencia:
+                    # O slot mais antigo é o próximo a ser sobrescrito: mantém um de margem
+                    alvo = max(self.sequencia + 1, ultima - self.anel.slots + 2)
+                quadro = self.anel.ler(alvo)
+                if quadro is not None:
+                    if self.sequencia:
+                        self.frames_pulados += alvo - self.sequencia - 1
+                    self.sequencia = alvo
+                    self.frames_lidos += 1
+                    return quadro
+            if limite is not None and time.monotonic() >= limite:
+                return None
+            time.sleep(intervalo)
+        return None
+
+    def valido(self, quadro):
+        """True se a view de `quadro` ainda não foi sobrescrita pelo escritor."""
+        return self.anel.valido(quadro.sequencia)
@@ -0,0 +1,99 @@
+"""
+Backends de inferência do YOLODetector (torch, ONNX Runtime, OpenVINO).
+
+Os modelos exportados ficam em cache ao lado do `.pt` de origem e são
+reexportados automaticamente quando o hash dos pesos muda.
+"""
+
+import hashlib
+import json
+import os
+
+from ultralytics import YOLO
+
+# formato: argumento `format` do ultralytics; sufixo: nome do artefato exportado;
+# calibrado: artefato gerado apenas pela ferramenta de quantização (precisa do dataset)
+BACKENDS = {
+    'torch': {'formato': None, 'sufixo': '.pt'},
+    'onnx': {'formato': 'onnx', 'sufixo': '.onnx'},
+    'openvino': {'formato': 'openvino', 'sufixo': '_openvino_model'},
+    'openvino_int8': {'formato': 'openvino', 'sufixo': '_int8_openvino_model', 'calibrado': True},
+}
+
+
+def _hash_arquivo(caminho):
+    """SHA-256 do arquivo de pesos, usado para invalidar o cache de exportação."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def caminho_exportado(caminho_pt, backend):
+    """Caminho do artefato exportado para o backend, ao lado do `.pt`."""
+    base, _ = os.path.splitext(caminho_pt)
+    return base + BACKENDS[backend]['sufixo']
+
+
+def _caminho_metadados(caminho_pt, backend):
+    base, _ = os.path.splitext(caminho_pt)
+    return f"{base}.{backend}.json"
+
+
+def _cache_valido(caminho_pt, backend, imgsz):
+    """Verifica se o artefato exportado existe e corresponde aos pesos atuais."""
+    if not os.path.exists(caminho_exportado(caminho_pt, backend)):
+        return False
+    try:
+        with open(_caminho_metadados(caminho_pt, backend), 'r', encoding='utf-8') as f:
+            metadados = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return metadados.get('sha256') == _hash_arquivo(caminho_pt) and metadados.get('imgsz') == imgsz
+
+
+def exportar_modelo(caminho_pt, backend, imgsz=640, **opcoes_exportacao):
+    """Exporta o `.pt` para o backend e grava os metadados do cache.
+
+    `opcoes_exportacao` é repassado ao `YOLO.export` (ex.: int8, data).
+    """
+    formato = BACKENDS[backend]['formato']
+    # dynamic=True permite lotes de tamanho variável (InferenceService)
+    opcoes_exportacao.setdefault('dynamic', True)
+    print(f"📦 Exportando {caminho_pt} para {backend}...")
+    destino = YOLO(caminho_pt).export(format=formato, imgsz=imgsz, **opcoes_exportacao)
+
+    esperado = caminho_exportado(caminho_pt, backend)
+    if os.path.normpath(str(destino)) != os.path.normpath(esperado):
+        os.replace(str(destino), esperado)
+
+    metadados = {'sha256': _hash_arquivo(caminho_pt), 'imgsz': imgsz,
+                 'opcoes': opcoes_exportacao}
+    with open(_caminho_metadados(caminho_pt, backend), 'w', encoding='utf-8') as f:
+        json.dump(metadados, f)
+    print(f"✅ Modelo exportado: {esperado}")
+    return esperado
+
+
+def resolver_modelo(caminho_pt, backend='torch', imgsz=640):
+    """Retorna o caminho do modelo para o backend, exportando quando o cache está ausente ou desatualizado."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend}. Opções: {', '.join(BACKENDS)}")
+    if backend == 'torch':
+        return caminho_pt
+
+    if _cache_valido(caminho_pt, backend, imgsz):
+        return caminho_exportado(caminho_pt, backend)
+    if BACKENDS[backend].get('calibrado'):
+        # Quantização exige calibração com o dataset; não é feita na inicialização
+        raise FileNotFoundError(
+            f"Modelo {backend} ausente ou desatualizado para {caminho_pt}. "
+            f"Gere-o com: python -m central_manager.core_advanced.quantizacao"
+        )
+    return exportar_modelo(caminho_pt, backend, imgsz=imgsz)
+
+
+def carregar_modelo(caminho_pt, backend='torch', imgsz=640):
+    """Carrega o modelo YOLO no backend escolhido."""
+    return YOLO(resolver_modelo(caminho_pt, backend, imgsz), task='detect')
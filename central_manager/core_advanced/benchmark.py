@@ -0,0 +1,129 @@
+"""
+Benchmark de backends do YOLODetector.
+
+Mede o FPS de cada backend sobre os mesmos frames e confere se as
+contagens (caixas, itens, divisores) coincidem com o backend torch.
+Com `--pipeline`, mede o pipeline completo da câmera (captura, inferência,
+estado e desenho) reproduzindo o vídeo como câmera, sem câmeras reais.
+
+Uso (a partir da raiz do projeto):
+    python -m central_manager.core_advanced.benchmark --source videos_test/WIN_20250721_09_03_05_Pro.mp4
+    python -m central_manager.core_advanced.benchmark --source videos_test/WIN_20250721_09_03_05_Pro.mp4 --pipeline maxima
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+
+from .backends import BACKENDS
+from .detector import YOLODetector
+
+
+def carregar_frames(source, max_frames):
+    """Lê até `max_frames` frames da fonte (arquivo de vídeo ou índice de câmera)."""
+    cap = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def medir_backend(backend, frames, aquecimento=5):
+    """Roda o detector do backend sobre os frames e retorna (fps, contagens por frame)."""
+    detector = YOLODetector(backend=backend)
+    for frame in frames[:aquecimento]:
+        detector.detectar_objetos(frame)
+
+    contagens = []
+    inicio = time.perf_counter()
+    for frame in frames:
+        caixas, itens, divisores = detector.detectar_objetos(frame)
+        contagens.append((len(caixas), len(itens), len(divisores)))
+    duracao = time.perf_counter() - inicio
+    return len(frames) / duracao if duracao > 0 else 0.0, contagens
+
+
+def medir_pipeline(source, modo='maxima', timeout_s=600.0):
+    """Reproduz o vídeo como câmera até o fim e retorna (fps, status da câmera).
+
+    RuntimeError se o vídeo não abre/decodifica ou não termina em `timeout_s`.
+    """
+    from .orchestrator import Orchestrator  # Só o modo --pipeline precisa do Orchestrator
+
+    orchestrator = Orchestrator(modo='thread')
+    orchestrator.add_camera(source, modo_reproducao=modo)
+    processor = orchestrator.processors[source]['processor']
+    inicio = time.perf_counter()
+    orchestrator.start()
+    try:
+        while True:
+            if processor.erro_reproducao:
+                raise RuntimeError(f"Reprodução de '{source}' falhou: {processor.erro_reproducao}")
+            if time.perf_counter() - inicio > timeout_s:
+                raise RuntimeError(f"Reprodução de '{source}' não terminou em {timeout_s:.0f}s")
+            captura = processor.get_captura_status()
+            concluido = captura['frames_processados'] + captura['frames_descartados'] >= captura['frames_capturados']
+            if processor.reproducao_concluida and concluido:
+                break
+            time.sleep(0.05)
+        duracao = time.perf_counter() - inicio
+        return (processor.frames_processados / duracao if duracao > 0 else 0.0), processor.get_status()
+    finally:
+        orchestrator.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o FPS dos backends do YOLODetector.")
+    parser.add_argument('--source', type=str, required=True, help="Arquivo de vídeo ou índice da câmera.")
+    parser.add_argument('--frames', type=int, default=200, help="Número de frames a processar.")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS),
+                        help="Backends a comparar (o primeiro é a referência).")
+    parser.add_argument('--pipeline', choices=['maxima', 'tempo_real'],
+                        help="Mede o pipeline completo reproduzindo o arquivo no modo dado.")
+    parser.add_argument('--timeout', type=float, default=600.0, help="Tempo máximo (s) do modo --pipeline.")
+    args = parser.parse_args()
+
+    if args.pipeline:
+        try:
+            fps, status = medir_pipeline(args.source, args.pipeline, args.timeout)
+        except RuntimeError as e:
+            print(f"[ERRO] {e}")
+            return 1
+        captura = status['captura']
+        print(f"\n--- Pipeline ({args.pipeline}): {args.source} ---")
+        print(f"Frames: {captura['frames_capturados']} capturados, {captura['frames_processados']} processados, "
+              f"{captura['frames_descartados']} descartados")
+        print(f"FPS: {fps:.1f}")
+        for etapa, medidas in status['pipeline']['etapas'].items():
+            print(f"  {etapa:<11} ocupação {medidas['ocupacao']:.0%}  {medidas['ms_por_frame']:.1f} ms/frame")
+        print(f"Estado final: {status['status_message']}")
+        return 0
+
+    frames = carregar_frames(args.source, args.frames)
+    if not frames:
+        print(f"[ERRO] Nenhum frame lido de '{args.source}'.")
+        return 1
+
+    resultados = {}
+    for backend in args.backends:
+        resultados[backend] = medir_backend(backend, frames)
+
+    referencia = args.backends[0]
+    _, contagens_ref = resultados[referencia]
+    print(f"\n--- Benchmark ({len(frames)} frames, referência: {referencia}) ---")
+    print(f"{'backend':<10} {'FPS':>8} {'ms/frame':>10} {'divergências':>14}")
+    for backend, (fps, contagens) in resultados.items():
+        divergencias = sum(1 for a, b in zip(contagens, contagens_ref) if a != b)
+        ms = 1000.0 / fps if fps else float('inf')
+        print(f"{backend:<10} {fps:>8.1f} {ms:>10.1f} {divergencias:>14}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,11 +2,24 @@ import cv2
 import numpy as np
 from .visualization import Visualizer
 from .detector import YOLODetector
+from .deteccoes import Deteccoes
+from .agendador import AgendadorInferencia
+from .mascara import MascaraInferencia
+from .multicaixa import GerenciadorCaixas, atribuir_a_caixas
+from .movimento import PortaoMovimento
+from .reuso_roi import ReusoROI
+from .rastreador import RastreadorDeteccoes
+from .pipeline import CanalUltimoValor, MedidorOcupacao, PoolQuadros, QuadroCapturado
+from .config import MULTICAIXA_CONFIG, PIPELINE_CONFIG, VISUALIZACAO_CONFIG
+from .orcamento_cpu import fixar_afinidade
+from .reconexao import ReconexaoCamera
+from .captura import abrir_captura, escolher_backend, relogio_de_parede
 from .state_manager_advanced_layer_01 import SimpleStateManager
 from .simple_logger import SimpleLogger
-from queue import Queue
+import threading
 import time
 import os
+import traceback
 
 # Cores do legacy (BGR format para OpenCV)
 CORES_LEGACY = {
@@ -20,50 +33,111 @@ CORES_LEGACY = {
 
 def filtrar_itens_na_roi(itens, caixas):
     """Filtra itens que estão dentro da ROI (caixa) principal."""
-    if not caixas or not itens:
-        return []
-    
-    itens_na_roi = []
-    roi_coords, _ = caixas[0] # Pega a primeira ROI encontrada
-    roi_x1, roi_y1, roi_x2, roi_y2 = roi_coords
-    
-    for item_coords, item_conf in itens:
-        item_center_x = (item_coords[0] + item_coords[2]) // 2
-        item_center_y = (item_coords[1] + item_coords[3]) // 2
-        
-        if (roi_x1 <= item_center_x <= roi_x2 and 
-            roi_y1 <= item_center_y <= roi_y2):
-            itens_na_roi.append((item_coords, item_conf))
-            
-    return itens_na_roi
+    if not len(caixas) or not len(itens):
+        return Deteccoes()
+
+    roi_x1, roi_y1, roi_x2, roi_y2 = caixas.xyxy[0] # Pega a primeira ROI encontrada
+    centros_x = (itens.xyxy[:, 0] + itens.xyxy[:, 2]) // 2
+    centros_y = (itens.xyxy[:, 1] + itens.xyxy[:, 3]) // 2
+
+    dentro = ((roi_x1 <= centros_x) & (centros_x <= roi_x2) &
+              (roi_y1 <= centros_y) & (centros_y <= roi_y2))
+    return itens[dentro]
 
 class CameraProcessor:
     """Processa o feed de uma câmera, aplicando detecção e gerenciamento de estado."""
-    def __init__(self, output_queue: Queue, camera_source=0, conf_roi=0.5, conf_item=0.4, conf_divisor=0.25):
+    def __init__(self, anel, camera_source=0, conf_roi=0.5, conf_item=0.4, conf_divisor=0.25,
+                 inference_service=None, limiar_movimento=None, product_id=1, product_name="Produto Padrão",
+                 modo_reproducao=None, backend_captura=None, mascara=None, fonte_captura=None,
+                 parametros_captura=None):
         self.camera_source = camera_source
-        self.output_queue = output_queue
+        # O que é aberto: por padrão a própria camera_source; com uma linha da tabela `cameras`,
+        # o índice USB ou a URL (pode levar credenciais, não vai para o status) e a resolução/FPS pedidos
+        self.fonte_captura = camera_source if fonte_captura is None else fonte_captura
+        self.parametros_captura = parametros_captura or {}
+        # 'opencv', 'pyav' (câmeras IP) ou 'video' (ver `captura`)
+        self.backend_captura = escolher_backend(self.fonte_captura, backend_captura)
+        # Arquivo de vídeo como câmera: 'tempo_real' ou 'maxima' (ver `reproducao`)
+        self.reproducao = self.backend_captura == 'video'
+        self.modo_reproducao = modo_reproducao if self.reproducao else None
+        self.reproducao_concluida = False
+        self.erro_reproducao = None  # Vídeo que não abriu ou não tem frames: a reprodução termina com erro
+        self.anel = anel  # AnelQuadros onde os frames desenhados são publicados
         self.running = False
         self.should_stop = False
-        self.reconnection_attempts = 0
         self.was_ever_connected = False
-        self.disconnection_logged = False  # Flag para evitar spam de desconexão
+        # Aberturas fora desta thread, com backoff exponencial entre falhas
+        self.reconexao = ReconexaoCamera(self._abrir_captura)
+        self.inicializacao = {'abertura_ms': None, 'primeiro_frame_ms': None}  # Desde o início do run()
         self.logger = SimpleLogger(f"Camera-{camera_source}")
         self.visualizer = Visualizer(CORES_LEGACY)
-        self.detector = YOLODetector(confianca_roi=conf_roi, confianca_item=conf_item, confianca_divisor=conf_divisor)
+        # Com serviço de inferência compartilhado, os modelos são carregados uma única vez pelo Orchestrator
+        self.inference_service = inference_service
+        self.detector = None
+        if inference_service is None:
+            self.detector = YOLODetector(confianca_roi=conf_roi, confianca_item=conf_item, confianca_divisor=conf_divisor)
         self.state_manager = SimpleStateManager()
+        # Várias caixas por frame: um state manager por caixa rastreada, e `state_manager`
+        # passa a ser o da caixa mais antiga em cena (agendador e painel)
+        self.caixas = GerenciadorCaixas() if MULTICAIXA_CONFIG['habilitado'] else None
+        # Taxa de inferência por estado; frames pulados reaproveitam as últimas detecções no desenho
+        self.agendador = AgendadorInferencia()
+        self.ultimas_deteccoes = (Deteccoes(), Deteccoes(), Deteccoes(), Deteccoes())
+        # Região ativa da câmera (config_json 'mascara_inferencia'): só ela vai para a inferência
+        self.mascara = None
+        if mascara:
+            try:
+                self.mascara = MascaraInferencia(mascara)
+            except (ValueError, TypeError) as e:
+                self.logger.error(f"Máscara de inferência inválida ({e}) - usando o frame inteiro")
+        # Cena estática: reaproveita as detecções da última inferência
+        self.portao_movimento = PortaoMovimento(limiar=limiar_movimento)
+        # Caixa parada: o modelo de ROI roda só de tempos em tempos
+        self.reuso_roi = ReusoROI()
+        # Entre keyframes, itens e divisores são propagados pelo rastreador
+        self.rastreador = RastreadorDeteccoes()
+        # Pipeline: captura -> inferência -> estado + visualização, cada etapa em sua thread
+        self.pipeline_habilitado = PIPELINE_CONFIG['habilitado']
+        # Buffers de captura reaproveitados: cada frame volta ao pool após a última etapa (ou ao ser descartado)
+        self._pool = PoolQuadros()
+        # Reprodução em velocidade máxima processa todos os frames (determinística)
+        self.relogio_de_parede = relogio_de_parede(self.fonte_captura, self.backend_captura, modo_reproducao)
+        sem_descarte = not self.relogio_de_parede
+        self._canal_captura = CanalUltimoValor(ao_descartar=lambda quadro: self._pool.devolver(quadro.frame),
+                                               sem_descarte=sem_descarte)
+        self._canal_inferencia = CanalUltimoValor(ao_descartar=lambda saida: self._pool.devolver(saida[0].frame),
+                                                  sem_descarte=sem_descarte)
+        self.espelhar = VISUALIZACAO_CONFIG['espelhar']
+        self.ocupacao = {etapa: MedidorOcupacao(PIPELINE_CONFIG['janela_metricas'])
+                         for etapa in ('captura', 'inferencia', 'estado')}
+        self._etapas = []
+        self.erros_etapas = {'inferencia': 0, 'estado': 0}  # Frames descartados por exceção
+        self._id_thread = None
+        # --- Métricas de captura: capturados = processados + descartados (+ em trânsito) ---
+        self.frames_capturados = 0
+        self.frames_processados = 0
+        self.latencia_ms = 0.0        # Idade do último frame publicado (captura -> fila de saída)
+        self.latencia_media_ms = 0.0
+        self.sequencia_captura = 0    # Número do último frame capturado (segue o frame até o anel)
+        self.ultimo_publicado = None  # (sequência, instante de captura) do último frame publicado
+        self.ultimo_evento = None     # Última transição/alerta do state manager, com a latência desde a captura
+        self.nucleos = None  # Núcleos atribuídos pelo orçamento de CPU do Orchestrator
         self.cap = None
         self.width = 0
         self.height = 0
         self.paused = False
         self.detection_enabled = True
         # --- Informações do Produto ---
-        self.product_id = 1 # Placeholder
-        self.product_name = "Produto Padrão" # Placeholder
+        self.product_id = product_id
+        self.product_name = product_name
 
     def stop(self):
         """Sinaliza para a thread de processamento parar."""
         self.should_stop = True
         self.running = False
+        # Sem descarte, quem publica aguarda a etapa seguinte, que já pode ter parado
+        self._canal_captura.fechar()
+        self._canal_inferencia.fechar()
 
     def get_status(self):
         """Retorna o estado atual do processador da câmera."""
@@ -72,14 +146,65 @@ class CameraProcessor:
             "id": self.camera_source,
             "source": str(self.camera_source), # Garante que seja string para JSON
             "running": self.running,
+            "reconectando": self.estado_conexao() == 'reconectando',
             "product_id": self.product_id,
             "product_name": self.product_name,
-            "status_message": sm_status.get('estado', 'N/A')
+            "status_message": sm_status.get('estado', 'N/A'),
+            "multicaixa": self.caixas.get_status() if self.caixas else None,
+            "agendador": self.agendador.get_status(),
+            "movimento": self.portao_movimento.get_status(),
+            "reuso_roi": self.reuso_roi.get_status(),
+            "mascara": self.mascara.get_status() if self.mascara else None,
+            "rastreador": self.rastreador.get_status(),
+            "pipeline": self.get_pipeline_status(),
+            "captura": self.get_captura_status(),
+            "anel": self.anel.get_status(),
+            "conexao": {"estado": self.estado_conexao(), "erro": self.erro_reproducao, **self.reconexao.get_status()},
+            "fonte": {"backend": self.backend_captura,
+                      **(self.cap.get_status() if hasattr(self.cap, 'get_status') else {})},
+            "inicializacao": self.inicializacao,
+            "nucleos": self.nucleos
+        }
+
+    def get_pipeline_status(self):
+        """Ocupação de cada etapa e frames descartados entre etapas."""
+        return {
+            "habilitado": self.pipeline_habilitado,
+            "etapas": {etapa: medidor.get_status() for etapa, medidor in self.ocupacao.items()},
+            "descartados_captura": self._canal_captura.descartados,
+            "descartados_inferencia": self._canal_inferencia.descartados,
+            "erros": dict(self.erros_etapas),
         }
 
+    def get_captura_status(self):
+        """Frames capturados, processados e descartados, e a idade dos frames publicados."""
+        return {
+            "frames_capturados": self.frames_capturados,
+            "frames_processados": self.frames_processados,
+            "frames_descartados": self._canal_captura.descartados + self._canal_inferencia.descartados,
+            "latencia_ms": round(self.latencia_ms, 1),
+            "latencia_media_ms": round(self.latencia_media_ms, 1),
+            "sequencia_captura": self.sequencia_captura,
+            "ultimo_publicado": self._descrever_ultimo_publicado(),
+            "ultimo_evento": self.ultimo_evento,
+            "buffers_alocados": self._pool.alocacoes,
+            "alocacoes_por_frame": round(self._pool.alocacoes / self.frames_capturados, 3) if self.frames_capturados else 0.0,
+        }
+
+    def _descrever_ultimo_publicado(self):
+        if self.ultimo_publicado is None:
+            return None
+        sequencia, instante = self.ultimo_publicado
+        idade_ms = round((time.monotonic() - instante) * 1000, 1) if self.relogio_de_parede else None
+        return {"sequencia_captura": sequencia, "instante_captura": round(instante, 4), "idade_ms": idade_ms}
+
+    def _abrir_captura(self):
+        """Abre a fonte pelo backend de captura da câmera."""
+        return abrir_captura(self.fonte_captura, self.backend_captura, self.modo_reproducao, self.parametros_captura)
+
     def initialize(self):
         """Inicializa a captura da câmera e configura a resolução."""
-        self.cap = cv2.VideoCapture(self.camera_source)
+        self.cap = cv2.VideoCapture(self.fonte_captura)
         if not self.cap.isOpened():
             self.logger.warning(f"Não foi possível abrir a câmera {self.camera_source}")
             return False
@@ -91,19 +216,147 @@ class CameraProcessor:
         self.logger.info(f"Câmera {self.camera_source} aberta com sucesso ({self.width}x{self.height})")
         return True
 
-    def process_frame(self, frame):
-        """Processa um frame da câmera."""
-        frame = cv2.flip(frame, 1)
-        
-        caixas, itens, divisores, itens_na_roi = [], [], [], []
+    def _detectar(self, frame, com_itens=True, caixas=None):
+        """Executa a detecção pelo serviço compartilhado ou pelo detector próprio."""
+        if self.inference_service is not None:
+            return self.inference_service.detectar(self.camera_source, frame, com_itens, self.product_id,
+                                                   caixas=caixas)
+        return self.detector.detectar_objetos(frame, com_itens, caixas)
+
+    def resetar_contagem(self):
+        """Zera a contagem da câmera (tecla 'r' do visualizador local)."""
+        if self.caixas:
+            self.caixas.resetar()
+        self.state_manager._resetar_sistema()
+
+    def trocar_produto(self, product_id, product_name):
+        """Passa a usar os modelos de outro produto; a contagem recomeça do zero."""
+        self.product_id = product_id
+        self.product_name = product_name
+        self.state_manager = SimpleStateManager()
+        if self.caixas:
+            self.caixas = GerenciadorCaixas()
+        self.rastreador = RastreadorDeteccoes()
+        self.portao_movimento = PortaoMovimento(limiar=self.portao_movimento.limiar)
+        self.reuso_roi = ReusoROI()
+        self.ultimas_deteccoes = (Deteccoes(), Deteccoes(), Deteccoes(), Deteccoes())
+        self.logger.info(f"Produto alterado para {product_name} (id {product_id})")
+
+    def process_frame(self, frame, instante_captura=None):
+        """Processa um frame avulso (todas as etapas em sequência)."""
+        self.sequencia_captura += 1
+        instante_captura = time.monotonic() if instante_captura is None else instante_captura
+        self._publicar_resultado(*self._inferir(QuadroCapturado(frame, instante_captura, self.sequencia_captura)))
+
+    def _inferir(self, quadro):
+        """Etapa de inferência: decide os modelos, detecta e rastreia.
+
+        Retorna (quadro, deteccoes, novo); `novo` indica que as detecções vêm
+        deste frame e devem atualizar o state manager.
+        """
+        frame, instante_captura = quadro.frame, quadro.instante
+        caixas = itens = divisores = itens_na_roi = Deteccoes()
+        novo = False
         if self.detection_enabled:
-            caixas, itens, divisores = self.detector.detectar_objetos(frame)
-            itens_na_roi = filtrar_itens_na_roi(itens, caixas)
-            roi_presente = len(caixas) > 0
-            self.state_manager.atualizar_estado(roi_presente, itens_na_roi, divisores)
+            # Com várias caixas, a caixa mais exigente (ex.: uma ainda contando) define a política
+            estados = self.caixas.estados() if self.caixas else self.state_manager.status_sistema
+            modelos = self.agendador.decidir(estados, instante_captura)
+            if modelos is None:
+                # Frame fora da taxa do estado atual: sem inferência nem atualização de estado
+                caixas, itens, divisores, itens_na_roi = self.ultimas_deteccoes
+            else:
+                propagar = modelos == 'todos' and self.rastreador.deve_propagar()
+                com_itens = modelos == 'todos' and not propagar
+                # Com máscara, portão de movimento e detector veem só a região ativa
+                entrada = self._aplicar_mascara(frame)
+                resultado = self.portao_movimento.reaproveitar(entrada, com_itens)
+                if resultado is None:
+                    caixas_reusadas = self.reuso_roi.reaproveitar(entrada, self.state_manager.roi_estabilizada())
+                    if caixas_reusadas is not None and not com_itens:
+                        # Só a ROI interessava e ela está em cache: nenhum modelo roda neste frame
+                        resultado = (caixas_reusadas, Deteccoes(), Deteccoes())
+                    else:
+                        resultado = self._detectar(entrada, com_itens, caixas_reusadas)
+                    if resultado is not None:
+                        self.portao_movimento.memorizar(resultado, com_itens)
+                        if caixas_reusadas is None:
+                            self.reuso_roi.memorizar(entrada, resultado[0])
+                if resultado is not None and self.mascara:
+                    resultado = self.mascara.restaurar(resultado)
+                # Detecções em cache também alimentam o state manager (os timers seguem avançando);
+                # sem resultado (serviço parado ou timeout) o frame não atualiza o estado
+                if resultado is not None:
+                    caixas, itens, divisores = resultado
+                    if propagar:
+                        itens, divisores = self.rastreador.prever()
+                    elif com_itens:
+                        itens, divisores = self.rastreador.atualizar(itens, divisores)
+                    if self.caixas:
+                        itens_na_roi = itens[atribuir_a_caixas(itens, caixas) >= 0]
+                    else:
+                        itens_na_roi = filtrar_itens_na_roi(itens, caixas)
+                    self.agendador.registrar(len(caixas) > 0)
+                    self.ultimas_deteccoes = (caixas, itens, divisores, itens_na_roi)
+                    novo = True
+        return quadro, (caixas, itens, divisores, itens_na_roi), novo
+
+    def _aplicar_mascara(self, frame):
+        """Região ativa do frame; uma máscara que não cabe no frame é descartada (frame inteiro)."""
+        if self.mascara is None:
+            return frame
+        try:
+            return self.mascara.aplicar(frame)
+        except ValueError as e:
+            self.logger.error(f"{e} - máscara desativada, usando o frame inteiro")
+            self.mascara = None
+            return frame
+
+    def _publicar_resultado(self, quadro, deteccoes, novo):
+        """Etapa de estado + visualização: atualiza o state manager, desenha e publica o frame no anel.
+
+        O frame capturado não é alterado: ele é copiado (espelhado, se configurado)
+        direto para o slot do anel, e o desenho é feito sobre o slot.
+        """
+        frame, instante_captura = quadro.frame, quadro.instante
+        caixas, itens, divisores, itens_na_roi = deteccoes
+        if novo and self.caixas:
+            caixas_detectadas = caixas
+            caixas, eventos = self.caixas.atualizar(caixas, itens_na_roi, divisores,
+                                                    instante_captura, quadro.sequencia)
+            # Frames pulados pelo agendador redesenham as caixas já com os IDs das trilhas
+            # (só se a inferência ainda não guardou detecções de um frame mais novo)
+            ultimas = self.ultimas_deteccoes
+            if ultimas[0] is caixas_detectadas:
+                self.ultimas_deteccoes = (caixas,) + ultimas[1:]
+            self.state_manager = self.caixas.principal()
+            if eventos:
+                self._registrar_evento(eventos[-1])
+        elif novo:
+            eventos_antes = self.state_manager.eventos_total
+            self.state_manager.atualizar_estado(len(caixas) > 0, itens_na_roi, divisores,
+                                                instante_captura, quadro.sequencia)
+            if self.state_manager.eventos_total != eventos_antes:
+                self._registrar_evento(self.state_manager.eventos[-1])
         
         status_info = self.state_manager.get_status()
-        
+        self.frames_processados += 1
+        self.ultimo_publicado = (quadro.sequencia, instante_captura)
+        if not self._canal_captura.sem_descarte:  # Em velocidade máxima o relógio do vídeo não é o da parede
+            self.latencia_ms = (time.monotonic() - instante_captura) * 1000
+            self.latencia_media_ms = 0.9 * self.latencia_media_ms + 0.1 * self.latencia_ms
+
+        self.height, self.width = frame.shape[:2]
+        saida = self.anel.reservar(frame.shape)
+        if saida is None:
+            return  # Frame maior que o slot do anel (contado em anel.frames_grandes_demais)
+        # Única passada sobre a imagem inteira: o espelhamento acontece na cópia para o anel
+        if self.espelhar:
+            cv2.flip(frame, 1, dst=saida)
+            caixas, itens_na_roi, divisores = (d.espelhar(self.width) for d in (caixas, itens_na_roi, divisores))
+        else:
+            np.copyto(saida, frame)
+        frame = saida
+
         # Adiciona de volta a exibição dos controles na tela
         self.visualizer.desenhar_controles(frame, self.height)
 
@@ -114,76 +367,215 @@ class CameraProcessor:
             'divisores': len(divisores)
         }
         self.visualizer.desenhar_painel_status(frame, status_info, self.width, self.height, contadores_yolo)
-        self.visualizer.desenhar_deteccoes(frame, caixas, itens_na_roi, divisores)
+        self.visualizer.desenhar_deteccoes(frame, caixas, itens_na_roi, divisores, self._rotulos_caixas(caixas))
 
         if self.paused:
             self.visualizer.desenhar_overlay_pausa(frame, self.width, self.height)
-        
-        # Em vez de mostrar, coloca o frame na fila
-        try:
-            self.output_queue.put_nowait({'frame': frame, 'status': self.state_manager.get_status()})
-        except Exception: # Normalmente queue.Full
-            # Se a fila estiver cheia, descarta o frame para não travar o processamento.
-            pass
+
+        # Em vez de mostrar, publica no anel; leitores lentos apenas pulam frames
+        self.anel.confirmar(instante_captura, quadro.sequencia)
+
+    def _rotulos_caixas(self, caixas):
+        """Com várias caixas, cada ROI é identificada com o seu ID e contagem."""
+        if not self.caixas:
+            return None
+        rotulos = []
+        for id_caixa in caixas.ids.tolist():
+            state_manager = self.caixas.state_managers.get(id_caixa)
+            if state_manager is None:
+                rotulos.append("ROI")
+            else:
+                rotulos.append(f"ROI #{id_caixa} {state_manager.contagem_estabilizada}/"
+                               f"{state_manager.PERFIL_CAIXA['itens_por_camada']}")
+        return rotulos
+
+    def _registrar_evento(self, evento):
+        """Guarda a última transição/alerta com a latência da captura do frame até a decisão."""
+        self.ultimo_evento = dict(evento)
+        if not self._canal_captura.sem_descarte:
+            self.ultimo_evento['latencia_captura_ms'] = round((time.monotonic() - evento['instante_captura']) * 1000, 1)
+
+    def _loop_inferencia(self):
+        """Thread da etapa de inferência: sempre sobre o frame capturado mais recente."""
+        while not self.should_stop:
+            quadro = self._canal_captura.consumir()
+            if quadro is None:
+                continue
+            try:
+                with self.ocupacao['inferencia']:
+                    saida = self._inferir(quadro)
+            except Exception as e:
+                # Um frame com erro é descartado; a etapa continua viva
+                self._registrar_erro_etapa('inferencia', quadro, e)
+                self._pool.devolver(quadro.frame)
+                continue
+            self._canal_inferencia.publicar(saida)
+
+    def _loop_sequencial(self):
+        """Thread única de processamento (pipeline desabilitado), também sobre o frame mais recente."""
+        while not self.should_stop:
+            quadro = self._canal_captura.consumir()
+            if quadro is None:
+                continue
+            try:
+                with self.ocupacao['inferencia']:
+                    self._publicar_resultado(*self._inferir(quadro))
+            except Exception as e:
+                self._registrar_erro_etapa('inferencia', quadro, e)
+            self._pool.devolver(quadro.frame)
+
+    def _loop_estado(self):
+        """Thread da etapa de estado + visualização."""
+        while not self.should_stop:
+            saida = self._canal_inferencia.consumir()
+            if saida is None:
+                continue
+            try:
+                with self.ocupacao['estado']:
+                    self._publicar_resultado(*saida)
+            except Exception as e:
+                self._registrar_erro_etapa('estado', saida[0], e)
+            self._pool.devolver(saida[0].frame)
+
+    def _registrar_erro_etapa(self, etapa, quadro, erro):
+        self.erros_etapas[etapa] += 1
+        if self.erros_etapas[etapa] == 1:
+            self.logger.error(f"Erro na etapa de {etapa} (frame {quadro.sequencia}): {erro}\n{traceback.format_exc()}")
+        else:
+            self.logger.error(f"Erro na etapa de {etapa} (frame {quadro.sequencia}): {type(erro).__name__}: {erro}")
+
+    def _iniciar_etapas(self):
+        self._canal_captura.reabrir()
+        self._canal_inferencia.reabrir()
+        if self.pipeline_habilitado:
+            alvos = [self._loop_inferencia, self._loop_estado]
+        else:
+            alvos = [self._loop_sequencial]
+        self._etapas = [threading.Thread(target=alvo, daemon=True) for alvo in alvos]
+        for etapa in self._etapas:
+            etapa.start()
+
+    def _parar_etapas(self):
+        self._canal_captura.fechar()
+        self._canal_inferencia.fechar()
+        for etapa in self._etapas:
+            etapa.join()
+        self._etapas = []
+
+    def ids_threads(self):
+        """IDs nativos das threads desta câmera (captura e etapas), para a afinidade de CPU."""
+        ids = [self._id_thread] if self._id_thread else []
+        return ids + [etapa.native_id for etapa in self._etapas if etapa.native_id]
+
+    def estado_conexao(self):
+        """'conectada', 'abrindo' (primeira abertura), 'reconectando', 'concluida'/'erro' (vídeo) ou 'parada'."""
+        if self._id_thread is None:
+            return 'parada'
+        if self.erro_reproducao:
+            return 'erro'
+        if self.reproducao_concluida:
+            return 'concluida'
+        if self.running:
+            return 'conectada'
+        return 'reconectando' if self.was_ever_connected else 'abrindo'
+
+    def _encerrar_reproducao_com_erro(self, motivo):
+        """Termina a reprodução de um vídeo inválido em vez de tentar reabri-lo para sempre."""
+        self.erro_reproducao = motivo
+        self.reproducao_concluida = True
+        self.logger.error(f"Reprodução de {self.camera_source} falhou: {motivo}")
+
+    def _conectar(self, cap, inicio_run):
+        """Adota uma captura aberta pelo gerenciador de reconexão."""
+        self.cap = cap
+        largura, altura = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if self.was_ever_connected:
+            self.logger.info(f"Câmera {self.camera_source} reconectada com sucesso!")
+        else:
+            self.inicializacao['abertura_ms'] = round((time.monotonic() - inicio_run) * 1000, 1)
+            self.logger.info(f"Câmera {self.camera_source} aberta com sucesso ({largura}x{altura}) "
+                             f"em {self.inicializacao['abertura_ms']:.0f}ms")
+        self.running = True
+        self.was_ever_connected = True
 
     def run(self):
         """O loop principal de processamento da câmera."""
-        self.cap = cv2.VideoCapture(self.camera_source)
-        if not self.cap.isOpened():
-            self.logger.warning(f"Câmera {self.camera_source} não encontrada - aguardando conexão...")
-            self.running = False
-        else:
-            self.logger.info(f"Câmera {self.camera_source} aberta com sucesso ({int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))})")
-            self.running = True
-            self.was_ever_connected = True
+        # As etapas criadas abaixo herdam a afinidade desta thread
+        self._id_thread = threading.get_native_id()
+        fixar_afinidade([0], self.nucleos)
+        inicio_run = time.monotonic()
 
-        # Loop principal - continua rodando mesmo se a câmera se desconectar
+        # Esta thread só captura: decodifica sem parar e sobrescreve o slot do último frame,
+        # e o processamento (em paralelo) sempre pega o frame mais recente
+        self._iniciar_etapas()
+
+        # Loop principal - continua rodando mesmo se a câmera se desconectar.
+        # Aberturas (inclusive a primeira) rodam no pool do gerenciador de reconexão:
+        # câmeras abrem em paralelo e esta thread continua atendendo stop/status
+        self.reconexao.reiniciar()
         while not self.should_stop:
             if self.running and not self.paused:
                 # Câmera está conectada - processa frames normalmente
-                ret, frame = self.cap.read()
+                with self.ocupacao['captura']:
+                    # Decodifica em um buffer já usado (sem alocar uma imagem nova por frame)
+                    buffer = self._pool.obter()
+                    ret, frame = self.cap.read(image=buffer)
+                    # Na reprodução de vídeo o instante vem do relógio do vídeo
+                    instante_captura = self.cap.instante if self.reproducao else time.monotonic()
                 if not ret:
-                    if self.was_ever_connected:
-                        self.logger.error(f"Câmera {self.camera_source} desconectada - aguardando reconexão...")
+                    if buffer is not None:
+                        self._pool.devolver(buffer)
                     self.running = False
                     self.cap.release()
-                    self.reconnection_attempts = 0
+                    if self.reproducao and self.cap.terminou:
+                        if not self.cap.indice:
+                            self._encerrar_reproducao_com_erro("nenhum frame decodificável")
+                            continue
+                        # Fim do arquivo: as etapas terminam os frames em trânsito e a câmera fica ociosa
+                        self.reproducao_concluida = True
+                        self.logger.info(f"Reprodução de {self.camera_source} concluída ({self.cap.indice} frames)")
+                        continue
+                    self.logger.error(f"Câmera {self.camera_source} desconectada - aguardando reconexão...")
+                    self.reconexao.reiniciar()
                     continue
-                
-                # Processa o frame normalmente
-                self.process_frame(frame)
-                
+
+                if self.inicializacao['primeiro_frame_ms'] is None:
+                    self.inicializacao['primeiro_frame_ms'] = round((instante_captura - inicio_run) * 1000, 1)
+                self.frames_capturados += 1
+                self.sequencia_captura += 1
+                self._pool.registrar_leitura(buffer, frame)
+                self._canal_captura.publicar(QuadroCapturado(frame, instante_captura, self.sequencia_captura))
+
+            elif self.reproducao_concluida:
+                time.sleep(0.1)
+
             elif not self.running:
-                # Câmera desconectada - tenta reconectar periodicamente
-                self.reconnection_attempts += 1
-                
-                # Log apenas na primeira tentativa para evitar spam
-                if self.reconnection_attempts == 1:
-                    if self.was_ever_connected:
-                        self.logger.error(f"Câmera {self.camera_source} desconectada - aguardando reconexão...")
-                    # Para câmeras nunca conectadas, já foi logado no início
-                
-                # Suprime temporariamente os logs do OpenCV para evitar spam
-                cv2.setLogLevel(0)  # Silencia OpenCV
-                self.cap = cv2.VideoCapture(self.camera_source)
-                cv2.setLogLevel(1)  # Restaura logs do OpenCV
-                
-                if self.cap.isOpened():
-                    self.logger.info(f"Câmera {self.camera_source} reconectada com sucesso!")
-                    self.running = True
-                    self.was_ever_connected = True
-                    self.reconnection_attempts = 0
-                    self.disconnection_logged = False
-                else:
-                    time.sleep(15)  # Aguarda 15 segundos antes de tentar novamente
-                    
+                # Câmera desconectada - a reconexão segue o backoff, sem bloquear esta thread
+                tentativas = self.reconexao.tentativas
+                cap = self.reconexao.verificar()
+                if cap is not None:
+                    self._conectar(cap, inicio_run)
+                    continue
+                if self.reproducao and self.reconexao.tentativas > tentativas:
+                    # Um arquivo que não abriu não vai abrir na próxima tentativa
+                    self._encerrar_reproducao_com_erro("não foi possível abrir o arquivo")
+                    continue
+                if self.reconexao.tentativas == 1 and tentativas == 0 and not self.was_ever_connected:
+                    # Log apenas na primeira falha para evitar spam
+                    self.logger.warning(f"Câmera {self.camera_source} não encontrada - aguardando conexão...")
+                time.sleep(0.05)
+
             else:
                 # Câmera pausada
                 time.sleep(0.1)
 
         # Cleanup ao sair
+        self.reconexao.cancelar()
+        self._parar_etapas()
         if self.cap:
             self.cap.release()
+        self.running = False
+        self._id_thread = None
         self.logger.info(f"Thread da câmera {self.camera_source} finalizada")
 
     def release(self):
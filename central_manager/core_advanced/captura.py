@@ -0,0 +1,305 @@
+"""
+Backends de captura das câmeras.
+
+- 'opencv': cv2.VideoCapture (câmeras USB pelo índice e o que mais o OpenCV abrir);
+- 'pyav':   FFmpeg via PyAV para câmeras IP (RTSP/HTTP), com decodificação
+            multithread, conversão já na resolução de inferência e opção de
+            decodificar só keyframes;
+- 'video':  arquivo gravado como câmera (ver `reproducao`).
+
+Todos expõem a interface de `cv2.VideoCapture` usada pelo CameraProcessor:
+read(image=None), isOpened(), get(propriedade) e release().
+
+Medição de FPS e CPU por backend (a partir da raiz do projeto). Com
+`--servir`, um arquivo local é servido por HTTP e lido como câmera de rede:
+    python -m central_manager.core_advanced.captura --camera-id 3
+    python -m central_manager.core_advanced.captura --servir videos_test/WIN_20250721_09_03_05_Pro.mp4 --backends opencv pyav
+"""
+
+import argparse
+import functools
+import http.server
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .config import CAPTURA_CONFIG, REPRODUCAO_CONFIG
+from .reproducao import ReproducaoVideo, eh_arquivo_video
+
+try:
+    import av
+except ImportError:  # PyAV é opcional: sem ele câmeras IP abrem pelo OpenCV
+    av = None
+
+ESQUEMAS_REDE = ('rtsp://', 'rtsps://', 'http://', 'https://', 'rtmp://', 'udp://', 'tcp://')
+
+
+def fonte_da_camera(dados_camera):
+    """Fonte de captura de uma linha da tabela `cameras`: índice USB ou URL da câmera IP.
+
+    A URL pode vir pronta em `config_json['url']`; senão é montada como
+    rtsp://[usuario:senha@]ip_address:porta/caminho. None se a linha não
+    tem nem índice nem endereço.
+    """
+    if dados_camera.get('device_index') is not None:
+        return int(dados_camera['device_index'])
+    config_json = dados_camera.get('config_json') or {}
+    if config_json.get('url'):
+        return config_json['url']
+    if not dados_camera.get('ip_address'):
+        return None
+    credenciais = ''
+    if config_json.get('usuario'):
+        credenciais = f"{config_json['usuario']}:{config_json.get('senha', '')}@"
+    caminho = config_json.get('caminho', '/').lstrip('/')
+    return f"rtsp://{credenciais}{dados_camera['ip_address']}:{dados_camera.get('porta') or 554}/{caminho}"
+
+
+def parametros_da_camera(dados_camera):
+    """Resolução e FPS pedidos na linha da tabela `cameras` (só os preenchidos)."""
+    parametros = {'largura': dados_camera.get('resolucao_width'), 'altura': dados_camera.get('resolucao_height'),
+                  'fps': dados_camera.get('fps')}
+    return {chave: valor for chave, valor in parametros.items() if valor}
+
+
+def escolher_backend(camera_source, backend=None):
+    """Backend da fonte: o pedido, o de CAPTURA_CONFIG, ou detectado pelo tipo da fonte."""
+    backend = backend or CAPTURA_CONFIG['backend']
+    if backend:
+        return backend
+    if eh_arquivo_video(camera_source):
+        return 'video'
+    if isinstance(camera_source, str) and camera_source.lower().startswith(ESQUEMAS_REDE) and av is not None:
+        return 'pyav'
+    return 'opencv'
+
+
+def relogio_de_parede(camera_source, backend=None, modo_reproducao=None):
+    """Se o instante dos frames é comparável a time.monotonic() (idade e latência).
+
+    Não na reprodução de vídeo em velocidade máxima: o relógio do vídeo corre
+    à frente do da parede.
+    """
+    return not (escolher_backend(camera_source, backend) == 'video' and
+                (modo_reproducao or REPRODUCAO_CONFIG['modo']) == 'maxima')
+
+
+def abrir_captura(camera_source, backend=None, modo_reproducao=None, parametros=None):
+    """Abre a fonte com o backend adequado (ver `escolher_backend`).
+
+    `parametros` (ver `parametros_da_camera`) só reduzem trabalho, nunca o
+    aumentam: no PyAV a largura limita a largura de decodificação; no OpenCV
+    a resolução (limitada por `largura_saida`) e o FPS só são pedidos ao
+    dispositivo se ficarem abaixo dos nativos.
+    """
+    parametros = parametros or {}
+    backend = escolher_backend(camera_source, backend)
+    if backend == 'video':
+        return ReproducaoVideo(camera_source, modo=modo_reproducao)
+    if backend == 'pyav':
+        config = CAPTURA_CONFIG
+        if parametros.get('largura'):
+            largura = min(config['largura_saida'] or parametros['largura'], parametros['largura'])
+            config = {**config, 'largura_saida': largura}
+        return CapturaPyAV(camera_source, config)
+    if backend != 'opencv':
+        raise ValueError(f"Backend de captura desconhecido: {backend}")
+    # Buffer interno mínimo: o slot de último frame do CameraProcessor já faz o papel de buffer
+    cap = cv2.VideoCapture(camera_source)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    if cap.isOpened():
+        _limitar_captura_opencv(cap, parametros)
+    return cap
+
+
+def _limitar_captura_opencv(cap, parametros):
+    """Pede ao dispositivo a resolução/FPS da câmera quando ficam abaixo dos nativos."""
+    largura_nativa, altura_nativa = cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+    if parametros.get('largura') and largura_nativa and altura_nativa:
+        largura = min(CAPTURA_CONFIG['largura_saida'] or parametros['largura'], parametros['largura'])
+        if largura < largura_nativa:
+            # Altura na proporção pedida pela câmera (ou na nativa)
+            proporcao = (parametros['altura'] / parametros['largura'] if parametros.get('altura')
+                         else altura_nativa / largura_nativa)
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, largura)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(round(largura * proporcao)))
+    fps_nativo = cap.get(cv2.CAP_PROP_FPS)
+    if parametros.get('fps') and fps_nativo and parametros['fps'] < fps_nativo:
+        cap.set(cv2.CAP_PROP_FPS, parametros['fps'])
+
+
+class CapturaPyAV:
+    """Captura de câmera IP pelo FFmpeg (PyAV), com a interface de `cv2.VideoCapture`.
+
+    A decodificação usa as threads do FFmpeg (`threads_decodificacao`, 0 =
+    automático) e cada frame é convertido para BGR já em `largura_saida`
+    (swscale faz escala + conversão em uma passada), então um stream 1080p
+    nunca vira uma imagem BGR 1080p. Com `apenas_keyframes` o decodificador
+    descarta os demais frames (útil em câmeras de GOP curto e cenas lentas).
+    """
+
+    def __init__(self, url, config=None):
+        if av is None:
+            raise ImportError("PyAV não instalado: pip install av")
+        self.url = url
+        self.config = config or CAPTURA_CONFIG
+        self.container = None
+        self.stream = None
+        self._frames = None
+        self.largura = self.altura = 0
+        self.fps = 0.0
+        # --- Métricas ---
+        self.frames_decodificados = 0
+        self.erros = 0
+        self.erro_abertura = None
+        try:
+            self._abrir()
+        except (av.error.FFmpegError, OSError) as e:
+            # isOpened() fica False e o gerenciador de reconexão tenta de novo com backoff
+            self.erro_abertura = str(e)
+            self.container = None
+
+    def _abrir(self):
+        opcoes = {}
+        if self.url.lower().startswith(('rtsp://', 'rtsps://')):
+            opcoes['rtsp_transport'] = self.config['rtsp_transport']
+        self.container = av.open(self.url, options=opcoes, timeout=self.config['timeout_s'])
+        self.stream = self.container.streams.video[0]
+        contexto = self.stream.codec_context
+        self.stream.thread_type = 'AUTO'  # Threads por frame e por fatia
+        contexto.thread_count = self.config['threads_decodificacao']
+        if self.config['apenas_keyframes']:
+            contexto.skip_frame = 'NONKEY'
+
+        largura_nativa, altura_nativa = contexto.width, contexto.height
+        # Nunca amplia: largura_saida acima da nativa fica na nativa
+        self.largura = min(self.config['largura_saida'] or largura_nativa, largura_nativa)
+        self.altura = int(round(altura_nativa * self.largura / largura_nativa / 2)) * 2
+        self.fps = float(self.stream.average_rate or 0)
+        self._frames = self.container.decode(self.stream)
+
+    def isOpened(self):
+        return self.container is not None
+
+    def get(self, propriedade):
+        if propriedade == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.largura
+        if propriedade == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.altura
+        if propriedade == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+
+    def set(self, propriedade, valor):
+        return False
+
+    def read(self, image=None):
+        """Próximo frame em BGR na resolução de saída; reaproveita `image` se tiver a forma certa."""
+        if self.container is None:
+            return False, None
+        try:
+            quadro = next(self._frames)
+        except (StopIteration, av.error.FFmpegError, OSError):
+            self.erros += 1
+            return False, None
+        convertido = quadro.reformat(width=self.largura, height=self.altura, format='bgr24')
+        self.frames_decodificados += 1
+
+        # View sobre o plano do FFmpeg (linhas podem ter padding) copiada uma vez para o buffer
+        plano = convertido.planes[0]
+        linhas = np.frombuffer(plano, dtype=np.uint8).reshape(self.altura, plano.line_size)
+        origem = linhas[:, :self.largura * 3].reshape(self.altura, self.largura, 3)
+        if image is None or image.shape != origem.shape:
+            image = np.empty(origem.shape, dtype=np.uint8)
+        np.copyto(image, origem)
+        return True, image
+
+    def release(self):
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+
+    def get_status(self):
+        return {
+            "resolucao_saida": [self.largura, self.altura],
+            "apenas_keyframes": self.config['apenas_keyframes'],
+            "frames_decodificados": self.frames_decodificados,
+            "erros": self.erros,
+        }
+
+
+def medir_backend(camera_source, backend, max_frames):
+    """Lê até `max_frames` frames e retorna (frames, fps, ms de CPU por frame, resolução)."""
+    cap = abrir_captura(camera_source, backend, modo_reproducao='maxima')
+    if not cap.isOpened():
+        return 0, 0.0, 0.0, None
+    frames = 0
+    buffer = resolucao = None
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    while frames < max_frames:
+        ret, buffer = cap.read(image=buffer)
+        if not ret:
+            break
+        resolucao = buffer.shape[1::-1]
+        frames += 1
+    duracao, cpu = time.perf_counter() - inicio, time.process_time() - inicio_cpu
+    cap.release()
+    return frames, (frames / duracao if duracao > 0 else 0.0), (cpu / frames * 1000 if frames else 0.0), resolucao
+
+
+class _ManipuladorSilencioso(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def servir_arquivo(caminho):
+    """Serve o arquivo por HTTP em uma porta local livre e retorna a URL (câmera de rede de teste)."""
+    diretorio, nome = os.path.split(os.path.abspath(caminho))
+    manipulador = functools.partial(_ManipuladorSilencioso, directory=diretorio)
+    servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), manipulador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{servidor.server_address[1]}/{nome}"
+
+
+def main():
+    from ..shared.config_loader import ConfigLoader
+
+    parser = argparse.ArgumentParser(description="Compara FPS e CPU dos backends de captura sobre a mesma fonte.")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument('--fonte', type=str, help="Índice USB, URL (rtsp://, http://) ou arquivo.")
+    origem.add_argument('--camera-id', type=int, help="ID da câmera na tabela `cameras`.")
+    origem.add_argument('--servir', type=str, help="Arquivo de vídeo servido localmente por HTTP como câmera IP.")
+    parser.add_argument('--backends', nargs='+', default=['opencv', 'pyav'], choices=['opencv', 'pyav', 'video'])
+    parser.add_argument('--frames', type=int, default=300, help="Máximo de frames por backend.")
+    args = parser.parse_args()
+
+    if args.servir:
+        fonte = servir_arquivo(args.servir)
+    elif args.camera_id is not None:
+        dados = ConfigLoader().load_camera_config(args.camera_id)
+        if not dados:
+            print(f"[ERRO] Câmera {args.camera_id} não encontrada no banco.")
+            return
+        fonte = fonte_da_camera(dados)
+        if fonte is None:
+            print(f"[ERRO] Câmera {args.camera_id} sem device_index nem ip_address.")
+            return
+    else:
+        fonte = int(args.fonte) if args.fonte.isdigit() else args.fonte
+
+    print(f"\n--- Captura: {fonte} ---")
+    print(f"{'backend':<8} {'frames':>7} {'FPS':>8} {'CPU ms/frame':>13} {'resolução':>11}")
+    for backend in args.backends:
+        if backend == 'pyav' and av is None:
+            print(f"{backend:<8} PyAV não instalado")
+            continue
+        frames, fps, cpu_ms, resolucao = medir_backend(fonte, backend, args.frames)
+        texto_resolucao = f"{resolucao[0]}x{resolucao[1]}" if resolucao else "-"
+        print(f"{backend:<8} {frames:>7} {fps:>8.1f} {cpu_ms:>13.2f} {texto_resolucao:>11}")
+
+
+if __name__ == '__main__':
+    main()
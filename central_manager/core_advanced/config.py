@@ -18,6 +18,10 @@ STATE_CONFIG = {
     'tamanho_buffer_estabilizacao': 5,
     'percentual_itens_novos_minimo': 0.7,  # CORRIGIDO: 70% como no legacy
     'distancia_minima_item_novo': 50,
+    # Memória espacial: com um-para-um, cada item de uma camada anterior descarta no máximo
+    # um item atual (o mais próximo), em vez de "absorver" todos os que estão perto dele
+    'atribuicao_um_para_um': False,
+    'limite_pares_memoria': 65536,  # Acima de itens atuais x memorizados: KD-tree (SciPy) ou blocos
     'tempo_limite_caixa_ausente': 30.0,
     'itens_minimos_camada_2_estabelecida': 5,
     'tempo_carencia_divisor_ausente': 3.0,
@@ -31,4 +35,155 @@ STATE_CONFIG = {
     'tempo_divisor_estavel_minimo': 3.0,  # Tempo mínimo que divisor deve estar estável
     'tempo_maximo_instabilidade_divisor': 2.0,  # Tempo após perda do divisor considerado suspeito
     'usar_validacao_divisor_salto': True,  # Habilitar validação por divisor
-}
\ No newline at end of file
+}
+
+# Configuração do YOLODetector
+DETECTOR_CONFIG = {
+    # Modo cascata: pula o modelo de itens quando não há ROI e, havendo,
+    # roda-o apenas no recorte da ROI (com padding em pixels)
+    'modo_cascata': False,
+    'padding_cascata': 20,
+    # Backend de inferência: 'torch', 'onnx', 'openvino' ou 'openvino_int8'
+    # (este último gerado pela ferramenta de quantização). Pode ser
+    # sobrescrito por produto via `produtos.config_json` (chave 'backend')
+    'backend': 'torch',
+    # Tamanho de entrada da inferência (None = padrão do ultralytics, 640).
+    # Ajustado por produto pela ferramenta `ajuste_imgsz` (chave 'imgsz' do config_json)
+    'imgsz': None,
+    # Usa o modelo único de 3 classes (caixa, item, divisor) em vez dos dois modelos
+    'modelo_unificado': False,
+}
+
+# Agendador de inferência por estado do SimpleStateManager
+# taxa_hz: taxa máxima de inferência (None = taxa da câmera)
+# modelos: 'roi' (só o modelo de ROI) ou 'todos'
+# roi_esperada: presença de ROI esperada no estado; se a observação divergir,
+#   o agendador roda na taxa da câmera até encher o buffer de estabilização
+AGENDADOR_CONFIG = {
+    'habilitado': True,
+    'politicas': {
+        'AGUARDANDO_CAIXA': {'taxa_hz': 2.0, 'modelos': 'roi', 'roi_esperada': False},
+        'CAIXA_COMPLETA': {'taxa_hz': 2.0, 'modelos': 'roi', 'roi_esperada': True},
+        'CONTANDO_ITENS': {'taxa_hz': None, 'modelos': 'todos'},
+        'AGUARDANDO_DIVISOR': {'taxa_hz': None, 'modelos': 'todos'},
+    },
+    'politica_padrao': {'taxa_hz': None, 'modelos': 'todos'},
+}
+
+# Portão de movimento: reaproveita detecções quando a cena está estática
+# limiar: diferença absoluta média (0-255) entre frames reduzidos em cinza; por câmera,
+# `limiar_movimento` no config_json da tabela `cameras` substitui o padrão
+MOVIMENTO_CONFIG = {
+    'habilitado': True,
+    'limiar': 3.0,
+    'largura_reduzida': 64,
+    'max_frames_reaproveitados': 30,  # Força uma inferência a cada N frames estáticos
+}
+
+# Reuso da ROI: com a caixa parada, o modelo de ROI roda só a cada `intervalo`
+# frames (ou quando a região da caixa muda); nos demais a última ROI é reaproveitada
+# limiar_movimento: diferença absoluta média (0-255) no recorte reduzido da caixa
+REUSO_ROI_CONFIG = {
+    'habilitado': True,
+    'intervalo': 5,
+    'limiar_movimento': 6.0,
+    'limiar_iou': 0.9,         # Duas inferências seguidas acima disso: caixa parada
+    'largura_reduzida': 32,
+}
+
+# Rastreador de itens/divisores entre keyframes
+# O modelo de itens roda a cada `intervalo_keyframe` frames; nos demais as
+# caixas são propagadas pelo rastreador (só o modelo de ROI é inferido)
+RASTREADOR_CONFIG = {
+    'habilitado': True,
+    'intervalo_keyframe': 3,
+    'limiar_iou': 0.3,
+    'max_idade': 2,  # Keyframes sem associação antes de descartar a trilha
+}
+
+# Várias caixas (ROIs) por câmera, cada uma com o seu state manager (ver `multicaixa`).
+# Desabilitado, só a primeira ROI detectada é considerada (uma estação por câmera)
+MULTICAIXA_CONFIG = {
+    'habilitado': False,
+    'max_caixas': 4,
+    'limiar_iou': 0.3,
+    'max_idade': 15,  # Inferências sem a caixa antes de descartar a trilha e o seu state manager
+}
+
+# Registro de modelos por produto (produtos.id)
+# Pesos de produtos sem câmera ativa são descartados (LRU) acima do orçamento
+REGISTRO_MODELOS_CONFIG = {
+    'orcamento_memoria_mb': 512,  # Estimado pelo tamanho dos arquivos de pesos
+    'aquecer': True,              # Inferência em frame preto logo após o carregamento
+}
+
+# Pipeline por câmera: captura, inferência e estado + visualização em threads
+# ligadas por canais de valor mais recente (frames atrasados são descartados).
+# A captura sempre tem thread própria; desabilitado, inferência e estado rodam juntos
+PIPELINE_CONFIG = {
+    'habilitado': True,
+    'janela_metricas': 2.0,  # Segundos por janela da métrica de ocupação
+}
+
+# Abertura/reconexão de câmeras (pool compartilhado, fora da thread de captura):
+# espera entre tentativas que falham cresce de `espera_inicial` até `espera_maxima`
+RECONEXAO_CONFIG = {
+    'espera_inicial': 1.0,       # Segundos após a primeira falha
+    'espera_maxima': 30.0,       # Teto da espera entre tentativas
+    'fator': 2.0,                # Multiplicador a cada nova falha seguida
+    'jitter': 0.2,               # +-20% de variação aleatória na espera
+    'aberturas_paralelas': 8,    # Aberturas simultâneas (câmeras abrindo juntas na partida)
+}
+
+# Backends de captura (ver `captura`): None escolhe pela fonte (índice USB -> 'opencv',
+# URL rtsp/http -> 'pyav' se o PyAV estiver instalado, arquivo -> 'video')
+CAPTURA_CONFIG = {
+    'backend': None,
+    # --- PyAV (câmeras IP) ---
+    'largura_saida': 640,          # Frames convertidos já nesta largura (None = nativa); altura mantém a proporção
+                                   # Também limita a resolução pedida a câmeras USB com linha na tabela `cameras`
+    'threads_decodificacao': 0,    # Threads do decodificador FFmpeg (0 = automático)
+    'apenas_keyframes': False,     # Decodifica só keyframes (menos CPU, menos FPS)
+    'rtsp_transport': 'tcp',
+    'timeout_s': 5.0,              # Abertura/leitura sem resposta conta como falha (reconexão)
+}
+
+# Arquivos de vídeo como fonte de câmera (ver `reproducao`): 'tempo_real' no FPS
+# nativo do arquivo ou 'maxima' (sem descartar frames, para benchmark)
+REPRODUCAO_CONFIG = {
+    'modo': 'tempo_real',
+    'repetir': False,    # Volta ao início no fim do arquivo (o relógio do vídeo continua avançando)
+    'fps_padrao': 30.0,  # Quando o arquivo não informa o FPS
+}
+
+# Visualização: o frame publicado no anel é espelhado (como no legacy) ao ser copiado
+# para o slot; as detecções ficam nas coordenadas do sensor e só o desenho é espelhado
+VISUALIZACAO_CONFIG = {
+    'espelhar': True,
+}
+
+# Orçamento de CPU (Orchestrator): threads do torch/OpenCV e afinidade de núcleos.
+# A inferência recebe os núcleos que sobram após reservar `threads_por_camera`
+# para cada câmera; a alocação é refeita ao adicionar/remover câmeras
+CPU_CONFIG = {
+    'habilitado': True,
+    'threads_por_camera': 1,
+    'threads_opencv': 1,         # Pool do OpenCV (resize/desenho já rodam em uma thread por câmera)
+    'max_threads_torch': None,   # Limite opcional para as threads intra-op do torch
+    'afinidade': False,          # Fixa inferência e câmeras em núcleos distintos (Linux)
+}
+
+# Modo de execução do Orchestrator:
+# 'thread'   - todas as câmeras em threads do processo da API (inferência em lote compartilhada)
+# 'processo' - cada grupo de `cameras_por_processo` câmeras em um processo worker próprio
+#              (fora do GIL da API); frames expostos por memória compartilhada
+EXECUCAO_CONFIG = {
+    'modo': 'thread',
+    'cameras_por_processo': 1,
+}
+
+# Anel de frames desenhados por câmera em memória compartilhada (stream, gravador, visualizador)
+ANEL_CONFIG = {
+    'slots': 4,                         # Um leitor tem `slots - 1` frames de folga para usar a view sem cópia
+    'tamanho_slot': 1920 * 1080 * 3,    # Bytes por slot (maior frame BGR aceito)
+}
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class Deteccoes:
+    """Conjunto de detecções em arrays NumPy, sem uma tupla Python por caixa.
+
+    - xyxy: (N, 4) int32 com as coordenadas (x1, y1, x2, y2) no frame
+    - conf: (N,) float32 com as confianças
+    - cls:  (N,) int32 com as classes do modelo
+    - ids:  (N,) int32 com o ID de rastreamento (-1 quando não rastreado)
+    """
+    __slots__ = ('xyxy', 'conf', 'cls', 'ids')
+
+    def __init__(self, xyxy=None, conf=None, cls=None, ids=None):
+        self.xyxy = np.empty((0, 4), dtype=np.int32) if xyxy is None else xyxy
+        self.conf = np.empty(0, dtype=np.float32) if conf is None else conf
+        self.cls = np.empty(0, dtype=np.int32) if cls is None else cls
+        self.ids = np.full(len(self.conf), -1, dtype=np.int32) if ids is None else ids
+
+    @classmethod
+    def de_dados(cls, dados, deslocamento=(0, 0)):
+        """Cria a partir da matriz (N, 6) [x1, y1, x2, y2, conf, cls] do ultralytics.
+
+        `deslocamento` (dx, dy) leva coordenadas de um recorte para o frame.
+        """
+        xyxy = dados[:, :4].astype(np.int32)
+        dx, dy = deslocamento
+        if dx or dy:
+            xyxy += np.array([dx, dy, dx, dy], dtype=np.int32)
+        return cls(xyxy, dados[:, 4].astype(np.float32), dados[:, 5].astype(np.int32))
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __getitem__(self, indice):
+        """Seleciona um subconjunto (máscara booleana, índices ou fatia)."""
+        return Deteccoes(self.xyxy[indice], self.conf[indice], self.cls[indice], self.ids[indice])
+
+    def centros(self):
+        """Centros (N, 2) das caixas, em float."""
+        return (self.xyxy[:, :2] + self.xyxy[:, 2:]) / 2.0
+
+    def espelhar(self, largura):
+        """Caixas espelhadas na horizontal, para desenhar sobre o frame exibido com `cv2.flip(frame, 1)`."""
+        xyxy = self.xyxy.copy()
+        xyxy[:, 0] = largura - 1 - self.xyxy[:, 2]
+        xyxy[:, 2] = largura - 1 - self.xyxy[:, 0]
+        return Deteccoes(xyxy, self.conf, self.cls, self.ids)
+
+    def deslocar(self, dx, dy):
+        """Caixas transladadas de (dx, dy), ex.: de um recorte para o frame."""
+        if not (dx or dy):
+            return self
+        return Deteccoes(self.xyxy + np.array([dx, dy, dx, dy], dtype=np.int32), self.conf, self.cls, self.ids)
+
+    def copy(self):
+        return Deteccoes(self.xyxy.copy(), self.conf.copy(), self.cls.copy(), self.ids.copy())
+
+    def __repr__(self):
+        return f"Deteccoes(n={len(self)})"
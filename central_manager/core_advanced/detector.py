@@ -1,29 +1,68 @@
 import os
-from ultralytics import YOLO
+
+import numpy as np
+
+from .backends import carregar_modelo
+from .config import DETECTOR_CONFIG, MULTICAIXA_CONFIG
+from .deteccoes import Deteccoes
 
 # Configurações dos modelos (movido do legacy)
 MODELOS = {
     'item_detector': '_legacy_prototype/modelos_producao/item_detector.pt',
-    'roi_detector': '_legacy_prototype/modelos_producao/roi_detector.pt'
+    'roi_detector': '_legacy_prototype/modelos_producao/roi_detector.pt',
+    # Modelo único de 3 classes (train.py --unificado)
+    'unified_detector': '_legacy_prototype/modelos_producao/unified_detector.pt'
 }
 
+# Classes do modelo unificado (ver organizar_dataset.mesclar_datasets)
+CLASSES_UNIFICADO = {'item': 0, 'divisor': 1, 'caixa': 2}
+
 class YOLODetector:
     """Classe para encapsular a lógica de detecção YOLO."""
-    def __init__(self, confianca_roi=0.5, confianca_item=0.4, confianca_divisor=0.25):
-        print("🧠 Carregando modelos YOLO...")
+    def __init__(self, confianca_roi=0.5, confianca_item=0.4, confianca_divisor=0.25,
+                 modo_cascata=DETECTOR_CONFIG['modo_cascata'],
+                 padding_cascata=DETECTOR_CONFIG['padding_cascata'],
+                 backend=DETECTOR_CONFIG['backend'],
+                 modelo_unificado=DETECTOR_CONFIG['modelo_unificado'],
+                 caminhos=None, imgsz=DETECTOR_CONFIG['imgsz'],
+                 multicaixa=MULTICAIXA_CONFIG['habilitado']):
+        print(f"🧠 Carregando modelos YOLO (backend: {backend})...")
         
-        # Validação de caminhos
-        if not os.path.exists(MODELOS['roi_detector']):
-            print(f"❌ Erro: Modelo ROI não encontrado em {MODELOS['roi_detector']}")
-            raise FileNotFoundError(f"Modelo ROI não encontrado em {MODELOS['roi_detector']}")
-        if not os.path.exists(MODELOS['item_detector']):
-            print(f"❌ Erro: Modelo de item/divisor não encontrado em {MODELOS['item_detector']}")
-            raise FileNotFoundError(f"Modelo de item/divisor não encontrado em {MODELOS['item_detector']}")
-            
-        self.modelo_roi = YOLO(MODELOS['roi_detector'])
-        self.modelo_itens = YOLO(MODELOS['item_detector'])
+        # `caminhos` sobrescreve entradas de MODELOS (ex.: pesos de um produto específico)
+        modelos = {**MODELOS, **(caminhos or {})}
+        self.backend = backend
+        self.modelo_unificado = None
+        self.modelo_roi = None
+        self.modelo_itens = None
+
+        if modelo_unificado:
+            # Uma única passada por frame: caixa, item e divisor no mesmo modelo
+            if not os.path.exists(modelos['unified_detector']):
+                print(f"❌ Erro: Modelo unificado não encontrado em {modelos['unified_detector']}")
+                raise FileNotFoundError(f"Modelo unificado não encontrado em {modelos['unified_detector']}")
+            self.modelo_unificado = carregar_modelo(modelos['unified_detector'], backend, imgsz or 640)
+            self.arquivos = [modelos['unified_detector']]
+        else:
+            # Validação de caminhos
+            if not os.path.exists(modelos['roi_detector']):
+                print(f"❌ Erro: Modelo ROI não encontrado em {modelos['roi_detector']}")
+                raise FileNotFoundError(f"Modelo ROI não encontrado em {modelos['roi_detector']}")
+            if not os.path.exists(modelos['item_detector']):
+                print(f"❌ Erro: Modelo de item/divisor não encontrado em {modelos['item_detector']}")
+                raise FileNotFoundError(f"Modelo de item/divisor não encontrado em {modelos['item_detector']}")
+
+            self.modelo_roi = carregar_modelo(modelos['roi_detector'], backend, imgsz or 640)
+            self.modelo_itens = carregar_modelo(modelos['item_detector'], backend, imgsz or 640)
+            self.arquivos = [modelos['roi_detector'], modelos['item_detector']]
         print("✅ Modelos YOLO carregados com sucesso!")
         
+        # Tamanho de entrada da inferência (None = padrão do ultralytics)
+        self.imgsz = imgsz
+        self.opcoes_inferencia = {'verbose': False}
+        if imgsz:
+            self.opcoes_inferencia['imgsz'] = imgsz
+            print(f"🔹 Tamanho de inferência: {imgsz}px")
+
         self.confianca_roi = confianca_roi
         self.confianca_item = confianca_item
         self.confianca_divisor = confianca_divisor
@@ -31,34 +70,131 @@ class YOLODetector:
         print(f"🔹 Confiança ROI/Itens: {self.confianca_roi}/{self.confianca_item}")
         print(f"🔹 Confiança Divisores: {self.confianca_divisor}")
 
-    def detectar_objetos(self, frame):
+        # Modo cascata: modelo de itens só roda dentro da ROI detectada
+        # (não se aplica ao modelo unificado, que já faz uma única passada)
+        self.modo_cascata = modo_cascata and self.modelo_unificado is None
+        self.padding_cascata = padding_cascata
+        self.multicaixa = multicaixa  # Cascata sobre o retângulo que envolve todas as ROIs
+        if self.modo_cascata:
+            print(f"🔹 Modo cascata ativo (padding {self.padding_cascata}px)")
+
+    def tamanho_em_bytes(self):
+        """Estimativa da memória ocupada pelos modelos (tamanho dos arquivos de pesos)."""
+        return sum(os.path.getsize(arquivo) for arquivo in self.arquivos if os.path.exists(arquivo))
+
+    def aquecer(self, altura=480, largura=640):
+        """Roda uma inferência em um frame preto para que o primeiro frame real não pague a inicialização."""
+        frame = np.zeros((altura, largura, 3), dtype=np.uint8)
+        self.detectar_lote([frame], [True])
+
+    def detectar_objetos(self, frame, com_itens=True, caixas=None):
         """Detecta ROI, itens e divisores no frame."""
+        return self.detectar_lote([frame], [com_itens], [caixas])[0]
+
+    def detectar_lote(self, frames, com_itens=None, caixas=None):
+        """Detecta ROI, itens e divisores em um lote de frames.
+
+        Executa uma única passada por modelo para todo o lote e retorna uma
+        lista de tuplas (caixas, itens, divisores) de `Deteccoes`, na mesma
+        ordem dos frames. `com_itens` (um bool por frame) permite pular o
+        modelo de itens onde só a ROI interessa; ali itens e divisores vêm vazios.
+        `caixas` (Deteccoes ou None por frame) traz ROIs já conhecidas (ver
+        `ReusoROI`): esses frames não passam pelo modelo de ROI. O modelo
+        unificado ignora `caixas`, já que detecta tudo em uma passada.
+        """
+        if not frames:
+            return []
+        if com_itens is None:
+            com_itens = [True] * len(frames)
+        if caixas is None:
+            caixas = [None] * len(frames)
         try:
-            # Detectar ROI
-            resultados_roi = self.modelo_roi(frame, verbose=False)
-            caixas = []
-            for r in resultados_roi:
-                for box in r.boxes:
-                    if box.conf >= self.confianca_roi:
-                        x1, y1, x2, y2 = map(int, box.xyxy[0])
-                        caixas.append(((x1, y1, x2, y2), float(box.conf)))
-            
-            # Detectar Itens e Divisores
-            resultados_itens = self.modelo_itens(frame, verbose=False)
-            itens = []
-            divisores = []
-            for r in resultados_itens:
-                for box in r.boxes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    conf = float(box.conf)
-                    cls = int(box.cls[0])
-                    
-                    if cls == 0 and conf >= self.confianca_item: # Classe 0: item
-                        itens.append(((x1, y1, x2, y2), conf))
-                    elif cls == 1 and conf >= self.confianca_divisor: # Classe 1: divisor
-                        divisores.append(((x1, y1, x2, y2), conf))
-            
-            return caixas, itens, divisores
+            if self.modelo_unificado is not None:
+                resultados = self.modelo_unificado(frames, **self.opcoes_inferencia)
+                return [self._extrair_unificado(r) for r in resultados]
+
+            caixas_lote = list(caixas)
+            indices = [i for i, conhecidas in enumerate(caixas) if conhecidas is None]
+            if indices:
+                resultados_roi = self.modelo_roi([frames[i] for i in indices], **self.opcoes_inferencia)
+                for indice, resultado in zip(indices, resultados_roi):
+                    caixas_lote[indice] = self._extrair_caixas(resultado)
+
+            if self.modo_cascata:
+                itens_lote = self._detectar_itens_cascata(frames, caixas_lote, com_itens)
+            else:
+                itens_lote = self._detectar_itens(frames, com_itens)
+
+            return [(caixas,) + itens for caixas, itens in zip(caixas_lote, itens_lote)]
         except Exception as e:
             print(f"❌ Erro na detecção: {e}")
-            return [], [], []
\ No newline at end of file
+            return [(Deteccoes(), Deteccoes(), Deteccoes()) for _ in frames]
+
+    def _detectar_itens(self, frames, com_itens):
+        """Roda o modelo de itens (em lote) apenas nos frames que o pedem."""
+        itens_lote = [(Deteccoes(), Deteccoes()) for _ in frames]
+        indices = [i for i, pedir in enumerate(com_itens) if pedir]
+        if indices:
+            resultados_itens = self.modelo_itens([frames[i] for i in indices], **self.opcoes_inferencia)
+            for indice, resultado in zip(indices, resultados_itens):
+                itens_lote[indice] = self._extrair_itens_divisores(resultado)
+        return itens_lote
+
+    def _detectar_itens_cascata(self, frames, caixas_lote, com_itens):
+        """Roda o modelo de itens apenas no recorte (com padding) da ROI principal.
+
+        Frames sem ROI não passam pelo modelo de itens. As coordenadas são
+        devolvidas no sistema do frame original. Usa `caixas[0]`, a mesma ROI
+        considerada por `filtrar_itens_na_roi`; com `multicaixa`, o retângulo
+        que envolve todas as ROIs.
+        """
+        itens_lote = [(Deteccoes(), Deteccoes()) for _ in frames]
+        recortes, deslocamentos, indices = [], [], []
+
+        for indice, (frame, caixas, pedir) in enumerate(zip(frames, caixas_lote, com_itens)):
+            if not pedir or not len(caixas):
+                continue
+            regioes = caixas.xyxy if self.multicaixa else caixas.xyxy[:1]
+            x1, y1 = regioes[:, :2].min(axis=0).tolist()
+            x2, y2 = regioes[:, 2:].max(axis=0).tolist()
+            altura, largura = frame.shape[:2]
+            x1 = max(0, x1 - self.padding_cascata)
+            y1 = max(0, y1 - self.padding_cascata)
+            x2 = min(largura, x2 + self.padding_cascata)
+            y2 = min(altura, y2 + self.padding_cascata)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            recortes.append(frame[y1:y2, x1:x2])
+            deslocamentos.append((x1, y1))
+            indices.append(indice)
+
+        if recortes:
+            resultados_itens = self.modelo_itens(recortes, **self.opcoes_inferencia)
+            for indice, deslocamento, resultado in zip(indices, deslocamentos, resultados_itens):
+                itens_lote[indice] = self._extrair_itens_divisores(resultado, deslocamento)
+
+        return itens_lote
+
+    def _extrair_unificado(self, resultado):
+        """Separa as detecções do modelo unificado em (caixas, itens, divisores)."""
+        deteccoes = Deteccoes.de_dados(resultado.boxes.data.cpu().numpy())
+        caixas = deteccoes[(deteccoes.cls == CLASSES_UNIFICADO['caixa']) & (deteccoes.conf >= self.confianca_roi)]
+        itens = deteccoes[(deteccoes.cls == CLASSES_UNIFICADO['item']) & (deteccoes.conf >= self.confianca_item)]
+        divisores = deteccoes[(deteccoes.cls == CLASSES_UNIFICADO['divisor']) & (deteccoes.conf >= self.confianca_divisor)]
+        return caixas, itens, divisores
+
+    def _extrair_caixas(self, resultado):
+        """Converte o resultado do modelo de ROI em `Deteccoes` de caixas."""
+        # Uma única transferência tensor -> NumPy: [x1, y1, x2, y2, conf, cls] por caixa
+        caixas = Deteccoes.de_dados(resultado.boxes.data.cpu().numpy())
+        return caixas[caixas.conf >= self.confianca_roi]
+
+    def _extrair_itens_divisores(self, resultado, deslocamento=(0, 0)):
+        """Converte o resultado do modelo de itens em `Deteccoes` de itens e divisores.
+
+        `deslocamento` é a origem (x, y) do recorte no frame, usada no modo cascata.
+        """
+        deteccoes = Deteccoes.de_dados(resultado.boxes.data.cpu().numpy(), deslocamento)
+        itens = deteccoes[(deteccoes.cls == 0) & (deteccoes.conf >= self.confianca_item)]  # Classe 0: item
+        divisores = deteccoes[(deteccoes.cls == 1) & (deteccoes.conf >= self.confianca_divisor)]  # Classe 1: divisor
+        return itens, divisores
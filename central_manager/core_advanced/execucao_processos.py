@@ -0,0 +1,227 @@
+"""
+Modo de execução com um processo por câmera (ou grupo de câmeras).
+
+Cada processo worker roda um Orchestrator em modo thread para o seu grupo,
+fora do GIL do processo principal (API). Os frames desenhados de cada câmera
+são publicados no AnelQuadros (memória compartilhada) criado pelo processo
+principal, e o controle (status, pausa, detecção, troca de produto,
+start/stop) passa por um Pipe de requisição/resposta.
+"""
+
+import itertools
+import multiprocessing as mp
+import threading
+import time
+
+from .captura import relogio_de_parede
+from .orcamento_cpu import fixar_afinidade
+
+# Processos via spawn: o worker não herda threads nem estado do torch do processo principal
+CONTEXTO = mp.get_context('spawn')
+
+class ProcessoCameras:
+    """Processo worker de um grupo de câmeras, visto do processo principal."""
+
+    def __init__(self, cameras, product_id, nucleos=None):
+        self.cameras = cameras  # {camera_source: CameraRemota}
+        self.nucleos = nucleos
+        self.conexao, conexao_worker = CONTEXTO.Pipe()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        configuracao = {source: (camera.product_id, camera.limiar_movimento, camera.modo_reproducao,
+                                 camera.backend_captura, camera.mascara, camera.fonte_captura,
+                                 camera.parametros_captura)
+                        for source, camera in cameras.items()}
+        self.processo = CONTEXTO.Process(target=executar_worker, daemon=True,
+                                         args=(configuracao, product_id, nucleos, conexao_worker))
+        for camera in cameras.values():
+            camera.processo = self
+
+    def iniciar(self):
+        self.processo.start()
+
+    def enviar(self, comando, *args, timeout=10.0):
+        """Executa um comando no worker e retorna a resposta (exceções do worker são relançadas)."""
+        with self._lock:
+            id_requisicao = next(self._ids)
+            self.conexao.send((id_requisicao, comando, args))
+            limite = time.monotonic() + timeout
+            while True:
+                restante = limite - time.monotonic()
+                if restante <= 0 or not self.conexao.poll(restante):
+                    raise TimeoutError(f"Worker não respondeu ao comando '{comando}'")
+                id_resposta, resposta = self.conexao.recv()
+                if id_resposta == id_requisicao:
+                    break  # Respostas de comandos que expiraram são descartadas
+        if isinstance(resposta, Exception):
+            raise resposta
+        return resposta
+
+    def encerrar(self, timeout=10.0):
+        """Pede ao worker para parar suas câmeras e aguarda o fim do processo."""
+        try:
+            with self._lock:
+                self.conexao.send((0, 'encerrar', ()))
+        except (BrokenPipeError, OSError):
+            pass
+        self.processo.join(timeout)
+        if self.processo.is_alive():
+            self.processo.terminate()
+            self.processo.join()
+        self.conexao.close()
+
+
+class CameraRemota:
+    """No processo principal, substitui o CameraProcessor de uma câmera que roda em um worker.
+
+    Expõe a mesma interface usada pela API e pelo visualizador local
+    (get_status, stop, paused, detection_enabled, resetar_contagem, trocar_produto).
+    """
+
+    def __init__(self, camera_source, product_id, product_name, anel, limiar_movimento=None, modo_reproducao=None,
+                 backend_captura=None, mascara=None, fonte_captura=None, parametros_captura=None):
+        self.camera_source = camera_source
+        self.product_id = product_id
+        self.product_name = product_name
+        self.limiar_movimento = limiar_movimento
+        self.modo_reproducao = modo_reproducao
+        self.backend_captura = backend_captura
+        self.mascara = mascara
+        self.fonte_captura = fonte_captura
+        self.parametros_captura = parametros_captura
+        # Instantes dos frames do anel comparáveis a time.monotonic() (ver `captura.relogio_de_parede`)
+        self.relogio_de_parede = relogio_de_parede(camera_source if fonte_captura is None else fonte_captura,
+                                                   backend_captura, modo_reproducao)
+        self.anel = anel  # Criado aqui, escrito pelo CameraProcessor do worker
+        self.processo = None  # ProcessoCameras, definido quando o worker é criado
+        self.status_state_manager = {}
+        self._status = {}
+        self._instante_status = 0.0
+        self._paused = False
+        self._detection_enabled = True
+        self.nucleos = None
+
+    def _enviar(self, comando, *args, timeout=10.0):
+        if self.processo is None:
+            return None
+        return self.processo.enviar(comando, self.camera_source, *args, timeout=timeout)
+
+    def get_status(self):
+        """Status do CameraProcessor remoto (em cache por 200 ms)."""
+        if self.processo is not None and time.monotonic() - self._instante_status > 0.2:
+            try:
+                self._status, self.status_state_manager = self._enviar('status', timeout=1.0)
+                self._instante_status = time.monotonic()
+            except (TimeoutError, EOFError, OSError, KeyError):
+                pass  # Worker iniciando ou finalizado: mantém o último status
+        return self._status or {
+            "id": self.camera_source,
+            "source": str(self.camera_source),
+            "running": False,
+            "product_id": self.product_id,
+            "product_name": self.product_name,
+            "status_message": 'N/A',
+        }
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @paused.setter
+    def paused(self, valor):
+        self._paused = valor
+        self._enviar('definir', 'paused', valor)
+
+    @property
+    def detection_enabled(self):
+        return self._detection_enabled
+
+    @detection_enabled.setter
+    def detection_enabled(self, valor):
+        self._detection_enabled = valor
+        self._enviar('definir', 'detection_enabled', valor)
+
+    def resetar_contagem(self):
+        self._enviar('resetar')
+
+    def trocar_produto(self, product_id, product_name):
+        self._enviar('trocar_produto', product_id)
+        self.product_id = product_id
+        self.product_name = product_name
+
+    def iniciar(self):
+        self._enviar('iniciar')
+
+    def stop(self):
+        self._enviar('parar')
+
+    def remover(self):
+        self._enviar('remover')
+
+    def ids_threads(self):
+        return []  # Threads vivem no processo worker
+
+
+def _executar_comando(orchestrator, comando, args):
+    if comando == 'inferencia':
+        return orchestrator.get_inference_status()
+    if comando == 'nucleos':
+        return orchestrator.definir_nucleos(args[0])
+
+    camera_source = args[0]
+    data = orchestrator.processors.get(camera_source)
+    if data is None:
+        raise KeyError(f"Câmera {camera_source} não está neste worker")
+    processor = data['processor']
+    if comando == 'status':
+        return processor.get_status(), processor.state_manager.get_status()
+    if comando == 'definir':
+        atributo, valor = args[1:]
+        if atributo not in ('paused', 'detection_enabled'):
+            raise ValueError(f"Atributo não controlável: {atributo}")
+        setattr(processor, atributo, valor)
+    elif comando == 'resetar':
+        processor.resetar_contagem()
+    elif comando == 'trocar_produto':
+        orchestrator.trocar_produto(camera_source, args[1])
+    elif comando == 'iniciar':
+        orchestrator.start_processor(camera_source)
+    elif comando == 'parar':
+        orchestrator.stop_processor(camera_source)
+    elif comando == 'remover':
+        orchestrator.remove_camera(camera_source)
+    else:
+        raise ValueError(f"Comando desconhecido: {comando}")
+    return None
+
+
+def executar_worker(configuracao, product_id, nucleos, conexao):
+    """Ponto de entrada do processo worker: Orchestrator em modo thread para o grupo de câmeras."""
+    from .orchestrator import Orchestrator  # Evita import circular no processo principal
+
+    fixar_afinidade([0], nucleos)
+    orchestrator = Orchestrator(product_id, modo='thread', nucleos=nucleos)
+    for camera_source, (product_id_camera, limiar_movimento, modo_reproducao, backend_captura,
+                        mascara, fonte_captura, parametros_captura) in configuracao.items():
+        orchestrator.add_camera(camera_source, limiar_movimento=limiar_movimento, product_id=product_id_camera,
+                                criar_anel=False, modo_reproducao=modo_reproducao, backend_captura=backend_captura,
+                                mascara=mascara, fonte_captura=fonte_captura, parametros_captura=parametros_captura)
+    orchestrator.start()
+
+    try:
+        while True:
+            try:
+                if not conexao.poll(0.5):
+                    continue
+                id_requisicao, comando, args = conexao.recv()
+            except (EOFError, OSError):
+                break  # Processo principal finalizado
+            if comando == 'encerrar':
+                break
+            try:
+                resposta = _executar_comando(orchestrator, comando, args)
+            except Exception as e:
+                resposta = e
+            conexao.send((id_requisicao, resposta))
+    finally:
+        orchestrator.stop()
@@ -0,0 +1,65 @@
+"""
+Gravador de vídeo a partir do anel de frames de uma câmera.
+
+Conecta-se ao AnelQuadros publicado pelo SIAC (API, visualizador local ou
+processo worker) e grava os frames desenhados em um arquivo, sem interferir
+no stream nem no processamento da câmera.
+
+Uso (a partir da raiz do projeto, com o SIAC rodando):
+    python -m central_manager.core_advanced.gravador --camera 0 --saida gravacao.avi
+    python -m central_manager.core_advanced.gravador --anel siac_rtsp_192_168_0_10 --duracao 60
+"""
+
+import argparse
+import time
+
+import cv2
+
+from .anel_quadros import AnelQuadros, nome_anel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava os frames de uma câmera a partir do seu anel em memória compartilhada.")
+    origem = parser.add_mutually_exclusive_group(required=True)
+    origem.add_argument('--camera', type=str, help="Fonte da câmera como foi adicionada ao Orchestrator (ex.: 0).")
+    origem.add_argument('--anel', type=str, help="Nome do segmento de memória compartilhada.")
+    parser.add_argument('--saida', type=str, default='gravacao.avi', help="Arquivo de vídeo de saída.")
+    parser.add_argument('--fps', type=float, default=15.0, help="FPS gravado no arquivo.")
+    parser.add_argument('--duracao', type=float, default=None, help="Segundos de gravação (padrão: até Ctrl+C).")
+    args = parser.parse_args()
+
+    if args.anel:
+        nome = args.anel
+    else:
+        # Câmeras USB são adicionadas pelo índice inteiro, mas o nome sanitizado é o mesmo
+        nome = nome_anel(args.camera)
+    try:
+        anel = AnelQuadros(nome, criar=False)
+    except FileNotFoundError:
+        print(f"[ERRO] Anel '{nome}' não encontrado. O SIAC está rodando com essa câmera?")
+        return
+
+    leitor = anel.leitor()
+    escritor = None
+    limite = None if args.duracao is None else time.monotonic() + args.duracao
+    print(f"🎥 Gravando '{nome}' em {args.saida} (Ctrl+C para parar)...")
+    try:
+        while limite is None or time.monotonic() < limite:
+            quadro = leitor.proximo(timeout=1.0, todos=True)
+            if quadro is None:
+                continue
+            if escritor is None:
+                altura, largura = quadro.frame.shape[:2]
+                escritor = cv2.VideoWriter(args.saida, cv2.VideoWriter_fourcc(*'MJPG'), args.fps, (largura, altura))
+            escritor.write(quadro.frame)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if escritor is not None:
+            escritor.release()
+        anel.fechar()
+    print(f"✅ {leitor.frames_lidos} frames gravados ({leitor.frames_pulados} perdidos) em {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import threading
+import time
+
+from .simple_logger import SimpleLogger
+
+
+class _Requisicao:
+    """Frame aguardando inferência e o resultado devolvido pelo serviço."""
+    __slots__ = ('camera_source', 'frame', 'com_itens', 'caixas', 'product_id', 'resultado', 'evento')
+
+    def __init__(self, camera_source, frame, com_itens=True, product_id=None, caixas=None):
+        self.camera_source = camera_source
+        self.frame = frame
+        self.com_itens = com_itens
+        self.caixas = caixas  # ROI já conhecida: o modelo de ROI é pulado
+        self.product_id = product_id
+        self.resultado = None
+        self.evento = threading.Event()
+
+    def resolver(self, resultado):
+        self.resultado = resultado
+        self.evento.set()
+
+
+class InferenceService:
+    """Serviço central de inferência compartilhado por todos os CameraProcessors.
+
+    Obtém os detectores do RegistroModelos (modelos carregados uma só vez
+    por produto) e, a cada ciclo, junta o frame mais recente de cada câmera
+    em um lote, executando uma passada por modelo para cada produto do lote.
+    O resultado volta para o processador que enviou o frame, que o aplica ao
+    seu próprio state manager.
+    """
+
+    def __init__(self, registro_modelos, product_id_padrao=1, tamanho_maximo_lote=8, espera_lote=0.005):
+        self.registro_modelos = registro_modelos
+        self.product_id_padrao = product_id_padrao
+        self.tamanho_maximo_lote = tamanho_maximo_lote
+        self.espera_lote = espera_lote  # Janela para outras câmeras entrarem no lote
+        self.logger = SimpleLogger("INFERENCE")
+        self.running = False
+        self._pendentes = {}  # {camera_source: _Requisicao}
+        self._condicao = threading.Condition()
+        self._thread = None
+        # --- Métricas ---
+        self.lotes_processados = 0
+        self.frames_processados = 0
+        self.frames_substituidos = 0
+        self.requisicoes_expiradas = 0  # Retiradas da fila após o timeout de `detectar`
+        self.erros_lote = 0
+
+    def start(self):
+        """Inicia a thread de inferência em lote."""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        self.logger.info("Serviço de inferência iniciado")
+
+    def stop(self):
+        """Para a thread e libera quem ainda aguarda resultado."""
+        with self._condicao:
+            self.running = False
+            pendentes = list(self._pendentes.values())
+            self._pendentes.clear()
+            self._condicao.notify_all()
+        for requisicao in pendentes:
+            requisicao.resolver(None)
+        if self._thread:
+            self._thread.join()
+        self.logger.info("Serviço de inferência finalizado")
+
+    def ids_threads(self):
+        """ID nativo da thread de inferência (onde o torch cria seu pool), para a afinidade de CPU."""
+        return [self._thread.native_id] if self._thread and self._thread.native_id else []
+
+    def submeter(self, camera_source, frame, com_itens=True, product_id=None, caixas=None):
+        """Enfileira o frame de uma câmera, substituindo um frame ainda não processado."""
+        product_id = self.product_id_padrao if product_id is None else product_id
+        requisicao = _Requisicao(camera_source, frame, com_itens, product_id, caixas)
+        with self._condicao:
+            anterior = self._pendentes.get(camera_source)
+            self._pendentes[camera_source] = requisicao
+            self._condicao.notify()
+        if anterior is not None:
+            self.frames_substituidos += 1
+            anterior.resolver(None)
+        return requisicao
+
+    def detectar(self, camera_source, frame, com_itens=True, product_id=None, timeout=2.0, caixas=None):
+        """Envia o frame e aguarda (caixas, itens, divisores), ou None se não houve resultado.
+
+        Passado o `timeout`, o frame ainda na fila é retirado dela; se já está
+        num lote em inferência, o lote é aguardado. Ao retornar o serviço não
+        lê mais o `frame`, e o buffer pode voltar ao PoolQuadros.
+        """
+        requisicao = self.submeter(camera_source, frame, com_itens, product_id, caixas)
+        if requisicao.evento.wait(timeout):
+            return requisicao.resultado
+        with self._condicao:
+            if self._pendentes.get(camera_source) is requisicao:
+                del self._pendentes[camera_source]
+                self.requisicoes_expiradas += 1
+                return None
+        requisicao.evento.wait()
+        return requisicao.resultado
+
+    def _coletar_lote(self):
+        """Aguarda frames pendentes e retira até `tamanho_maximo_lote` deles."""
+        with self._condicao:
+            while self.running and not self._pendentes:
+                self._condicao.wait(timeout=0.5)
+            if not self.running:
+                return []
+
+        # Pequena espera para que as demais câmeras entreguem seus frames
+        if self.espera_lote > 0 and len(self._pendentes) < self.tamanho_maximo_lote:
+            time.sleep(self.espera_lote)
+
+        with self._condicao:
+            fontes = list(self._pendentes)[:self.tamanho_maximo_lote]
+            return [self._pendentes.pop(fonte) for fonte in fontes]
+
+    def _loop(self):
+        """Loop principal: uma passada em lote por modelo e por produto a cada ciclo."""
+        while self.running:
+            lote = self._coletar_lote()
+            if not lote:
+                continue
+
+            por_produto = {}
+            for requisicao in lote:
+                por_produto.setdefault(requisicao.product_id, []).append(requisicao)
+
+            for product_id, requisicoes in por_produto.items():
+                try:
+                    detector = self.registro_modelos.obter(product_id)
+                except Exception as e:
+                    self.logger.error(f"Modelos do produto {product_id} indisponíveis: {e}")
+                    for requisicao in requisicoes:
+                        requisicao.resolver(None)
+                    continue
+                try:
+                    resultados = detector.detectar_lote([r.frame for r in requisicoes],
+                                                        [r.com_itens for r in requisicoes],
+                                                        [r.caixas for r in requisicoes])
+                except Exception as e:
+                    # Quem aguarda o lote não pode ficar sem resposta (ver `detectar`)
+                    self.erros_lote += 1
+                    self.logger.error(f"Falha na inferência do lote do produto {product_id}: {e}")
+                    resultados = [None] * len(requisicoes)
+                for requisicao, resultado in zip(requisicoes, resultados):
+                    requisicao.resolver(resultado)
+
+            self.lotes_processados += 1
+            self.frames_processados += len(lote)
+
+    def get_status(self):
+        """Retorna métricas do serviço de inferência."""
+        return {
+            "running": self.running,
+            "lotes_processados": self.lotes_processados,
+            "frames_processados": self.frames_processados,
+            "frames_substituidos": self.frames_substituidos,
+            "requisicoes_expiradas": self.requisicoes_expiradas,
+            "erros_lote": self.erros_lote,
+            "media_frames_por_lote": (self.frames_processados / self.lotes_processados
+                                      if self.lotes_processados else 0.0),
+        }
@@ -0,0 +1,94 @@
+"""
+Máscara estática de inferência por câmera.
+
+Bordas da esteira, paredes e a área do operador nunca contêm uma caixa, mas
+entravam inteiras no YOLO. A máscara define a região ativa da câmera no
+`config_json` da tabela `cameras` (chave `mascara_inferencia`):
+
+    {"mascara_inferencia": {"retangulo": [0.2, 0.0, 0.8, 1.0]}}
+    {"mascara_inferencia": {"poligono": [[0.1, 0.2], [0.9, 0.2], [0.8, 1.0], [0.2, 1.0]]}}
+
+Coordenadas em fração da largura/altura do frame (independem da resolução de
+captura), ou em pixels com `"pixels": true`. Só o retângulo envolvente da
+região vai para a inferência (um recorte, sem cópia); num polígono o que fica
+fora dele é zerado. As detecções voltam para as coordenadas do frame e, no
+polígono, as que têm centro fora da região são descartadas.
+"""
+
+import cv2
+import numpy as np
+
+
+class MascaraInferencia:
+    """Recorta a região ativa de cada frame antes da inferência e leva as detecções de volta ao frame."""
+
+    def __init__(self, definicao):
+        if 'retangulo' in definicao:
+            x1, y1, x2, y2 = definicao['retangulo']
+            pontos = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+            self.tipo = 'retangulo'
+        elif 'poligono' in definicao:
+            pontos = definicao['poligono']
+            self.tipo = 'poligono'
+        else:
+            raise ValueError(f"Máscara de inferência sem 'retangulo' nem 'poligono': {definicao}")
+        self.pontos = np.asarray(pontos, dtype=np.float64).reshape(-1, 2)
+        if len(self.pontos) < 3:
+            raise ValueError(f"Polígono da máscara precisa de ao menos 3 pontos: {pontos}")
+        self.em_pixels = bool(definicao.get('pixels', False))
+        # Calculado por resolução de frame (ver `_preparar`)
+        self._forma = None
+        self.regiao = None      # (x1, y1, x2, y2) do recorte no frame
+        self._mascara = None    # uint8 do tamanho do recorte (255 dentro do polígono), None no retângulo
+        self._buffer = None     # Recorte com o exterior do polígono zerado
+        self.fracao_area = 1.0  # Área do recorte / área do frame
+
+    def _preparar(self, forma):
+        altura, largura = forma[:2]
+        pontos = self.pontos if self.em_pixels else self.pontos * (largura, altura)
+        pontos = np.round(pontos).astype(np.int32)
+        x1, y1 = np.clip(pontos.min(axis=0), 0, (largura, altura))
+        x2, y2 = np.clip(pontos.max(axis=0), 0, (largura, altura))
+        if x2 <= x1 or y2 <= y1:
+            raise ValueError(f"Máscara de inferência fora do frame {largura}x{altura}: {self.pontos.tolist()}")
+        self.regiao = (int(x1), int(y1), int(x2), int(y2))
+        self.fracao_area = float((x2 - x1) * (y2 - y1) / (largura * altura))
+        self._mascara = self._buffer = None
+        if self.tipo == 'poligono':
+            self._mascara = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(self._mascara, [pontos - (x1, y1)], 255)
+            # O exterior nunca é escrito por bitwise_and com máscara: fica zerado
+            self._buffer = np.zeros((y2 - y1, x2 - x1) + tuple(forma[2:]), dtype=np.uint8)
+        self._forma = forma
+
+    def aplicar(self, frame):
+        """Imagem que vai para a inferência: recorte (view) da região ativa do frame."""
+        if frame.shape != self._forma:
+            self._preparar(frame.shape)
+        x1, y1, x2, y2 = self.regiao
+        recorte = frame[y1:y2, x1:x2]
+        if self._mascara is None:
+            return recorte
+        cv2.bitwise_and(recorte, recorte, dst=self._buffer, mask=self._mascara)
+        return self._buffer
+
+    def restaurar(self, resultado):
+        """Leva (caixas, itens, divisores) do recorte para o frame, descartando o que está fora do polígono."""
+        x1, y1 = self.regiao[:2]
+        return tuple(self._filtrar(deteccoes).deslocar(x1, y1) for deteccoes in resultado)
+
+    def _filtrar(self, deteccoes):
+        if self._mascara is None or not len(deteccoes):
+            return deteccoes
+        altura, largura = self._mascara.shape
+        centros = deteccoes.centros().astype(np.int32)
+        xs = np.clip(centros[:, 0], 0, largura - 1)
+        ys = np.clip(centros[:, 1], 0, altura - 1)
+        return deteccoes[self._mascara[ys, xs] > 0]
+
+    def get_status(self):
+        return {
+            "tipo": self.tipo,
+            "regiao": list(self.regiao) if self.regiao else None,
+            "fracao_area": round(self.fracao_area, 3),
+        }
@@ -0,0 +1,75 @@
+import cv2
+
+from .config import MOVIMENTO_CONFIG
+
+
+class PortaoMovimento:
+    """Reaproveita as detecções anteriores quando a cena não mudou.
+
+    Compara o frame atual, reduzido e em tons de cinza, com o último frame
+    que passou pela inferência (diferença absoluta média). Abaixo de `limiar`
+    a cena é considerada estática e o resultado em cache é devolvido, até no
+    máximo `max_frames_reaproveitados` frames seguidos.
+    """
+
+    def __init__(self, limiar=None, config=None):
+        self.config = config or MOVIMENTO_CONFIG
+        self.habilitado = self.config.get('habilitado', True)
+        self.limiar = self.config['limiar'] if limiar is None else limiar
+        self.largura_reduzida = self.config['largura_reduzida']
+        self.max_frames_reaproveitados = self.config['max_frames_reaproveitados']
+        self._referencia = None   # Frame reduzido da última inferência
+        self._atual = None        # Frame reduzido do frame corrente
+        self._resultado_cache = None
+        self._cache_com_itens = False
+        self._reaproveitados_seguidos = 0
+        # --- Métricas ---
+        self.frames_inferidos = 0
+        self.frames_reaproveitados = 0
+        self.ultima_diferenca = 0.0
+
+    def _reduzir(self, frame):
+        altura, largura = frame.shape[:2]
+        altura_reduzida = max(1, int(altura * self.largura_reduzida / largura))
+        pequeno = cv2.resize(frame, (self.largura_reduzida, altura_reduzida), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(pequeno, cv2.COLOR_BGR2GRAY) if pequeno.ndim == 3 else pequeno
+
+    def reaproveitar(self, frame, com_itens=True):
+        """Retorna as detecções em cache se a cena está estática, senão None."""
+        if not self.habilitado:
+            return None
+
+        self._atual = self._reduzir(frame)
+        if (self._resultado_cache is None or self._referencia is None
+                or (com_itens and not self._cache_com_itens)
+                or self._reaproveitados_seguidos >= self.max_frames_reaproveitados
+                or self._atual.shape != self._referencia.shape):
+            return None
+
+        self.ultima_diferenca = float(cv2.absdiff(self._atual, self._referencia).mean())
+        if self.ultima_diferenca >= self.limiar:
+            return None
+
+        self._reaproveitados_seguidos += 1
+        self.frames_reaproveitados += 1
+        return self._resultado_cache
+
+    def memorizar(self, resultado, com_itens=True):
+        """Guarda o resultado da inferência do frame corrente como nova referência."""
+        self.frames_inferidos += 1
+        if not self.habilitado:
+            return
+        self._referencia = self._atual
+        self._resultado_cache = resultado
+        self._cache_com_itens = com_itens
+        self._reaproveitados_seguidos = 0
+
+    def get_status(self):
+        """Retorna o limiar e os contadores de frames inferidos/reaproveitados."""
+        return {
+            "habilitado": self.habilitado,
+            "limiar": self.limiar,
+            "ultima_diferenca": round(self.ultima_diferenca, 2),
+            "frames_inferidos": self.frames_inferidos,
+            "frames_reaproveitados": self.frames_reaproveitados,
+        }
@@ -0,0 +1,106 @@
+"""
+Várias caixas (ROIs) por câmera, cada uma com o seu SimpleStateManager.
+
+Uma câmera sobre a esteira pode cobrir mais de uma estação. As caixas
+detectadas ganham IDs estáveis por um rastreador IoU; cada trilha tem o seu
+state manager, criado quando a caixa aparece e descartado quando a trilha se
+perde (após `max_idade` inferências sem a caixa). Itens e divisores vão para
+a caixa que contém o seu centro, num único teste vetorizado ponto-em-caixa.
+"""
+
+import numpy as np
+
+from .config import MULTICAIXA_CONFIG
+from .deteccoes import Deteccoes
+from .rastreador import RastreadorIoU
+from .simple_logger import SimpleLogger
+from .state_manager_advanced_layer_01 import SimpleStateManager
+
+
+def atribuir_a_caixas(deteccoes, caixas):
+    """Índice (N,) da caixa que contém o centro de cada detecção, ou -1.
+
+    Em caixas sobrepostas vale a de menor área (a mais específica).
+    """
+    if not len(deteccoes) or not len(caixas):
+        return np.full(len(deteccoes), -1, dtype=np.intp)
+    centros = deteccoes.centros()
+    cx, cy = centros[:, 0:1], centros[:, 1:2]
+    x1, y1, x2, y2 = (caixas.xyxy[:, i][None, :] for i in range(4))
+    dentro = (x1 <= cx) & (cx <= x2) & (y1 <= cy) & (cy <= y2)  # (N, M)
+    areas = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+    indices = np.where(dentro, areas, np.inf).argmin(axis=1)
+    indices[~dentro.any(axis=1)] = -1
+    return indices
+
+
+class GerenciadorCaixas:
+    """Rastreia as caixas da câmera e mantém um SimpleStateManager por caixa."""
+
+    def __init__(self, config=None):
+        self.config = config or MULTICAIXA_CONFIG
+        self.max_caixas = self.config['max_caixas']
+        self.rastreador = RastreadorIoU(self.config['limiar_iou'], self.config['max_idade'])
+        self.state_managers = {}  # {id da trilha: SimpleStateManager}
+        self._ocioso = SimpleStateManager()  # Sem caixas em vista
+        self.logger = SimpleLogger("MULTICAIXA")
+        # --- Métricas ---
+        self.caixas_vistas = 0
+
+    def atualizar(self, caixas, itens, divisores, instante=None, sequencia=None):
+        """Atualiza o state manager de cada caixa com os seus itens e divisores.
+
+        Retorna (caixas com IDs de trilha, novos eventos); cada evento leva o
+        ID da caixa em 'caixa'.
+        """
+        caixas = self.rastreador.atualizar(caixas[:self.max_caixas])
+        vivas = set(self.rastreador.ids.tolist())
+        for id_caixa in [i for i in self.state_managers if i not in vivas]:
+            status = self.state_managers.pop(id_caixa).get_status()
+            self.logger.info(f"📦 Caixa #{id_caixa} saiu de cena ({status['estado']}, {status['total_itens']} itens)")
+
+        indices_itens = atribuir_a_caixas(itens, caixas)
+        indices_divisores = atribuir_a_caixas(divisores, caixas)
+        eventos = []
+        for id_caixa in sorted(vivas):
+            state_manager = self.state_managers.get(id_caixa)
+            if state_manager is None:
+                state_manager = self.state_managers[id_caixa] = SimpleStateManager()
+                self.caixas_vistas += 1
+                self.logger.info(f"📦 Caixa #{id_caixa} entrou em cena")
+            # Trilha viva sem caixa neste frame: o state manager vê a ausência (buffers/timers seguem)
+            posicao = np.flatnonzero(caixas.ids == id_caixa)
+            if len(posicao):
+                j = posicao[0]
+                itens_caixa, divisores_caixa = itens[indices_itens == j], divisores[indices_divisores == j]
+            else:
+                itens_caixa, divisores_caixa = Deteccoes(), Deteccoes()
+            eventos_antes = state_manager.eventos_total
+            state_manager.atualizar_estado(len(posicao) > 0, itens_caixa, divisores_caixa, instante, sequencia)
+            novos = state_manager.eventos_total - eventos_antes
+            if novos:
+                eventos.extend({**evento, 'caixa': id_caixa} for evento in list(state_manager.eventos)[-novos:])
+
+        return caixas, eventos
+
+    def principal(self):
+        """State manager da caixa mais antiga em cena (agendador, painel), ou um ocioso."""
+        if not self.state_managers:
+            return self._ocioso
+        return self.state_managers[min(self.state_managers)]
+
+    def estados(self):
+        """Estado de cada caixa em cena (ou do state manager ocioso), para o agendador."""
+        state_managers = list(self.state_managers.values()) or [self._ocioso]
+        return [state_manager.status_sistema for state_manager in state_managers]
+
+    def resetar(self):
+        for state_manager in self.state_managers.values():
+            state_manager._resetar_sistema()
+
+    def get_status(self):
+        return {
+            "caixas_vistas": self.caixas_vistas,
+            "caixas": {int(id_caixa): state_manager.get_status()
+                       for id_caixa, state_manager in self.state_managers.items()},
+        }
@@ -0,0 +1,117 @@
+import os
+
+import cv2
+
+from .config import CPU_CONFIG
+
+try:
+    import torch
+except ImportError:  # Backends ONNX/OpenVINO sem torch instalado
+    torch = None
+
+
+def nucleos_disponiveis():
+    """Núcleos que o processo pode usar (respeita taskset/cgroups quando suportado)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def fixar_afinidade(ids_threads, nucleos):
+    """Restringe as threads (IDs nativos; 0 = thread atual) aos núcleos dados. Só Linux."""
+    if not nucleos or not hasattr(os, 'sched_setaffinity'):
+        return
+    for id_thread in ids_threads:
+        try:
+            os.sched_setaffinity(id_thread, nucleos)
+        except OSError:
+            pass  # Thread já finalizada
+
+
+class OrcamentoCPU:
+    """Divide os núcleos da máquina entre a inferência e as câmeras.
+
+    A inferência (thread do InferenceService) recebe os núcleos que sobram
+    depois de reservar `threads_por_camera` para cada câmera (captura, estado
+    e desenho), e o torch usa exatamente esse número de threads intra-op. O
+    pool do OpenCV fica em `threads_opencv`, já que cada câmera roda em sua
+    própria thread. Com `afinidade`, cada grupo é fixado em seus núcleos.
+    """
+
+    def __init__(self, config=None, nucleos=None):
+        self.config = config or CPU_CONFIG
+        self.habilitado = self.config.get('habilitado', True)
+        # Em um processo worker, `nucleos` é a fatia da máquina dada pelo processo principal
+        self.nucleos = list(nucleos) if nucleos else nucleos_disponiveis()
+        self.alocacao = {}
+
+    def dividir(self, quantidade):
+        """Divide os núcleos em `quantidade` fatias contíguas (uma por processo worker)."""
+        if quantidade <= 0:
+            return []
+        fatias = []
+        for indice in range(quantidade):
+            inicio = indice * len(self.nucleos) // quantidade
+            fim = (indice + 1) * len(self.nucleos) // quantidade
+            # Mais processos que núcleos: processos compartilham núcleos
+            fatias.append(self.nucleos[inicio:fim] or [self.nucleos[indice % len(self.nucleos)]])
+        return fatias
+
+    def calcular(self, cameras):
+        """Distribui os núcleos entre a inferência e a lista de câmeras."""
+        total = len(self.nucleos)
+        reservados = min(self.config['threads_por_camera'] * len(cameras), total - 1)
+        threads_torch = total - reservados
+        if self.config.get('max_threads_torch'):
+            threads_torch = min(threads_torch, self.config['max_threads_torch'])
+
+        nucleos_inferencia = self.nucleos[:threads_torch]
+        # Câmeras dividem os núcleos restantes (ou todos, se não sobrou nenhum)
+        nucleos_livres = self.nucleos[threads_torch:] or self.nucleos
+        nucleos_cameras = {}
+        for indice, camera in enumerate(cameras):
+            inicio = indice * self.config['threads_por_camera']
+            nucleos_cameras[camera] = [nucleos_livres[(inicio + i) % len(nucleos_livres)]
+                                       for i in range(self.config['threads_por_camera'])]
+
+        return {
+            'nucleos_total': total,
+            'threads_torch': threads_torch,
+            'threads_opencv': self.config['threads_opencv'],
+            'afinidade': self.config.get('afinidade', False),
+            'nucleos_inferencia': nucleos_inferencia,
+            'nucleos_cameras': nucleos_cameras,
+        }
+
+    def aplicar(self, cameras, ids_inferencia=(), ids_cameras=None):
+        """Recalcula a alocação e aplica contagem de threads e, se ativa, a afinidade.
+
+        `ids_inferencia` e `ids_cameras` ({camera: [ids]}) são os IDs nativos
+        das threads já em execução; threads criadas depois herdam a afinidade
+        de quem as criou.
+        """
+        if not self.habilitado:
+            return self.alocacao
+        self.alocacao = self.calcular(list(cameras))
+
+        if torch is not None:
+            torch.set_num_threads(self.alocacao['threads_torch'])
+        cv2.setNumThreads(self.alocacao['threads_opencv'])
+
+        if self.alocacao['afinidade']:
+            fixar_afinidade(ids_inferencia, self.alocacao['nucleos_inferencia'])
+            for camera, ids in (ids_cameras or {}).items():
+                fixar_afinidade(ids, self.alocacao['nucleos_cameras'].get(camera))
+
+        print(f"🧮 Orçamento de CPU: {self.alocacao['threads_torch']} threads de inferência, "
+              f"{len(self.alocacao['nucleos_cameras'])} câmera(s) em {self.alocacao['nucleos_total']} núcleos")
+        return self.alocacao
+
+    def nucleos_da_camera(self, camera):
+        """Núcleos reservados para a câmera, ou None se a afinidade está desativada."""
+        if not self.alocacao.get('afinidade'):
+            return None
+        return self.alocacao['nucleos_cameras'].get(camera)
+
+    def get_status(self):
+        return {"habilitado": self.habilitado, **self.alocacao}
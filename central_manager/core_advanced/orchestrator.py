@@ -1,53 +1,277 @@
 import threading
-from queue import Queue
+import time
 from typing import Dict, Any
 
+from ..shared.config_loader import ConfigLoader
+
+from .anel_quadros import AnelQuadros, nome_anel
 from .camera_processor import CameraProcessor
+from .captura import fonte_da_camera, parametros_da_camera
+from .config import EXECUCAO_CONFIG
+from .execucao_processos import CameraRemota, ProcessoCameras
+from .inference_service import InferenceService
+from .orcamento_cpu import OrcamentoCPU
+from .registro_modelos import RegistroModelos
 
 class Orchestrator:
-    """Gerencia múltiplos processadores de câmera em threads separadas."""
+    """Gerencia múltiplos processadores de câmera em threads ou em processos worker.
+
+    No modo 'thread' as câmeras rodam em threads deste processo e compartilham
+    o InferenceService. No modo 'processo' cada grupo de câmeras roda em um
+    processo worker (ver `execucao_processos`) e aqui ficam apenas proxies
+    (`CameraRemota`) com a mesma interface.
+
+    Os modelos de um produto são carregados quando a primeira câmera dele é
+    adicionada; `precarregar=True` carrega os de `product_id` já aqui.
+    """
 
-    def __init__(self):
+    def __init__(self, product_id=1, modo=None, nucleos=None, precarregar=False):
         self.processors: Dict[Any, Dict[str, Any]] = {}
         self.threads: Dict[Any, threading.Thread] = {}
+        self.processos = []  # ProcessoCameras (modo 'processo')
         self.running = False
+        self.product_id = product_id
+        self.modo = modo or EXECUCAO_CONFIG['modo']
+        self.config_loader = ConfigLoader()
+        # Núcleos divididos entre a inferência e as câmeras (ou entre os workers), refeito a cada câmera adicionada/removida
+        self.orcamento_cpu = OrcamentoCPU(nucleos=nucleos)
+        self.registro_modelos = None
+        self.inference_service = None
+        # Duração de cada etapa da partida (carga dos modelos aqui; abertura e 1º frame em cada câmera)
+        self.tempos_inicializacao = {'modelos_ms': None}
+        if self.modo == 'thread':
+            # Modelos de cada produto carregados uma única vez e compartilhados por todas as câmeras
+            self.registro_modelos = RegistroModelos(self.config_loader)
+            if precarregar:
+                self._carregar_modelos(self.registro_modelos.obter, product_id)
+            self.inference_service = InferenceService(self.registro_modelos, product_id_padrao=product_id)
+            self.orcamento_cpu.aplicar([])
+
+    def _carregar_modelos(self, carregar, product_id):
+        """Carrega (ou reaproveita) os modelos do produto, somando o tempo em `modelos_ms`."""
+        inicio = time.monotonic()
+        carregar(product_id)
+        decorrido_ms = (time.monotonic() - inicio) * 1000
+        self.tempos_inicializacao['modelos_ms'] = round((self.tempos_inicializacao['modelos_ms'] or 0) + decorrido_ms, 1)
+
+    def _nome_produto(self, product_id):
+        return self.config_loader.load_product_config(product_id).get('nome', f"Produto {product_id}")
 
-    def add_camera(self, camera_source):
-        """Adiciona uma nova câmera para ser gerenciada."""
+    def add_camera(self, camera_source, limiar_movimento=None, product_id=None, criar_anel=True,
+                   modo_reproducao=None, backend_captura=None, camera_id=None, mascara=None,
+                   fonte_captura=None, parametros_captura=None):
+        """Adiciona uma nova câmera para ser gerenciada.
+
+        Os frames desenhados vão para um AnelQuadros (`processors[camera]['anel']`);
+        com `criar_anel=False` (processo worker) o anel já existe e é só conectado.
+        Um arquivo de vídeo também é aceito como câmera, reproduzido no
+        `modo_reproducao` dado ('tempo_real' ou 'maxima'), assim como URLs de
+        câmeras IP; `backend_captura` força um backend (ver `captura`).
+        Com `camera_id` (tabela `cameras`), o que não for dado vem da linha da
+        câmera: a fonte aberta (`device_index`, ou a URL montada de
+        `ip_address`/`porta`), a resolução e o FPS pedidos (`fonte_da_camera`,
+        `parametros_da_camera`), e a máscara de inferência e o limiar do
+        portão de movimento do `config_json` (`mascara_inferencia`,
+        `limiar_movimento`; sem eles valem os padrões de `config`).
+        `camera_source` segue como a chave da câmera.
+        """
         if camera_source in self.processors:
             print(f"Aviso: Câmera {camera_source} já existe.")
             return
 
-        output_queue = Queue(maxsize=2)  # Fila pequena para evitar latência
-        processor = CameraProcessor(output_queue=output_queue, camera_source=camera_source)
-        
+        product_id = self.product_id if product_id is None else product_id
+        if camera_id is not None:
+            dados_camera = self.config_loader.load_camera_config(camera_id)
+            if not dados_camera:
+                print(f"Aviso: Câmera {camera_id} não encontrada no banco - usando a fonte {camera_source}.")
+            if fonte_captura is None:
+                fonte_captura = fonte_da_camera(dados_camera) if dados_camera else None
+            if parametros_captura is None:
+                parametros_captura = parametros_da_camera(dados_camera)
+            config_json = dados_camera.get('config_json', {})
+            if mascara is None:
+                mascara = config_json.get('mascara_inferencia')
+            if limiar_movimento is None:
+                limiar_movimento = config_json.get('limiar_movimento')
+                if limiar_movimento is not None and (isinstance(limiar_movimento, bool)
+                                                     or not isinstance(limiar_movimento, (int, float))):
+                    print(f"Aviso: limiar_movimento inválido na câmera {camera_id} ({limiar_movimento!r}) - "
+                          f"usando o padrão.")
+                    limiar_movimento = None
+        anel = AnelQuadros(nome_anel(camera_source), criar=criar_anel)
+        if self.modo == 'processo':
+            camera = CameraRemota(camera_source, product_id, self._nome_produto(product_id), anel, limiar_movimento,
+                                  modo_reproducao, backend_captura, mascara, fonte_captura, parametros_captura)
+            self.processors[camera_source] = {
+                'processor': camera,
+                'anel': anel
+            }
+            if self.running:
+                self._iniciar_processo({camera_source: camera})
+            return
+
+        self._carregar_modelos(self.registro_modelos.adquirir, product_id)
+        processor = CameraProcessor(anel=anel, camera_source=camera_source,
+                                    inference_service=self.inference_service,
+                                    limiar_movimento=limiar_movimento,
+                                    product_id=product_id, product_name=self._nome_produto(product_id),
+                                    modo_reproducao=modo_reproducao, backend_captura=backend_captura,
+                                    mascara=mascara, fonte_captura=fonte_captura,
+                                    parametros_captura=parametros_captura)
+
         self.processors[camera_source] = {
             'processor': processor,
-            'queue': output_queue
+            'anel': anel
         }
+        self._rebalancear_cpu()
+
+    def remove_camera(self, camera_source):
+        """Para e remove uma câmera, liberando seus modelos e seus núcleos."""
+        data = self.processors.pop(camera_source, None)
+        if data is None:
+            return
+        processor = data['processor']
+        if self.modo == 'processo':
+            processo = processor.processo
+            if processo is not None:
+                processor.remover()
+                del processo.cameras[camera_source]
+                if not processo.cameras:
+                    processo.encerrar()
+                    self.processos.remove(processo)
+            data['anel'].fechar()
+            self._rebalancear_cpu()
+            return
+
+        processor.stop()
+        thread = self.threads.pop(camera_source, None)
+        if thread:
+            thread.join()
+        data['anel'].fechar()
+        self.registro_modelos.liberar(processor.product_id)
+        self._rebalancear_cpu()
+
+    def _rebalancear_cpu(self):
+        """Recalcula o orçamento de CPU para as câmeras atuais e o aplica às threads em execução."""
+        if self.modo == 'processo':
+            # Cada worker recebe uma fatia dos núcleos e faz o seu próprio orçamento dentro dela
+            for processo, nucleos in zip(self.processos, self.orcamento_cpu.dividir(len(self.processos))):
+                processo.nucleos = nucleos
+                if processo.processo.is_alive():
+                    try:
+                        processo.enviar('nucleos', nucleos)
+                    except (TimeoutError, EOFError, OSError):
+                        pass  # Worker ainda carregando: aplica a fatia inicial
+            return
+        self.orcamento_cpu.aplicar(
+            list(self.processors),
+            ids_inferencia=self.inference_service.ids_threads(),
+            ids_cameras={source: data['processor'].ids_threads() for source, data in self.processors.items()})
+        for source, data in self.processors.items():
+            data['processor'].nucleos = self.orcamento_cpu.nucleos_da_camera(source)
+
+    def definir_nucleos(self, nucleos):
+        """Restringe este Orchestrator (processo worker) a uma nova fatia de núcleos."""
+        self.orcamento_cpu.nucleos = list(nucleos)
+        self._rebalancear_cpu()
+        return self.orcamento_cpu.get_status()
+
+    def _iniciar_processo(self, cameras):
+        """Cria e inicia um processo worker para o grupo de câmeras."""
+        nucleos = self.orcamento_cpu.dividir(len(self.processos) + 1)
+        processo = ProcessoCameras(cameras, self.product_id, nucleos[-1])
+        self.processos.append(processo)
+        processo.iniciar()
+        print(f"Processo worker (pid {processo.processo.pid}) iniciado para as câmeras {list(cameras)}.")
+        self._rebalancear_cpu()
 
     def start(self):
-        """Inicia todas as threads de processamento de câmera."""
+        """Inicia todas as threads (ou processos worker) de processamento de câmera.
+
+        Não espera as câmeras abrirem: as aberturas rodam em paralelo, fora das
+        threads de captura (ver `reconexao`).
+        """
         self.running = True
-        for source, data in self.processors.items():
-            thread = threading.Thread(target=data['processor'].run, daemon=True)
-            self.threads[source] = thread
-            thread.start()
-            print(f"Thread da câmera {source} iniciada.")
+        if self.modo == 'processo':
+            cameras = list(self.processors.items())
+            por_processo = max(1, EXECUCAO_CONFIG['cameras_por_processo'])
+            for inicio in range(0, len(cameras), por_processo):
+                grupo = {source: data['processor'] for source, data in cameras[inicio:inicio + por_processo]}
+                self._iniciar_processo(grupo)
+            return
+
+        self.inference_service.start()
+        self._rebalancear_cpu()
+        for source in self.processors:
+            self.start_processor(source)
 
     def stop(self):
-        """Para todos os processadores e aguarda as threads finalizarem."""
+        """Para todos os processadores, aguarda as threads (ou processos) e libera os anéis de frames."""
         print("Parando todos os processadores...")
         self.running = False
+        if self.modo == 'processo':
+            for processo in self.processos:
+                processo.encerrar()
+            self.processos = []
+            for data in self.processors.values():
+                data['processor'].processo = None
+        else:
+            for data in self.processors.values():
+                data['processor'].stop()
+
+            for source, thread in self.threads.items():
+                thread.join()
+                print(f"Thread da câmera {source} finalizada.")
+
+            self.inference_service.stop()
+
         for data in self.processors.values():
-            data['processor'].stop()
-        
-        for source, thread in self.threads.items():
-            thread.join()
-            print(f"Thread da câmera {source} finalizada.")
+            data['anel'].fechar()
+
+    def start_processor(self, camera_source):
+        """(Re)inicia o processamento de uma câmera já adicionada."""
+        data = self.processors.get(camera_source)
+        if data is None:
+            raise KeyError(f"Câmera {camera_source} não encontrada")
+        if self.modo == 'processo':
+            data['processor'].iniciar()
+            return
+
+        thread = self.threads.get(camera_source)
+        if thread is not None and thread.is_alive():
+            return
+        data['processor'].should_stop = False
+        thread = threading.Thread(target=data['processor'].run, daemon=True)
+        self.threads[camera_source] = thread
+        thread.start()
+        print(f"Thread da câmera {camera_source} iniciada.")
+
+    def stop_processor(self, camera_source):
+        """Para o processamento de uma câmera sem removê-la (pode ser reiniciada)."""
+        data = self.processors.get(camera_source)
+        if data is None:
+            raise KeyError(f"Câmera {camera_source} não encontrada")
+        data['processor'].stop()
+
+    def trocar_produto(self, camera_source, product_id):
+        """Troca o produto de uma câmera; pesos já em memória não são recarregados."""
+        data = self.processors.get(camera_source)
+        if data is None:
+            raise KeyError(f"Câmera {camera_source} não encontrada")
+        processor = data['processor']
+        if processor.product_id == product_id:
+            return
+        if self.modo == 'thread':
+            # Carrega (se preciso) antes de liberar o produto anterior, que pode ser o mesmo detector
+            self.registro_modelos.adquirir(product_id)
+            self.registro_modelos.liberar(processor.product_id)
+        processor.trocar_produto(product_id, self._nome_produto(product_id))
 
     def get_camera_data(self, camera_source):
-        """Retorna os dados (processador e fila) de uma câmera específica."""
+        """Retorna os dados (processador e anel de frames) de uma câmera específica.
+
+        Cada consumidor deve criar seu próprio leitor com `data['anel'].leitor()`.
+        """
         return self.processors.get(camera_source)
 
     def get_all_cameras_summary(self):
@@ -56,3 +280,37 @@ class Orchestrator:
             data['processor'].get_status()
             for data in self.processors.values()
         ]
+
+    def get_inicializacao_status(self):
+        """Tempos da partida: modelos, abertura e primeiro frame de cada câmera.
+
+        Com as aberturas em paralelo, `cameras_prontas_ms` fica perto da abertura
+        mais lenta e não da soma de todas (`soma_aberturas_ms`).
+        """
+        cameras = {str(source): data['processor'].get_status().get('inicializacao', {})
+                   for source, data in self.processors.items()}
+        aberturas = [t['abertura_ms'] for t in cameras.values() if t.get('abertura_ms') is not None]
+        primeiros = [t['primeiro_frame_ms'] for t in cameras.values() if t.get('primeiro_frame_ms') is not None]
+        return {
+            **self.tempos_inicializacao,
+            "cameras": cameras,
+            "soma_aberturas_ms": round(sum(aberturas), 1),
+            "abertura_mais_lenta_ms": max(aberturas, default=None),
+            "cameras_prontas_ms": max(primeiros) if cameras and len(primeiros) == len(cameras) else None,
+        }
+
+    def get_inference_status(self):
+        """Retorna as métricas do serviço de inferência compartilhado (ou de cada worker)."""
+        if self.modo == 'processo':
+            workers = []
+            for processo in self.processos:
+                try:
+                    status = processo.enviar('inferencia')
+                except (TimeoutError, EOFError, OSError):
+                    status = {"running": False}
+                workers.append({"pid": processo.processo.pid, "cameras": list(processo.cameras),
+                                "nucleos": processo.nucleos, **status})
+            return {"modo": self.modo, "workers": workers}
+        return {"modo": self.modo, **self.inference_service.get_status(),
+                "modelos": self.registro_modelos.get_status(), "cpu": self.orcamento_cpu.get_status(),
+                "inicializacao": self.tempos_inicializacao}
@@ -0,0 +1,154 @@
+import threading
+import time
+
+
+class QuadroCapturado:
+    """Frame da câmera com o instante de captura (time.monotonic(), ou o relógio do
+    vídeo na reprodução) e o número de sequência da captura, que o acompanham até o anel."""
+    __slots__ = ('frame', 'instante', 'sequencia')
+
+    def __init__(self, frame, instante, sequencia):
+        self.frame = frame
+        self.instante = instante
+        self.sequencia = sequencia
+
+
+class CanalUltimoValor:
+    """Ligação entre etapas que guarda apenas o valor mais recente.
+
+    Publicar substitui um valor ainda não consumido: uma etapa lenta recebe
+    sempre o dado mais novo em vez de acumular atraso numa fila. O valor
+    substituído (ou abandonado ao reabrir) é entregue a `ao_descartar`, que
+    devolve o buffer do frame ao PoolQuadros.
+
+    Com `sem_descarte` (reprodução de vídeo em velocidade máxima) quem publica
+    aguarda o valor anterior ser consumido, e nenhum frame é perdido.
+    """
+
+    def __init__(self, ao_descartar=None, sem_descarte=False):
+        self._condicao = threading.Condition()
+        self._ao_descartar = ao_descartar
+        self.sem_descarte = sem_descarte
+        self._valor = None
+        self._tem_valor = False
+        self._fechado = False
+        # --- Métricas ---
+        self.publicados = 0
+        self.descartados = 0
+
+    def publicar(self, valor):
+        with self._condicao:
+            while self.sem_descarte and self._tem_valor and not self._fechado:
+                self._condicao.wait(0.5)
+            if self._tem_valor:
+                self.descartados += 1
+                if self._ao_descartar is not None:
+                    self._ao_descartar(self._valor)
+            self._valor = valor
+            self._tem_valor = True
+            self.publicados += 1
+            self._condicao.notify()
+
+    def consumir(self, timeout=0.5):
+        """Retorna o valor mais recente, ou None se nada chegou em `timeout` (ou o canal fechou)."""
+        with self._condicao:
+            if not self._tem_valor and not self._fechado:
+                self._condicao.wait(timeout)
+            if not self._tem_valor:
+                return None
+            valor, self._valor, self._tem_valor = self._valor, None, False
+            self._condicao.notify_all()  # Libera quem publica sem descarte
+            return valor
+
+    def fechar(self):
+        """Acorda quem aguarda em `consumir` (usado ao parar o pipeline)."""
+        with self._condicao:
+            self._fechado = True
+            self._condicao.notify_all()
+
+    def reabrir(self):
+        with self._condicao:
+            if self._tem_valor and self._ao_descartar is not None:
+                self._ao_descartar(self._valor)
+            self._fechado = False
+            self._valor, self._tem_valor = None, False
+
+
+class PoolQuadros:
+    """Buffers de frame reaproveitados pela captura com `cap.read(image=buffer)`.
+
+    A última etapa que usa o frame (ou o canal que o descarta) o devolve com
+    `devolver`. `alocacoes` conta os frames que a captura teve de alocar: com
+    buffers suficientes em circulação ele para de crescer, ou seja, nenhuma
+    alocação de imagem por frame em regime.
+    """
+
+    def __init__(self):
+        self._livres = []
+        self._lock = threading.Lock()
+        self.alocacoes = 0
+
+    def obter(self):
+        """Um buffer livre, ou None (o `cap.read` aloca um novo)."""
+        with self._lock:
+            return self._livres.pop() if self._livres else None
+
+    def registrar_leitura(self, buffer, frame):
+        """Conta uma alocação quando o `cap.read` não usou o buffer oferecido (ou não havia buffer)."""
+        if frame is not buffer:
+            self.alocacoes += 1
+
+    def devolver(self, frame):
+        with self._lock:
+            self._livres.append(frame)
+
+
+class MedidorOcupacao:
+    """Fração do tempo em que uma etapa está trabalhando, em janelas de `janela` segundos.
+
+    Uso: `with medidor: ...` em volta do trabalho de cada item. Ocupação perto
+    de 1.0 indica a etapa gargalo; as demais passam o resto do tempo aguardando.
+    Antes da primeira janela completa (execuções curtas) as medidas cobrem o
+    tempo desde o primeiro item.
+    """
+
+    def __init__(self, janela=2.0):
+        self.janela = janela
+        self._inicio_janela = None  # Definido no primeiro item
+        self._janela_completa = False
+        self._ocupado_janela = 0.0
+        self._itens_janela = 0
+        self._inicio_item = 0.0
+        self.ocupacao = 0.0
+        self.itens_por_segundo = 0.0
+        self.tempo_medio_ms = 0.0
+
+    def __enter__(self):
+        self._inicio_item = time.perf_counter()
+        if self._inicio_janela is None:
+            self._inicio_janela = self._inicio_item
+        return self
+
+    def __exit__(self, *exc):
+        agora = time.perf_counter()
+        self._ocupado_janela += agora - self._inicio_item
+        self._itens_janela += 1
+        decorrido = agora - self._inicio_janela
+        fechou = decorrido >= self.janela
+        if (fechou or not self._janela_completa) and decorrido > 0:
+            self.ocupacao = min(1.0, self._ocupado_janela / decorrido)
+            self.itens_por_segundo = self._itens_janela / decorrido
+            self.tempo_medio_ms = self._ocupado_janela / self._itens_janela * 1000
+        if fechou:
+            self._janela_completa = True
+            self._inicio_janela = agora
+            self._ocupado_janela = 0.0
+            self._itens_janela = 0
+        return False
+
+    def get_status(self):
+        return {
+            "ocupacao": round(self.ocupacao, 2),
+            "fps": round(self.itens_por_segundo, 1),
+            "ms_por_frame": round(self.tempo_medio_ms, 1),
+        }
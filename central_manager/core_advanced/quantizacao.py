@@ -0,0 +1,137 @@
+"""
+Quantização INT8 (pós-treinamento) dos modelos de produção.
+
+Calibra `item_detector.pt` e `roi_detector.pt` com as imagens dos datasets
+`1_item_counter` e `2_roi_detector`, exporta para o backend `openvino_int8`
+(carregável pelo YOLODetector) e compara com o modelo FP32:
+- mAP50 / mAP50-95 no split de validação de cada dataset;
+- acurácia de contagem fim a fim (itens dentro da ROI) por imagem.
+
+Uso (a partir da raiz do projeto):
+    python -m central_manager.core_advanced.quantizacao
+"""
+
+import argparse
+import os
+import tempfile
+
+import cv2
+import yaml
+from ultralytics import YOLO
+
+from .backends import caminho_exportado, exportar_modelo
+from .camera_processor import filtrar_itens_na_roi
+from .detector import MODELOS, YOLODetector
+
+DATASETS_DIR = '_legacy_prototype/dataset'
+
+# Dataset de calibração/validação de cada modelo de produção
+DATASETS_POR_MODELO = {
+    'item_detector': '1_item_counter',
+    'roi_detector': '2_roi_detector',
+}
+
+BACKEND_INT8 = 'openvino_int8'
+
+
+def _split(dataset_dir, nome):
+    """Usa images/<nome> quando o dataset já foi organizado, senão images/."""
+    return f'images/{nome}' if os.path.isdir(os.path.join(dataset_dir, 'images', nome)) else 'images'
+
+
+def gerar_data_yaml(dataset, destino_dir):
+    """Gera um data.yaml com caminhos absolutos locais (os do repositório apontam para outra máquina)."""
+    dataset_dir = os.path.abspath(os.path.join(DATASETS_DIR, dataset))
+    with open(os.path.join(dataset_dir, 'data.yaml'), 'r', encoding='utf-8') as f:
+        original = yaml.safe_load(f)
+
+    config = {
+        'path': dataset_dir,
+        'train': _split(dataset_dir, 'train'),
+        'val': _split(dataset_dir, 'val'),
+        'nc': original['nc'],
+        'names': original['names'],
+    }
+    caminho = os.path.join(destino_dir, f'{dataset}.yaml')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f)
+    return caminho, os.path.join(dataset_dir, config['val'])
+
+
+def avaliar_map(caminho_modelo, data_yaml, imgsz):
+    """Retorna (mAP50, mAP50-95) do modelo no split de validação."""
+    metricas = YOLO(caminho_modelo, task='detect').val(data=data_yaml, imgsz=imgsz, batch=1,
+                                                       split='val', plots=False, verbose=False)
+    return float(metricas.box.map50), float(metricas.box.map)
+
+
+def avaliar_contagem(imagens_dir, max_imagens):
+    """Compara a contagem de itens na ROI entre o detector FP32 e o INT8, imagem a imagem."""
+    imagens = sorted(f for f in os.listdir(imagens_dir) if f.endswith(('.jpg', '.jpeg', '.png')))[:max_imagens]
+    detector_fp32 = YOLODetector(backend='torch')
+    detector_int8 = YOLODetector(backend=BACKEND_INT8)
+
+    iguais = 0
+    erro_absoluto = 0
+    for nome in imagens:
+        frame = cv2.imread(os.path.join(imagens_dir, nome))
+        if frame is None:
+            continue
+        contagens = []
+        for detector in (detector_fp32, detector_int8):
+            caixas, itens, _ = detector.detectar_objetos(frame)
+            contagens.append(len(filtrar_itens_na_roi(itens, caixas)))
+        iguais += contagens[0] == contagens[1]
+        erro_absoluto += abs(contagens[0] - contagens[1])
+
+    total = len(imagens)
+    return {
+        'imagens': total,
+        'acuracia_contagem': iguais / total if total else 0.0,
+        'erro_medio_absoluto': erro_absoluto / total if total else 0.0,
+    }
+
+
+def quantizar(imgsz=640, max_imagens_contagem=200):
+    """Quantiza os modelos de produção e imprime o relatório FP32 vs INT8."""
+    relatorio = {}
+    imagens_contagem = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome_modelo, dataset in DATASETS_POR_MODELO.items():
+            caminho_pt = MODELOS[nome_modelo]
+            if not os.path.exists(caminho_pt):
+                print(f"[ERRO] Modelo não encontrado: {caminho_pt}")
+                return None
+
+            data_yaml, imagens_val = gerar_data_yaml(dataset, tmp)
+            if nome_modelo == 'item_detector':
+                imagens_contagem = imagens_val
+
+            exportar_modelo(caminho_pt, BACKEND_INT8, imgsz=imgsz, int8=True, data=data_yaml)
+
+            print(f"-- Avaliando {nome_modelo} (FP32 vs INT8) --")
+            relatorio[nome_modelo] = {
+                'fp32': avaliar_map(caminho_pt, data_yaml, imgsz),
+                'int8': avaliar_map(caminho_exportado(caminho_pt, BACKEND_INT8), data_yaml, imgsz),
+            }
+
+    contagem = avaliar_contagem(imagens_contagem, max_imagens_contagem)
+
+    print("\n--- Relatório de Quantização INT8 ---")
+    print(f"{'modelo':<15} {'mAP50 FP32':>11} {'mAP50 INT8':>11} {'mAP FP32':>9} {'mAP INT8':>9}")
+    for nome_modelo, r in relatorio.items():
+        print(f"{nome_modelo:<15} {r['fp32'][0]:>11.3f} {r['int8'][0]:>11.3f} {r['fp32'][1]:>9.3f} {r['int8'][1]:>9.3f}")
+    print(f"\nContagem fim a fim ({contagem['imagens']} imagens): "
+          f"{contagem['acuracia_contagem']:.1%} idênticas ao FP32, "
+          f"erro médio absoluto {contagem['erro_medio_absoluto']:.2f} itens")
+    print(f"\nUse backend='{BACKEND_INT8}' no YOLODetector (ou em produtos.config_json) para carregar os modelos INT8.")
+    return relatorio, contagem
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Quantização INT8 dos modelos de produção calibrada nos datasets do projeto.")
+    parser.add_argument('--imgsz', type=int, default=640, help="Tamanho da imagem usado na exportação e na avaliação.")
+    parser.add_argument('--max-imagens', type=int, default=200, help="Máximo de imagens na avaliação de contagem fim a fim.")
+    args = parser.parse_args()
+
+    quantizar(imgsz=args.imgsz, max_imagens_contagem=args.max_imagens)
@@ -0,0 +1,154 @@
+import numpy as np
+
+from .config import RASTREADOR_CONFIG
+from .deteccoes import Deteccoes
+
+
+def iou_matriz(a, b):
+    """IoU entre todas as caixas de `a` (N, 4) e `b` (M, 4), como matriz (N, M)."""
+    if not len(a) or not len(b):
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    a = a.astype(np.float32)[:, None, :]
+    b = b.astype(np.float32)[None, :, :]
+    largura = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    altura = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    intersecao = largura * altura
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return intersecao / np.maximum(area_a + area_b - intersecao, 1e-6)
+
+
+class RastreadorIoU:
+    """Rastreador leve por IoU (só CPU) que dá IDs estáveis às detecções.
+
+    Em cada keyframe associa detecções às trilhas de forma gulosa pela maior
+    IoU. Entre keyframes, `prever` propaga as caixas pela velocidade estimada
+    de cada trilha.
+    """
+
+    def __init__(self, limiar_iou=0.3, max_idade=2):
+        self.limiar_iou = limiar_iou
+        self.max_idade = max_idade
+        self.proximo_id = 0
+        self.ids = np.empty(0, dtype=np.int32)
+        self.cls = np.empty(0, dtype=np.int32)
+        self.conf = np.empty(0, dtype=np.float32)
+        self.medido = np.empty((0, 4), dtype=np.float32)      # Última caixa medida
+        self.velocidade = np.empty((0, 4), dtype=np.float32)  # Pixels por frame
+        self.frames_desde_medicao = np.empty(0, dtype=np.int32)
+        self.idade = np.empty(0, dtype=np.int32)              # Keyframes sem associação
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _associar(self, deteccoes):
+        """Pares (trilha, detecção) com maior IoU, sem repetir nenhum dos lados."""
+        iou = iou_matriz(self.medido + self.velocidade * self.frames_desde_medicao[:, None], deteccoes.xyxy)
+        iou[self.cls[:, None] != deteccoes.cls[None, :]] = 0.0
+        pares = []
+        if iou.size:
+            trilhas_usadas, deteccoes_usadas = set(), set()
+            for indice in np.argsort(iou, axis=None)[::-1]:
+                t, d = divmod(int(indice), iou.shape[1])
+                if iou[t, d] < self.limiar_iou:
+                    break
+                if t in trilhas_usadas or d in deteccoes_usadas:
+                    continue
+                trilhas_usadas.add(t)
+                deteccoes_usadas.add(d)
+                pares.append((t, d))
+        return pares
+
+    def atualizar(self, deteccoes):
+        """Associa as detecções de um keyframe às trilhas e devolve-as com IDs."""
+        pares = self._associar(deteccoes)
+        ids = np.full(len(deteccoes), -1, dtype=np.int32)
+        associadas = np.zeros(len(self), dtype=bool)
+
+        novo_medido = deteccoes.xyxy.astype(np.float32)
+        for t, d in pares:
+            frames = max(int(self.frames_desde_medicao[t]), 1)
+            self.velocidade[t] = 0.5 * self.velocidade[t] + 0.5 * (novo_medido[d] - self.medido[t]) / frames
+            self.medido[t] = novo_medido[d]
+            self.conf[t] = deteccoes.conf[d]
+            ids[d] = self.ids[t]
+            associadas[t] = True
+
+        self.frames_desde_medicao[:] = 0
+        self.idade[associadas] = 0
+        self.idade[~associadas] += 1
+
+        # Detecções sem trilha abrem novas trilhas
+        novas = ids < 0
+        quantidade = int(novas.sum())
+        ids[novas] = np.arange(self.proximo_id, self.proximo_id + quantidade, dtype=np.int32)
+        self.proximo_id += quantidade
+        self.ids = np.concatenate([self.ids, ids[novas]])
+        self.cls = np.concatenate([self.cls, deteccoes.cls[novas]])
+        self.conf = np.concatenate([self.conf, deteccoes.conf[novas]])
+        self.medido = np.concatenate([self.medido, novo_medido[novas]])
+        self.velocidade = np.concatenate([self.velocidade, np.zeros((quantidade, 4), dtype=np.float32)])
+        self.frames_desde_medicao = np.concatenate([self.frames_desde_medicao, np.zeros(quantidade, dtype=np.int32)])
+        self.idade = np.concatenate([self.idade, np.zeros(quantidade, dtype=np.int32)])
+
+        # Descarta trilhas perdidas há mais de max_idade keyframes
+        vivas = self.idade <= self.max_idade
+        for nome in ('ids', 'cls', 'conf', 'medido', 'velocidade', 'frames_desde_medicao', 'idade'):
+            setattr(self, nome, getattr(self, nome)[vivas])
+
+        return Deteccoes(deteccoes.xyxy, deteccoes.conf, deteccoes.cls, ids)
+
+    def prever(self):
+        """Propaga as trilhas vistas no último keyframe para o frame atual."""
+        self.frames_desde_medicao += 1
+        visiveis = self.idade == 0
+        xyxy = self.medido[visiveis] + self.velocidade[visiveis] * self.frames_desde_medicao[visiveis, None]
+        return Deteccoes(np.rint(xyxy).astype(np.int32), self.conf[visiveis].copy(),
+                         self.cls[visiveis].copy(), self.ids[visiveis].copy())
+
+
+class RastreadorDeteccoes:
+    """Rastreia itens e divisores e decide quando o modelo de itens precisa rodar.
+
+    O modelo de itens roda em keyframes (a cada `intervalo_keyframe` frames);
+    nos demais, itens e divisores vêm das trilhas propagadas.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or RASTREADOR_CONFIG
+        self.habilitado = self.config.get('habilitado', True)
+        self.intervalo_keyframe = max(1, self.config['intervalo_keyframe'])
+        self.itens = RastreadorIoU(self.config['limiar_iou'], self.config['max_idade'])
+        self.divisores = RastreadorIoU(self.config['limiar_iou'], self.config['max_idade'])
+        self.frames_desde_keyframe = self.intervalo_keyframe
+        # --- Métricas ---
+        self.keyframes = 0
+        self.frames_propagados = 0
+
+    def deve_propagar(self):
+        """True se o frame atual pode usar as trilhas em vez do modelo de itens."""
+        return self.habilitado and self.frames_desde_keyframe < self.intervalo_keyframe - 1
+
+    def atualizar(self, itens, divisores):
+        """Keyframe: associa as detecções às trilhas e devolve-as com IDs."""
+        self.frames_desde_keyframe = 0
+        self.keyframes += 1
+        if not self.habilitado:
+            return itens, divisores
+        return self.itens.atualizar(itens), self.divisores.atualizar(divisores)
+
+    def prever(self):
+        """Frame intermediário: itens e divisores propagados pelas trilhas."""
+        self.frames_desde_keyframe += 1
+        self.frames_propagados += 1
+        return self.itens.prever(), self.divisores.prever()
+
+    def get_status(self):
+        return {
+            "habilitado": self.habilitado,
+            "intervalo_keyframe": self.intervalo_keyframe,
+            "trilhas_itens": len(self.itens),
+            "trilhas_divisores": len(self.divisores),
+            "keyframes": self.keyframes,
+            "frames_propagados": self.frames_propagados,
+        }
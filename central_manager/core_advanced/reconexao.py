@@ -0,0 +1,118 @@
+"""
+Abertura e reconexão de câmeras fora da thread de captura.
+
+Cada `cv2.VideoCapture()` roda em um pool de threads compartilhado, então as
+câmeras abrem em paralelo (na partida e nas reconexões) e a thread de captura
+nunca fica presa em uma abertura lenta (RTSP pode levar dezenas de segundos):
+ela só consulta `verificar()` e continua respondendo a stop/status.
+
+Entre tentativas que falham a espera cresce exponencialmente, de
+`espera_inicial` até `espera_maxima`, com jitter para que várias câmeras que
+caíram juntas (ex.: switch reiniciado) não tentem todas no mesmo instante.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import RECONEXAO_CONFIG
+
+_pool_aberturas = None
+_lock_pool = threading.Lock()
+
+
+def _executor():
+    """Pool de aberturas compartilhado por todas as câmeras do processo (criado no primeiro uso)."""
+    global _pool_aberturas
+    with _lock_pool:
+        if _pool_aberturas is None:
+            _pool_aberturas = ThreadPoolExecutor(max_workers=RECONEXAO_CONFIG['aberturas_paralelas'],
+                                                 thread_name_prefix="abertura-camera")
+        return _pool_aberturas
+
+
+def _liberar_se_aberta(futuro):
+    """Fecha uma captura que terminou de abrir depois que a câmera desistiu dela."""
+    if not futuro.cancelled() and futuro.exception() is None and futuro.result() is not None:
+        futuro.result().release()
+
+
+class ReconexaoCamera:
+    """Agenda as aberturas de uma câmera com backoff exponencial e jitter.
+
+    `abrir` é a função que cria a captura (ex.: `CameraProcessor._abrir_captura`).
+    """
+
+    def __init__(self, abrir, config=None):
+        self.abrir = abrir
+        self.config = config or RECONEXAO_CONFIG
+        self._futuro = None
+        self._inicio_tentativa = 0.0
+        self.proxima_tentativa = 0.0  # time.monotonic() da próxima tentativa (0 = imediata)
+        self.tentativas = 0           # Falhas seguidas desde a última conexão
+        # --- Métricas ---
+        self.conexoes = 0
+        self.ultima_abertura_ms = 0.0
+        self.ultima_espera_s = 0.0
+
+    @property
+    def abrindo(self):
+        return self._futuro is not None
+
+    def espera(self):
+        """Segundos até a próxima tentativa após `tentativas` falhas seguidas."""
+        base = min(self.config['espera_maxima'],
+                   self.config['espera_inicial'] * self.config['fator'] ** max(self.tentativas - 1, 0))
+        jitter = self.config['jitter']
+        return base * random.uniform(1 - jitter, 1 + jitter)
+
+    def verificar(self):
+        """Dispara uma abertura se já é hora e retorna a captura quando ela abrir, senão None.
+
+        Nunca bloqueia: a abertura em si roda no pool compartilhado.
+        """
+        agora = time.monotonic()
+        if self._futuro is None:
+            if agora < self.proxima_tentativa:
+                return None
+            self._inicio_tentativa = agora
+            self._futuro = _executor().submit(self.abrir)
+            return None
+        if not self._futuro.done():
+            return None
+
+        futuro, self._futuro = self._futuro, None
+        self.ultima_abertura_ms = (agora - self._inicio_tentativa) * 1000
+        cap = futuro.result() if futuro.exception() is None else None
+        if cap is not None and cap.isOpened():
+            self.tentativas = 0
+            self.conexoes += 1
+            self.proxima_tentativa = 0.0
+            return cap
+        if cap is not None:
+            cap.release()
+        self.tentativas += 1
+        self.ultima_espera_s = self.espera()
+        self.proxima_tentativa = agora + self.ultima_espera_s
+        return None
+
+    def reiniciar(self):
+        """Câmera caiu: a primeira tentativa é imediata, o backoff vale para as seguintes."""
+        self.tentativas = 0
+        self.proxima_tentativa = 0.0
+
+    def cancelar(self):
+        """Abandona uma abertura em andamento (a captura é fechada quando terminar de abrir)."""
+        if self._futuro is not None:
+            self._futuro.add_done_callback(_liberar_se_aberta)
+            self._futuro = None
+
+    def get_status(self):
+        return {
+            "abrindo": self.abrindo,
+            "tentativas": self.tentativas,
+            "proxima_tentativa_s": round(max(0.0, self.proxima_tentativa - time.monotonic()), 1),
+            "ultima_abertura_ms": round(self.ultima_abertura_ms, 1),
+            "conexoes": self.conexoes,
+        }
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .config import DETECTOR_CONFIG, REGISTRO_MODELOS_CONFIG
+from .detector import YOLODetector
+from .simple_logger import SimpleLogger
+
+
+class RegistroModelos:
+    """Detectores por produto (`produtos.id`), carregados sob demanda.
+
+    Os caminhos dos pesos, o backend, o uso do modelo unificado e o tamanho
+    de inferência vêm do `config_json` do produto, ex.:
+
+        {"backend": "onnx", "imgsz": 416, "modelos": {"roi_detector": "...", "item_detector": "..."}}
+
+    Produtos com a mesma especificação compartilham o mesmo detector, então
+    pesos já em memória nunca são recarregados. Detectores que nenhuma câmera
+    está usando são descartados por LRU quando o total passa do orçamento.
+    """
+
+    def __init__(self, config_loader, config=None):
+        self.config_loader = config_loader
+        self.config = config or REGISTRO_MODELOS_CONFIG
+        self.orcamento_bytes = int(self.config['orcamento_memoria_mb'] * 1024 * 1024)
+        self.logger = SimpleLogger("MODELOS")
+        self._lock = threading.RLock()
+        self._detectores = OrderedDict()  # {especificacao: YOLODetector}, do menos para o mais recente
+        self._especificacoes = {}         # {product_id: especificacao}
+        self._em_uso = {}                 # {especificacao: câmeras usando}
+        # --- Métricas ---
+        self.carregamentos = 0
+        self.descartes = 0
+        self.acertos = 0
+
+    def _especificacao(self, product_id):
+        """Chave do detector de um produto: (backend, unificado, imgsz, caminhos)."""
+        if product_id not in self._especificacoes:
+            config_json = self.config_loader.load_product_config(product_id).get('config_json', {})
+            caminhos = tuple(sorted((config_json.get('modelos') or {}).items()))
+            self._especificacoes[product_id] = (
+                config_json.get('backend', DETECTOR_CONFIG['backend']),
+                bool(config_json.get('modelo_unificado', DETECTOR_CONFIG['modelo_unificado'])),
+                config_json.get('imgsz', DETECTOR_CONFIG['imgsz']),
+                caminhos,
+            )
+        return self._especificacoes[product_id]
+
+    def obter(self, product_id):
+        """Retorna o detector do produto, carregando e aquecendo-o na primeira vez."""
+        with self._lock:
+            especificacao = self._especificacao(product_id)
+            detector = self._detectores.get(especificacao)
+            if detector is not None:
+                self._detectores.move_to_end(especificacao)
+                self.acertos += 1
+                return detector
+
+            backend, unificado, imgsz, caminhos = especificacao
+            inicio = time.perf_counter()
+            detector = YOLODetector(backend=backend, modelo_unificado=unificado,
+                                    caminhos=dict(caminhos), imgsz=imgsz)
+            if self.config.get('aquecer', True):
+                detector.aquecer()
+            self.logger.info(f"Modelos do produto {product_id} prontos em "
+                             f"{(time.perf_counter() - inicio) * 1000:.0f}ms")
+
+            self._detectores[especificacao] = detector
+            self.carregamentos += 1
+            self._descartar_excedentes()
+            return detector
+
+    def adquirir(self, product_id):
+        """Marca o detector do produto como em uso por uma câmera (não é descartado)."""
+        with self._lock:
+            especificacao = self._especificacao(product_id)
+            self._em_uso[especificacao] = self._em_uso.get(especificacao, 0) + 1
+        return self.obter(product_id)
+
+    def liberar(self, product_id):
+        """Desfaz um `adquirir`; sem câmeras, o detector passa a poder ser descartado."""
+        with self._lock:
+            especificacao = self._especificacao(product_id)
+            restantes = self._em_uso.get(especificacao, 0) - 1
+            if restantes > 0:
+                self._em_uso[especificacao] = restantes
+            else:
+                self._em_uso.pop(especificacao, None)
+            self._descartar_excedentes()
+
+    def invalidar(self, product_id):
+        """Relê a configuração do produto no próximo `obter` (ex.: modelos trocados no banco)."""
+        with self._lock:
+            self._especificacoes.pop(product_id, None)
+
+    def memoria_em_uso(self):
+        return sum(detector.tamanho_em_bytes() for detector in self._detectores.values())
+
+    def _descartar_excedentes(self):
+        """Descarta detectores sem câmeras, do menos recente, até caber no orçamento.
+
+        O mais recente nunca é descartado: é o que acabou de ser pedido.
+        """
+        for especificacao in list(self._detectores)[:-1]:
+            if self.memoria_em_uso() <= self.orcamento_bytes:
+                break
+            if self._em_uso.get(especificacao):
+                continue
+            del self._detectores[especificacao]
+            self.descartes += 1
+            self.logger.info(f"Modelos descartados da memória: {especificacao}")
+
+    def get_status(self):
+        """Retorna os detectores carregados e os contadores do registro."""
+        with self._lock:
+            return {
+                "detectores_carregados": len(self._detectores),
+                "memoria_mb": round(self.memoria_em_uso() / (1024 * 1024), 1),
+                "orcamento_mb": self.config['orcamento_memoria_mb'],
+                "carregamentos": self.carregamentos,
+                "acertos": self.acertos,
+                "descartes": self.descartes,
+            }
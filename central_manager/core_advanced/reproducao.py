@@ -0,0 +1,88 @@
+"""
+Vídeo gravado como fonte de câmera (testes e benchmark sem câmeras).
+
+Dois modos:
+- 'tempo_real': entrega os frames no FPS nativo do arquivo, reproduzindo o
+  ritmo da produção (frames atrasados são descartados como numa câmera real);
+- 'maxima': o mais rápido que decodificação + inferência permitem, sem
+  descartar frames (o CameraProcessor usa canais sem descarte).
+
+Em ambos o instante de cada frame vem do relógio do vídeo (índice / FPS), não
+do relógio do sistema: os timers do state manager e do agendador veem o mesmo
+tempo em qualquer velocidade, e a reprodução é determinística.
+"""
+
+import os
+import time
+
+import cv2
+
+from .config import REPRODUCAO_CONFIG
+
+EXTENSOES_VIDEO = ('.mp4', '.avi', '.mkv', '.mov', '.m4v', '.webm')
+
+
+def eh_arquivo_video(camera_source):
+    """True se a fonte da câmera é um arquivo de vídeo gravado."""
+    return (isinstance(camera_source, str) and camera_source.lower().endswith(EXTENSOES_VIDEO)
+            and os.path.isfile(camera_source))
+
+
+class ReproducaoVideo:
+    """Interface de `cv2.VideoCapture` (read/isOpened/get/release) sobre um arquivo, com relógio do vídeo."""
+
+    def __init__(self, caminho, modo=None, repetir=None):
+        self.caminho = caminho
+        self.modo = modo or REPRODUCAO_CONFIG['modo']
+        if self.modo not in ('tempo_real', 'maxima'):
+            raise ValueError(f"Modo de reprodução inválido: {self.modo}")
+        self.repetir = REPRODUCAO_CONFIG['repetir'] if repetir is None else repetir
+        self.cap = cv2.VideoCapture(caminho)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or REPRODUCAO_CONFIG['fps_padrao']
+        self.indice = 0              # Frames entregues (contínuo entre repetições)
+        self.terminou = False
+        self.instante = None         # Instante (relógio do vídeo) do último frame lido
+        self._origem = None          # Instante do frame 0, fixado na primeira leitura
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, propriedade):
+        return self.cap.get(propriedade)
+
+    def set(self, propriedade, valor):
+        return self.cap.set(propriedade, valor)
+
+    def read(self, image=None):
+        ret, frame = self.cap.read(image=image)
+        if not ret and self.repetir and self.indice:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(image=image)
+        if not ret:
+            self.terminou = True
+            return False, None
+
+        # Relógio do vídeo, no mesmo domínio de time.monotonic(): a reprodução começa no primeiro
+        # frame entregue, não na abertura (o tempo até as etapas ficarem prontas não vira atraso)
+        if self._origem is None:
+            self._origem = time.monotonic()
+        self.instante = self._origem + self.indice / self.fps
+        self.indice += 1
+        if self.modo == 'tempo_real':
+            atraso = self.instante - time.monotonic()
+            if atraso > 0:
+                time.sleep(atraso)
+        return True, frame
+
+    def release(self):
+        self.cap.release()
+
+    def get_status(self):
+        return {
+            "arquivo": self.caminho,
+            "modo": self.modo,
+            "fps_nativo": round(self.fps, 2),
+            "frames_lidos": self.indice,
+            "tempo_video_s": round(self.indice / self.fps, 2),
+            "terminou": self.terminou,
+        }
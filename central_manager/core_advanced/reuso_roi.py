@@ -0,0 +1,92 @@
+import cv2
+
+from .config import REUSO_ROI_CONFIG
+from .rastreador import iou_matriz
+
+
+class ReusoROI:
+    """Reaproveita a ROI (caixa) enquanto ela está parada, pulando o modelo de ROI.
+
+    A caixa quase não se move enquanto o operador a enche. Com a ROI estável
+    no state manager e duas inferências seguidas das mesmas caixas (cada uma
+    com IoU >= `limiar_iou` com uma caixa da inferência anterior), as caixas
+    da última inferência são reaproveitadas e o modelo de ROI só volta a
+    rodar a cada `intervalo` frames, ou antes se a região de qualquer caixa
+    mudar (diferença absoluta média do recorte reduzido, em cinza, >=
+    `limiar_movimento`).
+    """
+
+    def __init__(self, config=None):
+        self.config = config or REUSO_ROI_CONFIG
+        self.habilitado = self.config.get('habilitado', True)
+        self.intervalo = self.config['intervalo']
+        self.limiar_movimento = self.config['limiar_movimento']
+        self.limiar_iou = self.config['limiar_iou']
+        self.largura_reduzida = self.config['largura_reduzida']
+        self._caixas = None        # Caixas da última inferência do modelo de ROI
+        self._referencias = None   # Recorte reduzido de cada caixa nessa inferência
+        self._caixa_parada = False
+        self._frames_desde_roi = 0
+        # --- Métricas ---
+        self.frames_roi_inferidos = 0
+        self.frames_roi_reaproveitados = 0
+        self.ultima_diferenca = 0.0
+
+    def _recorte_reduzido(self, frame, caixa):
+        altura, largura = frame.shape[:2]
+        x1, y1, x2, y2 = caixa.tolist()
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(largura, x2), min(altura, y2)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        altura_reduzida = max(1, int((y2 - y1) * self.largura_reduzida / (x2 - x1)))
+        pequeno = cv2.resize(frame[y1:y2, x1:x2], (self.largura_reduzida, altura_reduzida),
+                             interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(pequeno, cv2.COLOR_BGR2GRAY) if pequeno.ndim == 3 else pequeno
+
+    def reaproveitar(self, frame, roi_estavel):
+        """Caixas em cache se o modelo de ROI pode ser pulado neste frame, senão None."""
+        if (not self.habilitado or not roi_estavel or not self._caixa_parada or self._referencias is None
+                or self._frames_desde_roi + 1 >= self.intervalo):
+            return None
+
+        # Qualquer caixa que mudou (ou saiu) obriga a rodar o modelo de ROI
+        self.ultima_diferenca = 0.0
+        for caixa, referencia in zip(self._caixas.xyxy, self._referencias):
+            atual = self._recorte_reduzido(frame, caixa)
+            if atual is None or atual.shape != referencia.shape:
+                return None
+            self.ultima_diferenca = max(self.ultima_diferenca, float(cv2.absdiff(atual, referencia).mean()))
+            if self.ultima_diferenca >= self.limiar_movimento:
+                return None
+
+        self._frames_desde_roi += 1
+        self.frames_roi_reaproveitados += 1
+        return self._caixas
+
+    def memorizar(self, frame, caixas):
+        """Guarda as caixas de uma inferência do modelo de ROI neste frame."""
+        self.frames_roi_inferidos += 1
+        self._frames_desde_roi = 0
+        if not self.habilitado:
+            return
+        referencias = [self._recorte_reduzido(frame, caixa) for caixa in caixas.xyxy]
+        if not len(caixas) or any(referencia is None for referencia in referencias):
+            self._caixas = self._referencias = None
+            self._caixa_parada = False
+            return
+        # Paradas: mesmo número de caixas e cada uma casa com alguma caixa da inferência anterior
+        self._caixa_parada = bool(self._caixas is not None and len(self._caixas) == len(caixas) and
+                                  (iou_matriz(caixas.xyxy, self._caixas.xyxy).max(axis=1) >= self.limiar_iou).all())
+        self._caixas = caixas
+        self._referencias = referencias
+
+    def get_status(self):
+        """Retorna se a caixa está parada e os contadores do modelo de ROI."""
+        return {
+            "habilitado": self.habilitado,
+            "caixa_parada": self._caixa_parada,
+            "ultima_diferenca": round(self.ultima_diferenca, 2),
+            "frames_roi_inferidos": self.frames_roi_inferidos,
+            "frames_roi_reaproveitados": self.frames_roi_reaproveitados,
+        }
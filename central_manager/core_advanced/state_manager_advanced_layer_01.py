@@ -1,8 +1,14 @@
 import time
 from collections import deque
-import math
 import traceback
 
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # Sem SciPy a memória espacial usa só a matriz de distâncias (em blocos)
+    cKDTree = None
+
 from .config import STATE_CONFIG
 from .simple_logger import SimpleLogger
 
@@ -31,7 +37,10 @@ class SimpleStateManager:
         
         # MEMÓRIA ESPACIAL (do legacy)
         self.usar_memoria_espacial = True
-        self.posicoes_itens_por_camada = {}  # {camada: [(x1,y1,x2,y2), ...]}
+        self.posicoes_itens_por_camada = {}  # {camada: (centros (N, 2) float32, IDs de trilha (N,))}
+        # Todas as camadas memorizadas juntas, para uma única comparação vetorizada
+        self._memoria_centros = np.empty((0, 2), dtype=np.float32)
+        self._memoria_ids = np.empty(0, dtype=np.int32)
         
         # DETECÇÃO DE SALTOS (do legacy)
         self.salto_suspeito_detectado = False
@@ -55,6 +64,13 @@ class SimpleStateManager:
         self.tempo_ultimo_divisor_estavel = None  # Quando divisor ficou estável
         self.tempo_ultima_perda_divisor = None    # Quando divisor foi perdido
         self.divisor_estava_presente_frame_anterior = False  # Estado anterior do divisor
+
+        # Instante e sequência de captura do frame em processamento (ver atualizar_estado)
+        self.instante_atual = None
+        self.sequencia_atual = None
+        # Transições e alertas, com o frame que os causou (latência captura -> alarme)
+        self.eventos = deque(maxlen=20)
+        self.eventos_total = 0
         
         self.logger.info("StateManager AVANÇADO inicializado com memória espacial, detecção de saltos e validação por divisor")
     
@@ -75,6 +91,10 @@ class SimpleStateManager:
         
         return roi_estavel, contagem_estabilizada, divisor_estavel
     
+    def roi_estabilizada(self):
+        """True se todos os frames do buffer de estabilização viram a ROI (ver ReusoROI)."""
+        return len(self.buffer_roi) == self.buffer_roi.maxlen and all(self.buffer_roi)
+    
     def _verificar_itens_novos(self, itens_atuais):
         """
         MEMÓRIA ESPACIAL: Verifica quais itens são realmente novos comparando com camadas anteriores
@@ -83,51 +103,74 @@ class SimpleStateManager:
         if not self.usar_memoria_espacial or not self.posicoes_itens_por_camada:
             return itens_atuais  # Se não tem memória, considera todos novos
         
-        itens_novos = []
-        
-        for item_atual in itens_atuais:
-            x1_atual, y1_atual, x2_atual, y2_atual = item_atual[0]  # Coordenadas
-            centro_atual = ((x1_atual + x2_atual) / 2, (y1_atual + y2_atual) / 2)
-            
-            eh_novo = True
-            
-            # Comparar com itens de todas as camadas anteriores
-            for camada_anterior, itens_anteriores in self.posicoes_itens_por_camada.items():
-                if not eh_novo:
-                    break
-                    
-                for item_anterior in itens_anteriores:
-                    x1_ant, y1_ant, x2_ant, y2_ant = item_anterior[0]  # Coordenadas
-                    centro_anterior = ((x1_ant + x2_ant) / 2, (y1_ant + y2_ant) / 2)
-                    
-                    # Calcular distância euclidiana entre os centros
-                    distancia = math.sqrt(
-                        (centro_atual[0] - centro_anterior[0]) ** 2 + 
-                        (centro_atual[1] - centro_anterior[1]) ** 2
-                    )
-                    
-                    if distancia < self.config['distancia_minima_item_novo']:
-                        # Item muito próximo de um item anterior, não é novo
-                        eh_novo = False
-                        self.logger.debug(f"Item descartado (distância {distancia:.1f}px da camada {camada_anterior})")
-                        break
-                
-                if not eh_novo:
-                    break
-            
-            if eh_novo:
-                itens_novos.append(item_atual)
-                self.logger.debug(f"Item novo confirmado: centro {centro_atual}")
-        
+        eh_novo = np.ones(len(itens_atuais), dtype=bool)
+        
+        # Itens rastreados cuja trilha já pertence a uma camada anterior não são novos
+        ids_memorizados = self._memoria_ids[self._memoria_ids >= 0]
+        if len(ids_memorizados):
+            eh_novo[(itens_atuais.ids >= 0) & np.isin(itens_atuais.ids, ids_memorizados)] = False
+        
+        # Itens a menos de `distancia_minima_item_novo` de um item memorizado (qualquer camada) não são novos
+        indices = np.flatnonzero(eh_novo)
+        atuais, anteriores, distancias = self._pares_proximos(itens_atuais.centros()[indices].astype(np.float32))
+        if self.config['atribuicao_um_para_um']:
+            # Cada item memorizado "absorve" no máximo um item atual (o mais próximo primeiro)
+            usados_atuais, usados_anteriores = set(), set()
+            for par in np.argsort(distancias, kind='stable'):
+                a, b = int(atuais[par]), int(anteriores[par])
+                if a in usados_atuais or b in usados_anteriores:
+                    continue
+                usados_atuais.add(a)
+                usados_anteriores.add(b)
+            atuais = np.fromiter(usados_atuais, dtype=np.intp, count=len(usados_atuais))
+        eh_novo[indices[atuais]] = False
+        
+        itens_novos = itens_atuais[eh_novo]
         self.logger.info(f"Memória espacial: {len(itens_novos)}/{len(itens_atuais)} itens são novos")
         return itens_novos
     
+    def _pares_proximos(self, centros):
+        """Pares (índice atual, índice memorizado, distância) abaixo de `distancia_minima_item_novo`.
+
+        Matriz de distâncias vetorizada; acima de `limite_pares_memoria` pares,
+        KD-tree (SciPy) ou a mesma matriz em blocos de linhas.
+        """
+        limite = self.config['distancia_minima_item_novo']
+        memoria = self._memoria_centros
+        if not len(centros) or not len(memoria):
+            vazio = np.empty(0, dtype=np.intp)
+            return vazio, vazio, np.empty(0, dtype=np.float32)
+        
+        pares = len(centros) * len(memoria)
+        if pares > self.config['limite_pares_memoria'] and cKDTree is not None:
+            resultado = cKDTree(centros).sparse_distance_matrix(cKDTree(memoria), limite, output_type='ndarray')
+            proximos = resultado['v'] < limite  # sparse_distance_matrix inclui a distância igual ao limite
+            return (resultado['i'][proximos].astype(np.intp), resultado['j'][proximos].astype(np.intp),
+                    resultado['v'][proximos].astype(np.float32))
+        
+        linhas_por_bloco = max(1, self.config['limite_pares_memoria'] // len(memoria))
+        atuais, anteriores, distancias = [], [], []
+        for inicio in range(0, len(centros), linhas_por_bloco):
+            diferencas = centros[inicio:inicio + linhas_por_bloco, None, :] - memoria[None, :, :]
+            quadrados = np.einsum('ijk,ijk->ij', diferencas, diferencas)
+            a, b = np.nonzero(quadrados < limite * limite)
+            atuais.append(a + inicio)
+            anteriores.append(b)
+            distancias.append(np.sqrt(quadrados[a, b]))
+        return np.concatenate(atuais), np.concatenate(anteriores), np.concatenate(distancias)
+    
+    def _memorizar_camada(self, camada, itens):
+        """Guarda os centros (e IDs de trilha) dos itens de uma camada concluída."""
+        self.posicoes_itens_por_camada[camada] = (itens.centros().astype(np.float32), itens.ids.copy())
+        self._memoria_centros = np.concatenate([c for c, _ in self.posicoes_itens_por_camada.values()])
+        self._memoria_ids = np.concatenate([i for _, i in self.posicoes_itens_por_camada.values()])
+    
     def _atualizar_status_divisor(self, divisor_presente):
         """
         Atualiza o rastreamento do status do divisor para validação de saltos.
         Deve ser chamado a cada frame para manter histórico preciso.
         """
-        tempo_atual = time.time()
+        tempo_atual = self._agora()
         
         # Detectar mudança no status do divisor
         if divisor_presente != self.divisor_estava_presente_frame_anterior:
@@ -166,7 +209,7 @@ class SimpleStateManager:
                 self.logger.debug("🔍 Validação por divisor desabilitada")
                 return 'validar'  # Funcionalidade desabilitada
             
-            tempo_atual = time.time()
+            tempo_atual = self._agora()
             self.logger.debug(f"🔍 tempo_atual obtido: {tempo_atual}")
             
             tempo_estavel_minimo = self.config.get('tempo_divisor_estavel_minimo', 3.0)
@@ -230,7 +273,7 @@ class SimpleStateManager:
         - 5+ itens: Considera camada estabelecida, divisor pode ser ocultado
         - < 5 itens após estabelecida: Volta a exigir divisor com carência
         """
-        tempo_atual = time.time()
+        tempo_atual = self._agora()
         
         # VERIFICAR MODO LIVRE PRIMEIRO - se ativo, ignorar todas as validações
         if hasattr(self, 'camada_2_modo_livre') and self.camada_2_modo_livre:
@@ -308,7 +351,7 @@ class SimpleStateManager:
         DETECÇÃO DE SALTOS: Detecta mudanças bruscas na contagem (falsos positivos)
         Lógica híbrida como no legacy original
         """
-        tempo_atual = time.time()
+        tempo_atual = self._agora()
         
         # PROCESSAMENTO DE SALTO SUSPEITO EM VALIDAÇÃO
         if self.salto_suspeito_detectado:
@@ -383,10 +426,21 @@ class SimpleStateManager:
         if self.status_sistema != novo_estado:
             self.logger.info(f"TRANSIÇÃO: {self.status_sistema} → {novo_estado} - {motivo}")
             self.status_sistema = novo_estado
+            self._registrar_evento('transicao', novo_estado)
+
+    def _registrar_evento(self, tipo, detalhe):
+        """Guarda o evento com o instante/sequência de captura do frame que o causou."""
+        self.eventos.append({
+            'tipo': tipo,
+            'detalhe': detalhe,
+            'instante_captura': self.instante_atual,
+            'sequencia_captura': self.sequencia_atual,
+        })
+        self.eventos_total += 1
     
     def _pode_alertar(self, tipo_alerta, intervalo_minimo=3.0):
         """Controle de debounce para alertas"""
-        tempo_atual = time.time()
+        tempo_atual = self._agora()
         
         if (self.ultimo_alerta_tipo == tipo_alerta and 
             self.ultimo_alerta_tempo and 
@@ -395,6 +449,7 @@ class SimpleStateManager:
         
         self.ultimo_alerta_tempo = tempo_atual
         self.ultimo_alerta_tipo = tipo_alerta
+        self._registrar_evento('alerta', tipo_alerta)
         return True
     
     def _voltar_para_aguardar_divisor(self):
@@ -431,9 +486,21 @@ class SimpleStateManager:
         self.tempo_inicio_salto_suspeito = None
         self.itens_salto_suspeito = []
     
-    def atualizar_estado(self, roi_presente, itens_detectados, divisores_detectados):
-        """Atualiza estado com lógica avançada (memória espacial + detecção de saltos)"""
-        tempo_atual = time.time()
+    def _agora(self):
+        """Instante do frame em processamento; sem ele, o relógio do sistema."""
+        return time.time() if self.instante_atual is None else self.instante_atual
+
+    def atualizar_estado(self, roi_presente, itens_detectados, divisores_detectados, instante=None, sequencia=None):
+        """Atualiza estado com lógica avançada (memória espacial + detecção de saltos)
+
+        `instante` é o instante de captura do frame (ex.: relógio do vídeo na
+        reprodução): todos os timers usam ele, e não a hora do processamento.
+        Um chamador deve passá-lo sempre ou nunca (os relógios não se misturam).
+        `sequencia` (número do frame na captura) identifica o frame nos eventos.
+        """
+        self.instante_atual = instante
+        self.sequencia_atual = sequencia
+        tempo_atual = self._agora()
         
         # Atualizar buffers
         self.buffer_roi.append(1 if roi_presente else 0)
@@ -524,7 +591,7 @@ class SimpleStateManager:
                 
                 # Camada válida - armazenar na memória espacial
                 if self.usar_memoria_espacial:
-                    self.posicoes_itens_por_camada[self.camada_atual] = itens_detectados.copy()
+                    self._memorizar_camada(self.camada_atual, itens_detectados)
                     self.logger.info(f"📍 Posições da camada {self.camada_atual} armazenadas: {len(itens_detectados)} itens")
                 
                 self.contagens_por_camada[self.camada_atual] = self.contagem_estabilizada
@@ -581,6 +648,8 @@ class SimpleStateManager:
         
         # Reset da memória espacial e detecção de saltos
         self.posicoes_itens_por_camada.clear()
+        self._memoria_centros = np.empty((0, 2), dtype=np.float32)
+        self._memoria_ids = np.empty(0, dtype=np.int32)
         self.salto_suspeito_detectado = False
         
         # Reset do modo livre da camada 2
@@ -627,5 +696,6 @@ class SimpleStateManager:
             'contagem_atual': self.contagem_estabilizada,
             'meta_camada': self.PERFIL_CAIXA['itens_por_camada'],
             'total_itens': total_itens,
-            'camadas': self.contagens_por_camada.copy()
+            'camadas': self.contagens_por_camada.copy(),
+            'ultimo_evento': self.eventos[-1] if self.eventos else None
         }
\ No newline at end of file
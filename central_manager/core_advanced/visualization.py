@@ -17,23 +17,20 @@ class Visualizer:
         """Inicializa o visualizador com um conjunto de cores."""
         self.colors = colors if colors else CORES_LEGACY
 
-    def desenhar_deteccoes(self, frame, caixas, itens, divisores):
-        """Desenha as detecções no frame (ROI, itens, divisores)."""
+    def desenhar_deteccoes(self, frame, caixas, itens, divisores, rotulos=None):
+        """Desenha as detecções no frame (ROI, itens, divisores); `rotulos` (um por ROI) substitui "ROI"."""
         # Desenhar ROI
-        for coords, conf in caixas:
-            x1, y1, x2, y2 = coords
+        for indice, (x1, y1, x2, y2) in enumerate(caixas.xyxy.tolist()):
             cv2.rectangle(frame, (x1, y1), (x2, y2), self.colors['roi'], 3)
-            cv2.putText(frame, "ROI", (x1, y1 - 8),
+            cv2.putText(frame, rotulos[indice] if rotulos else "ROI", (x1, y1 - 8),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, self.colors['roi'], 2)
 
         # Desenhar Itens
-        for coords, conf in itens:
-            x1, y1, x2, y2 = coords
+        for x1, y1, x2, y2 in itens.xyxy.tolist():
             cv2.rectangle(frame, (x1, y1), (x2, y2), self.colors['item'], 2)
 
         # Desenhar Divisores
-        for coords, conf in divisores:
-            x1, y1, x2, y2 = coords
+        for x1, y1, x2, y2 in divisores.xyxy.tolist():
             cv2.rectangle(frame, (x1, y1), (x2, y2), self.colors['divisor'], 2)
             cv2.putText(frame, "DIV", (x1, y1 - 8),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.3, self.colors['divisor'], 1)
@@ -45,12 +42,11 @@ class Visualizer:
         panel_x = width - panel_width - 10
         panel_y = 10
 
-        # Fundo semi-transparente
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y),
-                      (panel_x + panel_width, panel_y + panel_height),
-                      (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Fundo semi-transparente: escurece só o retângulo do painel, no próprio frame
+        # (equivale a misturar 70% de preto, sem copiar a imagem inteira)
+        fundo = frame[max(panel_y, 0):panel_y + panel_height + 1, max(panel_x, 0):panel_x + panel_width + 1]
+        if fundo.size:
+            cv2.convertScaleAbs(fundo, dst=fundo, alpha=0.3)
 
         # Borda
         cv2.rectangle(frame, (panel_x, panel_y),
@@ -3,27 +3,83 @@ Config Loader Compartilhado
 Carrega configurações do banco SQL dinamicamente
 """
 
+import json
+import sqlite3
+from pathlib import Path
+
+DB_PATH_PADRAO = Path(__file__).resolve().parent.parent / "database" / "siac_industrial.db"
+
+
 class ConfigLoader:
     """
     Carregador de configurações dinâmicas do banco SQL.
     Substitui as configurações estáticas do legacy.
     """
-    
-    def __init__(self):
-        # TODO: Implementar conexão com banco
-        pass
-    
+
+    def __init__(self, db_path: str = None):
+        self.db_path = str(db_path or DB_PATH_PADRAO)
+
+    def _buscar_linha(self, tabela: str, registro_id) -> dict:
+        """Busca um registro por ID e decodifica o campo `config_json`."""
+        if not Path(self.db_path).exists():
+            return {}
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute(f"SELECT * FROM {tabela} WHERE id = ?", (registro_id,)).fetchone()
+        except sqlite3.Error:
+            return {}
+        finally:
+            conn.close()
+        if row is None:
+            return {}
+
+        dados = dict(row)
+        try:
+            dados['config_json'] = json.loads(dados.get('config_json') or '{}')
+        except ValueError:
+            dados['config_json'] = {}
+        return dados
+
     def load_product_config(self, product_id: str) -> dict:
         """Carrega configuração de um produto específico do banco"""
-        # TODO: Implementar
-        pass
-    
+        return self._buscar_linha("produtos", product_id)
+
+    def save_product_config_json(self, product_id: str, valores: dict) -> dict:
+        """Mescla `valores` no `config_json` de um produto e retorna o JSON resultante"""
+        config_json = self.load_product_config(product_id).get('config_json', {})
+        config_json.update(valores)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE produtos SET config_json = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (json.dumps(config_json), product_id))
+            if cursor.rowcount == 0:
+                raise KeyError(f"Produto {product_id} não encontrado")
+        finally:
+            conn.close()
+        return config_json
+
     def load_sector_config(self, sector_id: str) -> dict:
         """Carrega configuração de um setor específico do banco"""
         # TODO: Implementar
         pass
-    
+
     def load_camera_config(self, camera_id: str) -> dict:
-        """Carrega configuração de uma câmera específica do banco"""
-        # TODO: Implementar
-        pass
+        """Carrega configuração de uma câmera específica do banco (fonte, resolução, fps, config_json)"""
+        return self._buscar_linha("cameras", camera_id)
+
+    def find_camera_ids(self, device_index: int) -> list:
+        """IDs das câmeras ativas do banco com o índice USB `device_index`"""
+        if not Path(self.db_path).exists():
+            return []
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute("SELECT id FROM cameras WHERE device_index = ? AND ativo ORDER BY id",
+                                (device_index,)).fetchall()
+        except sqlite3.Error:
+            return []
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
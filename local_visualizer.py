@@ -4,7 +4,6 @@ Evolução incremental: Câmera + YOLO + StateManager industrial
 """
 
 import cv2
-from queue import Empty
 
 from central_manager.core_advanced.orchestrator import Orchestrator
 
@@ -19,6 +18,7 @@ def main():
     orchestrator.add_camera(camera_source)
     orchestrator.start()
 
+    leitor = None
     try:
         # Loop principal para visualização e controle
         while True:
@@ -27,15 +27,12 @@ def main():
                 print(f"Erro: Não foi possível obter dados para a câmera {camera_source}")
                 break
 
-            try:
-                # Tenta pegar o último frame da fila sem bloquear
-                data = camera_data['queue'].get_nowait()
-                frame = data['frame']
-                cv2.imshow(f'SIAC - Câmera {camera_source}', frame)
-
-            except Empty:
-                # Fila vazia, o que é normal. Continue para o próximo ciclo.
-                pass
+            if leitor is None:
+                leitor = camera_data['anel'].leitor()
+            # Pega o frame mais recente do anel sem bloquear (None se não há frame novo)
+            quadro = leitor.proximo(timeout=0)
+            if quadro is not None:
+                cv2.imshow(f'SIAC - Câmera {camera_source}', quadro.frame)
             
             # Controle por teclado
             key = cv2.waitKey(1) & 0xFF
@@ -49,7 +46,7 @@ def main():
             elif key == ord('d'):
                 processor.detection_enabled = not processor.detection_enabled
             elif key == ord('r'):
-                processor.state_manager._resetar_sistema()
+                processor.resetar_contagem()
                 print(f"\n🔄 StateManager da câmera {camera_source} resetado pelo usuário.")
 
     except KeyboardInterrupt:
@@ -0,0 +1,71 @@
+import pytest
+
+from central_manager.core_advanced.agendador import AgendadorInferencia
+
+CONFIG = {
+    'habilitado': True,
+    'politicas': {
+        'AGUARDANDO_CAIXA': {'taxa_hz': 2.0, 'modelos': 'roi', 'roi_esperada': False},
+        'CAIXA_COMPLETA': {'taxa_hz': 4.0, 'modelos': 'roi', 'roi_esperada': True},
+        'CONTANDO_ITENS': {'taxa_hz': None, 'modelos': 'todos'},
+    },
+    'politica_padrao': {'taxa_hz': None, 'modelos': 'todos'},
+}
+
+
+@pytest.fixture
+def agendador():
+    return AgendadorInferencia(config=CONFIG, tamanho_buffer=3)
+
+
+def test_estado_ocioso_limita_a_taxa_e_roda_so_a_roi(agendador):
+    assert agendador.decidir('AGUARDANDO_CAIXA', agora=10.0) == 'roi'
+    assert agendador.decidir('AGUARDANDO_CAIXA', agora=10.2) is None
+    assert agendador.decidir('AGUARDANDO_CAIXA', agora=10.5) == 'roi'
+    assert (agendador.frames_inferidos, agendador.frames_pulados) == (2, 1)
+
+
+def test_estado_sem_taxa_roda_todos_os_frames(agendador):
+    assert [agendador.decidir('CONTANDO_ITENS', agora=10.0 + i * 0.01) for i in range(3)] == ['todos'] * 3
+
+
+def test_estado_desconhecido_usa_a_politica_padrao(agendador):
+    assert agendador.decidir('ESTADO_NOVO', agora=1.0) == 'todos'
+
+
+def test_mudanca_de_cena_ativa_rajada_na_taxa_cheia(agendador):
+    agendador.decidir('AGUARDANDO_CAIXA', agora=10.0)
+    agendador.registrar(roi_presente=True)  # Caixa chegou: diverge de roi_esperada=False
+    decisoes = []
+    for i in range(4):
+        decisoes.append(agendador.decidir('AGUARDANDO_CAIXA', agora=10.01 + i * 0.01))
+        agendador.registrar(roi_presente=False)
+    # A rajada dura `tamanho_buffer` frames e depois a taxa volta a valer
+    assert decisoes == ['roi', 'roi', 'roi', None]
+
+
+def test_desabilitado_sempre_roda_todos():
+    agendador = AgendadorInferencia(config={**CONFIG, 'habilitado': False})
+    assert agendador.decidir('AGUARDANDO_CAIXA', agora=0.0) == 'todos'
+    assert agendador.decidir('AGUARDANDO_CAIXA', agora=0.0) == 'todos'
+
+
+def test_varias_caixas_usam_a_politica_mais_exigente(agendador):
+    # Uma caixa ociosa e outra contando: taxa cheia e todos os modelos
+    assert agendador.decidir(['CAIXA_COMPLETA', 'CONTANDO_ITENS'], agora=10.0) == 'todos'
+    assert agendador.decidir(['CAIXA_COMPLETA', 'CONTANDO_ITENS'], agora=10.01) == 'todos'
+    assert agendador.politica_atual['taxa_hz'] is None
+
+
+def test_combinacao_usa_a_maior_taxa_e_descarta_roi_esperada_divergente(agendador):
+    politica = agendador._politica(['AGUARDANDO_CAIXA', 'CAIXA_COMPLETA'])
+    assert politica == {'taxa_hz': 4.0, 'modelos': 'roi', 'roi_esperada': None}
+
+
+def test_combinacao_mantem_roi_esperada_em_comum(agendador):
+    politica = agendador._politica(['CAIXA_COMPLETA', 'CAIXA_COMPLETA'])
+    assert politica['roi_esperada'] is True and politica['taxa_hz'] == 4.0
+
+
+def test_lista_com_um_estado_equivale_ao_estado(agendador):
+    assert agendador._politica(['AGUARDANDO_CAIXA']) == agendador._politica('AGUARDANDO_CAIXA')
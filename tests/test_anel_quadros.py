@@ -0,0 +1,117 @@
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+from central_manager.core_advanced.anel_quadros import AnelQuadros, nome_anel
+
+
+@pytest.fixture
+def anel():
+    anel = AnelQuadros(f"siac_teste_{os.getpid()}_{uuid.uuid4().hex[:8]}", slots=4, tamanho_slot=4 * 6 * 3)
+    yield anel
+    if not anel.fechado:
+        anel.fechar()
+
+
+def _frame(valor, forma=(4, 6, 3)):
+    return np.full(forma, valor, dtype=np.uint8)
+
+
+def test_nome_anel_previsivel():
+    assert nome_anel('/tmp/v.avi') == 'siac_tmp_v_avi'
+    assert nome_anel(0) == 'siac_0'
+
+
+def test_escrever_e_ler():
+    anel = AnelQuadros(f"siac_teste_{os.getpid()}_{uuid.uuid4().hex[:8]}", slots=4, tamanho_slot=64)
+    try:
+        sequencia = anel.escrever(_frame(7, (4, 4, 3)), 12.5, sequencia_captura=42)
+        quadro = anel.ler(sequencia)
+        assert sequencia == 1 and anel.ultima_sequencia == 1
+        assert quadro.frame.shape == (4, 4, 3) and (quadro.frame == 7).all()
+        assert quadro.instante_captura == 12.5 and quadro.sequencia_captura == 42
+        assert not quadro.frame.flags.writeable
+        del quadro
+    finally:
+        anel.fechar()
+
+
+def test_frame_grande_demais_nao_e_escrito(anel):
+    assert anel.escrever(_frame(1, (10, 10, 3)), 0.0) == 0
+    assert anel.frames_grandes_demais == 1
+    assert anel.ultima_sequencia == 0
+
+
+def test_slot_sobrescrito_deixa_de_ser_valido(anel):
+    primeira = anel.escrever(_frame(1), 0.0)
+    assert anel.valido(primeira)
+    for valor in range(2, 2 + anel.slots):
+        anel.escrever(_frame(valor), 0.0)
+    assert not anel.valido(primeira)
+    assert anel.ler(primeira) is None
+    assert anel.ler(anel.ultima_sequencia) is not None
+
+
+def test_slot_em_escrita_e_ignorado_ate_confirmar(anel):
+    anel.escrever(_frame(1), 0.0)
+    destino = anel.reservar((4, 6, 3))
+    destino[:] = 9
+    # A sequência reservada não está publicada e o slot está marcado como em escrita
+    assert anel.ultima_sequencia == 1
+    assert anel.ler(2) is None
+    sequencia = anel.confirmar(3.0, 5)
+    quadro = anel.ler(sequencia)
+    assert sequencia == 2 and (quadro.frame == 9).all() and quadro.sequencia_captura == 5
+
+
+def test_leitores_tem_cursores_independentes(anel):
+    leitor_a, leitor_b = anel.leitor(), anel.leitor()
+    anel.escrever(_frame(1), 0.0)
+    assert leitor_a.proximo(timeout=0).sequencia == 1
+    anel.escrever(_frame(2), 0.0)
+    anel.escrever(_frame(3), 0.0)
+    # Cada leitor salta para o frame mais novo, sem consumir o do outro
+    assert leitor_a.proximo(timeout=0).sequencia == 3
+    assert leitor_b.proximo(timeout=0).sequencia == 3
+    assert leitor_a.frames_pulados == 1
+    assert leitor_a.proximo(timeout=0) is None
+
+
+def test_leitor_todos_segue_a_sequencia(anel):
+    leitor = anel.leitor()
+    anel.escrever(_frame(1), 0.0)
+    assert leitor.proximo(timeout=0, todos=True).sequencia == 1
+    for valor in range(2, 5):
+        anel.escrever(_frame(valor), 0.0)
+    assert [leitor.proximo(timeout=0, todos=True).sequencia for _ in range(3)] == [2, 3, 4]
+    assert leitor.frames_pulados == 0
+
+
+def test_leitor_todos_pula_o_que_ja_saiu_do_anel(anel):
+    leitor = anel.leitor()
+    anel.escrever(_frame(1), 0.0)
+    leitor.proximo(timeout=0, todos=True)
+    for valor in range(2, 12):
+        anel.escrever(_frame(valor), 0.0)
+    # Mantém um slot de margem antes do próximo a ser sobrescrito
+    assert leitor.proximo(timeout=0, todos=True).sequencia == 11 - anel.slots + 2
+
+
+def test_conexao_de_outro_handle_ve_os_frames(anel):
+    anel.escrever(_frame(5), 1.0)
+    conectado = AnelQuadros(anel.nome, criar=False)
+    try:
+        assert conectado.slots == anel.slots and conectado.tamanho_slot == anel.tamanho_slot
+        quadro = conectado.leitor().proximo(timeout=0)
+        assert (quadro.frame == 5).all()
+        del quadro
+    finally:
+        conectado.fechar()
+
+
+def test_leitor_para_com_o_anel_fechado(anel):
+    leitor = anel.leitor()
+    anel.fechar()
+    assert leitor.proximo(timeout=None) is None
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from central_manager.core_advanced.deteccoes import Deteccoes
+from central_manager.core_advanced.mascara import MascaraInferencia
+
+
+def _deteccoes(*caixas):
+    return Deteccoes(np.array(caixas, dtype=np.int32).reshape(-1, 4), np.full(len(caixas), 0.9, dtype=np.float32),
+                     np.zeros(len(caixas), dtype=np.int32))
+
+
+def _frame(altura=100, largura=200):
+    return np.arange(altura * largura * 3, dtype=np.uint32).astype(np.uint8).reshape(altura, largura, 3)
+
+
+def test_retangulo_em_fracao_recorta_sem_copiar():
+    mascara = MascaraInferencia({'retangulo': [0.25, 0.0, 0.75, 0.5]})
+    frame = _frame()
+    recorte = mascara.aplicar(frame)
+    assert mascara.regiao == (50, 0, 150, 50)
+    assert recorte.shape == (50, 100, 3)
+    assert np.shares_memory(recorte, frame)
+    assert mascara.fracao_area == pytest.approx(0.25)
+
+
+def test_retangulo_em_pixels():
+    mascara = MascaraInferencia({'retangulo': [10, 20, 60, 80], 'pixels': True})
+    mascara.aplicar(_frame())
+    assert mascara.regiao == (10, 20, 60, 80)
+
+
+def test_regiao_e_recortada_aos_limites_do_frame():
+    mascara = MascaraInferencia({'retangulo': [-0.5, -0.5, 0.5, 2.0]})
+    assert mascara.aplicar(_frame()).shape == (100, 100, 3)
+    assert mascara.regiao == (0, 0, 100, 100)
+
+
+def test_poligono_zera_o_exterior():
+    mascara = MascaraInferencia({'poligono': [[0, 0], [100, 0], [0, 100]], 'pixels': True})
+    entrada = mascara.aplicar(np.full((100, 200, 3), 255, dtype=np.uint8))
+    assert entrada.shape == (100, 100, 3)
+    assert entrada[5, 5].tolist() == [255, 255, 255]
+    assert entrada[95, 95].tolist() == [0, 0, 0]
+
+
+def test_restaurar_leva_ao_frame_e_filtra_fora_do_poligono():
+    mascara = MascaraInferencia({'poligono': [[50, 0], [150, 0], [50, 100]], 'pixels': True})
+    mascara.aplicar(_frame())
+    dentro, fora = [5, 5, 15, 15], [85, 85, 95, 95]
+    caixas, itens, divisores = mascara.restaurar((_deteccoes(dentro, fora), _deteccoes(fora), Deteccoes()))
+    assert caixas.xyxy.tolist() == [[55, 5, 65, 15]]
+    assert len(itens) == 0 and len(divisores) == 0
+
+
+def test_restaurar_no_retangulo_so_desloca():
+    mascara = MascaraInferencia({'retangulo': [20, 10, 120, 90], 'pixels': True})
+    mascara.aplicar(_frame())
+    caixas, = mascara.restaurar((_deteccoes([0, 0, 10, 10], [90, 70, 100, 80]),))
+    assert caixas.xyxy.tolist() == [[20, 10, 30, 20], [110, 80, 120, 90]]
+
+
+def test_nova_resolucao_refaz_a_regiao():
+    mascara = MascaraInferencia({'retangulo': [0.5, 0.5, 1.0, 1.0]})
+    mascara.aplicar(_frame(100, 200))
+    mascara.aplicar(_frame(50, 60))
+    assert mascara.regiao == (30, 25, 60, 50)
+
+
+@pytest.mark.parametrize('definicao', [{}, {'poligono': [[0, 0], [1, 1]]}])
+def test_definicao_invalida(definicao):
+    with pytest.raises(ValueError):
+        MascaraInferencia(definicao)
+
+
+def test_mascara_fora_do_frame():
+    mascara = MascaraInferencia({'retangulo': [300, 300, 400, 400], 'pixels': True})
+    with pytest.raises(ValueError):
+        mascara.aplicar(_frame())
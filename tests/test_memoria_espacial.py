@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from central_manager.core_advanced import state_manager_advanced_layer_01 as modulo
+from central_manager.core_advanced.config import STATE_CONFIG
+from central_manager.core_advanced.deteccoes import Deteccoes
+from central_manager.core_advanced.state_manager_advanced_layer_01 import SimpleStateManager
+
+
+def _itens(centros, ids=None, lado=10):
+    centros = np.asarray(centros, dtype=np.int32).reshape(-1, 2)
+    xyxy = np.concatenate([centros - lado // 2, centros + lado // 2], axis=1).astype(np.int32)
+    return Deteccoes(xyxy, np.full(len(centros), 0.9, dtype=np.float32), np.zeros(len(centros), dtype=np.int32),
+                     None if ids is None else np.asarray(ids, dtype=np.int32))
+
+
+def _state_manager(**config):
+    state_manager = SimpleStateManager()
+    state_manager.config = {**STATE_CONFIG, 'distancia_minima_item_novo': 50,
+                            'atribuicao_um_para_um': False, **config}
+    return state_manager
+
+
+def _centros_novos(state_manager, itens):
+    return state_manager._verificar_itens_novos(itens).centros().tolist()
+
+
+def test_sem_memoria_todos_os_itens_sao_novos():
+    state_manager = _state_manager()
+    assert len(state_manager._verificar_itens_novos(_itens([[10, 10], [200, 200]]))) == 2
+
+
+def test_itens_perto_de_uma_camada_anterior_nao_sao_novos():
+    state_manager = _state_manager()
+    state_manager._memorizar_camada(1, _itens([[100, 100]]))
+    assert _centros_novos(state_manager, _itens([[110, 100], [300, 300]])) == [[300.0, 300.0]]
+
+
+def test_distancia_igual_ao_limite_conta_como_nova():
+    state_manager = _state_manager()
+    state_manager._memorizar_camada(1, _itens([[100, 100]]))
+    assert len(state_manager._verificar_itens_novos(_itens([[150, 100]]))) == 1
+
+
+def test_memoria_junta_todas_as_camadas():
+    state_manager = _state_manager()
+    state_manager._memorizar_camada(1, _itens([[100, 100]]))
+    state_manager._memorizar_camada(2, _itens([[400, 100]]))
+    assert _centros_novos(state_manager, _itens([[100, 105], [405, 100], [250, 250]])) == [[250.0, 250.0]]
+
+
+def test_trilha_de_camada_anterior_nao_e_nova_mesmo_longe():
+    state_manager = _state_manager()
+    state_manager._memorizar_camada(1, _itens([[100, 100]], ids=[7]))
+    itens = _itens([[500, 500], [600, 600]], ids=[7, 8])
+    assert state_manager._verificar_itens_novos(itens).ids.tolist() == [8]
+
+
+def test_um_para_um_cada_item_memorizado_absorve_um_so_item():
+    itens = _itens([[100, 100], [120, 100]])
+    # Sem atribuição um-para-um, os dois itens perto do mesmo item memorizado deixam de ser novos
+    state_manager = _state_manager()
+    state_manager._memorizar_camada(1, _itens([[105, 100]]))
+    assert len(state_manager._verificar_itens_novos(itens)) == 0
+
+    state_manager = _state_manager(atribuicao_um_para_um=True)
+    state_manager._memorizar_camada(1, _itens([[105, 100]]))
+    # O mais próximo é absorvido, o outro é novo
+    assert _centros_novos(state_manager, itens) == [[120.0, 100.0]]
+
+
+def test_um_para_um_nao_reusa_item_atual():
+    state_manager = _state_manager(atribuicao_um_para_um=True)
+    state_manager._memorizar_camada(1, _itens([[100, 100], [110, 100]]))
+    assert _centros_novos(state_manager, _itens([[105, 100], [400, 400]])) == [[400.0, 400.0]]
+
+
+@pytest.mark.parametrize('limite_pares', [1, 7, 65536])
+def test_blocos_dao_o_mesmo_resultado_que_a_matriz_inteira(monkeypatch, limite_pares):
+    monkeypatch.setattr(modulo, 'cKDTree', None)
+    gerador = np.random.default_rng(0)
+    memoria = gerador.integers(0, 1000, size=(40, 2))
+    atuais = gerador.integers(0, 1000, size=(60, 2))
+
+    referencia = _state_manager()
+    referencia._memorizar_camada(1, _itens(memoria))
+    esperado = _centros_novos(referencia, _itens(atuais))
+
+    state_manager = _state_manager(limite_pares_memoria=limite_pares)
+    state_manager._memorizar_camada(1, _itens(memoria))
+    assert _centros_novos(state_manager, _itens(atuais)) == esperado
+    # Confere com a definição: nenhum item novo a menos de 50 px da memória
+    distancias = np.linalg.norm(np.asarray(esperado)[:, None, :] - memoria[None, :, :], axis=2)
+    assert (distancias >= 50).all()
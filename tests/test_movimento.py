@@ -0,0 +1,59 @@
+import numpy as np
+
+from central_manager.core_advanced.movimento import PortaoMovimento
+
+CONFIG = {'habilitado': True, 'limiar': 3.0, 'largura_reduzida': 16, 'max_frames_reaproveitados': 2}
+
+
+def _frame(valor):
+    return np.full((48, 64, 3), valor, dtype=np.uint8)
+
+
+def test_sem_cache_a_inferencia_roda():
+    assert PortaoMovimento(config=CONFIG).reaproveitar(_frame(0)) is None
+
+
+def test_cena_estatica_reaproveita_o_resultado():
+    portao = PortaoMovimento(config=CONFIG)
+    portao.reaproveitar(_frame(100))
+    portao.memorizar('resultado')
+    assert portao.reaproveitar(_frame(101)) == 'resultado'
+    assert portao.frames_reaproveitados == 1
+
+
+def test_cena_em_movimento_forca_inferencia():
+    portao = PortaoMovimento(config=CONFIG)
+    portao.reaproveitar(_frame(100))
+    portao.memorizar('resultado')
+    assert portao.reaproveitar(_frame(120)) is None
+    assert portao.ultima_diferenca == 20.0
+
+
+def test_limiar_por_camera_substitui_o_padrao():
+    portao = PortaoMovimento(limiar=30.0, config=CONFIG)
+    portao.reaproveitar(_frame(100))
+    portao.memorizar('resultado')
+    assert portao.reaproveitar(_frame(120)) == 'resultado'
+
+
+def test_maximo_de_frames_reaproveitados_seguidos():
+    portao = PortaoMovimento(config=CONFIG)
+    portao.reaproveitar(_frame(100))
+    portao.memorizar('resultado')
+    decisoes = [portao.reaproveitar(_frame(100)) for _ in range(3)]
+    assert decisoes == ['resultado', 'resultado', None]
+
+
+def test_cache_sem_itens_nao_serve_a_quem_pede_itens():
+    portao = PortaoMovimento(config=CONFIG)
+    portao.reaproveitar(_frame(100), com_itens=False)
+    portao.memorizar('so_roi', com_itens=False)
+    assert portao.reaproveitar(_frame(100), com_itens=True) is None
+    assert portao.reaproveitar(_frame(100), com_itens=False) == 'so_roi'
+
+
+def test_desabilitado_nunca_reaproveita():
+    portao = PortaoMovimento(config={**CONFIG, 'habilitado': False})
+    portao.reaproveitar(_frame(100))
+    portao.memorizar('resultado')
+    assert portao.reaproveitar(_frame(100)) is None
@@ -0,0 +1,66 @@
+import numpy as np
+
+from central_manager.core_advanced.deteccoes import Deteccoes
+from central_manager.core_advanced.multicaixa import GerenciadorCaixas, atribuir_a_caixas
+
+CONFIG = {'habilitado': True, 'max_caixas': 2, 'limiar_iou': 0.3, 'max_idade': 1}
+
+
+def _deteccoes(*caixas):
+    return Deteccoes(np.array(caixas, dtype=np.int32).reshape(-1, 4), np.full(len(caixas), 0.9, dtype=np.float32),
+                     np.zeros(len(caixas), dtype=np.int32))
+
+
+def test_atribui_cada_deteccao_a_caixa_que_contem_o_centro():
+    caixas = _deteccoes([0, 0, 100, 100], [200, 0, 300, 100])
+    itens = _deteccoes([10, 10, 20, 20], [250, 40, 260, 50], [150, 40, 160, 50])
+    assert atribuir_a_caixas(itens, caixas).tolist() == [0, 1, -1]
+
+
+def test_caixas_sobrepostas_ficam_com_a_menor():
+    caixas = _deteccoes([0, 0, 200, 200], [40, 40, 80, 80])
+    itens = _deteccoes([50, 50, 60, 60], [150, 150, 160, 160])
+    assert atribuir_a_caixas(itens, caixas).tolist() == [1, 0]
+
+
+def test_sem_caixas_ou_sem_deteccoes():
+    assert atribuir_a_caixas(_deteccoes([0, 0, 10, 10]), Deteccoes()).tolist() == [-1]
+    assert atribuir_a_caixas(Deteccoes(), _deteccoes([0, 0, 10, 10])).tolist() == []
+
+
+def test_sem_caixas_o_estado_e_o_do_gerenciador_ocioso():
+    gerenciador = GerenciadorCaixas(CONFIG)
+    assert gerenciador.estados() == ['AGUARDANDO_CAIXA']
+    assert gerenciador.principal() is gerenciador._ocioso
+
+
+def test_um_state_manager_por_caixa_rastreada():
+    gerenciador = GerenciadorCaixas(CONFIG)
+    caixas = _deteccoes([0, 0, 100, 100], [200, 0, 300, 100])
+    itens = _deteccoes([10, 10, 20, 20], [250, 40, 260, 50])
+    com_ids, _ = gerenciador.atualizar(caixas, itens, Deteccoes(), instante=0.0)
+    assert com_ids.ids.tolist() == [0, 1]
+    assert sorted(gerenciador.state_managers) == [0, 1]
+    assert len(gerenciador.estados()) == 2
+    # A mesma caixa no frame seguinte mantém o ID e o state manager
+    state_manager = gerenciador.state_managers[1]
+    com_ids, _ = gerenciador.atualizar(_deteccoes([202, 0, 302, 100]), Deteccoes(), Deteccoes(), instante=0.1)
+    assert com_ids.ids.tolist() == [1]
+    assert gerenciador.state_managers[1] is state_manager
+    assert gerenciador.caixas_vistas == 2
+
+
+def test_caixa_sai_de_cena_apos_max_idade():
+    gerenciador = GerenciadorCaixas(CONFIG)
+    gerenciador.atualizar(_deteccoes([0, 0, 100, 100]), Deteccoes(), Deteccoes(), instante=0.0)
+    gerenciador.atualizar(Deteccoes(), Deteccoes(), Deteccoes(), instante=0.1)
+    assert list(gerenciador.state_managers) == [0]
+    gerenciador.atualizar(Deteccoes(), Deteccoes(), Deteccoes(), instante=0.2)
+    assert gerenciador.state_managers == {}
+
+
+def test_limita_a_max_caixas():
+    gerenciador = GerenciadorCaixas(CONFIG)
+    caixas = _deteccoes([0, 0, 10, 10], [20, 0, 30, 10], [40, 0, 50, 10])
+    com_ids, _ = gerenciador.atualizar(caixas, Deteccoes(), Deteccoes(), instante=0.0)
+    assert len(com_ids) == 2 and len(gerenciador.state_managers) == 2
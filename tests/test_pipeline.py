@@ -0,0 +1,103 @@
+import threading
+import time
+
+import numpy as np
+
+from central_manager.core_advanced.pipeline import CanalUltimoValor, MedidorOcupacao, PoolQuadros
+
+
+def test_canal_entrega_o_valor_mais_recente_e_descarta_o_anterior():
+    descartados = []
+    canal = CanalUltimoValor(ao_descartar=descartados.append)
+    canal.publicar(1)
+    canal.publicar(2)
+    assert canal.consumir(timeout=0) == 2
+    assert descartados == [1]
+    assert (canal.publicados, canal.descartados) == (2, 1)
+    assert canal.consumir(timeout=0) is None
+
+
+def test_canal_consumir_aguarda_publicacao():
+    canal = CanalUltimoValor()
+    threading.Timer(0.05, canal.publicar, args=('frame',)).start()
+    assert canal.consumir(timeout=2.0) == 'frame'
+
+
+def test_canal_fechado_acorda_quem_consome():
+    canal = CanalUltimoValor()
+    threading.Timer(0.05, canal.fechar).start()
+    inicio = time.monotonic()
+    assert canal.consumir(timeout=5.0) is None
+    assert time.monotonic() - inicio < 1.0
+
+
+def test_canal_sem_descarte_aguarda_o_consumo():
+    canal = CanalUltimoValor(sem_descarte=True)
+    canal.publicar(1)
+    publicou = threading.Event()
+
+    def publicar_segundo():
+        canal.publicar(2)
+        publicou.set()
+
+    threading.Thread(target=publicar_segundo, daemon=True).start()
+    assert not publicou.wait(0.1)
+    assert canal.consumir(timeout=0) == 1
+    assert publicou.wait(2.0)
+    assert canal.consumir(timeout=0) == 2
+    assert canal.descartados == 0
+
+
+def test_canal_sem_descarte_fechado_libera_quem_publica():
+    # Regressão: stop() com a etapa seguinte já parada deixava a captura presa em publicar()
+    descartados = []
+    canal = CanalUltimoValor(ao_descartar=descartados.append, sem_descarte=True)
+    canal.publicar(1)
+    publicador = threading.Thread(target=canal.publicar, args=(2,), daemon=True)
+    publicador.start()
+    canal.fechar()
+    publicador.join(2.0)
+    assert not publicador.is_alive()
+    assert descartados == [1]
+
+
+def test_canal_reabrir_devolve_o_valor_abandonado():
+    descartados = []
+    canal = CanalUltimoValor(ao_descartar=descartados.append)
+    canal.publicar('antigo')
+    canal.fechar()
+    canal.reabrir()
+    assert descartados == ['antigo']
+    assert canal.consumir(timeout=0) is None
+
+
+def test_pool_reaproveita_buffers_devolvidos():
+    pool = PoolQuadros()
+    assert pool.obter() is None
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    pool.registrar_leitura(None, frame)
+    pool.devolver(frame)
+    buffer = pool.obter()
+    assert buffer is frame
+    pool.registrar_leitura(buffer, buffer)
+    assert pool.alocacoes == 1
+
+
+def test_medidor_mede_execucoes_mais_curtas_que_a_janela():
+    medidor = MedidorOcupacao(janela=60.0)
+    for _ in range(5):
+        with medidor:
+            time.sleep(0.01)
+    status = medidor.get_status()
+    assert status['ocupacao'] > 0.5
+    assert status['fps'] > 0
+    assert status['ms_por_frame'] >= 10.0
+
+
+def test_medidor_ocupacao_parcial():
+    medidor = MedidorOcupacao(janela=0.05)
+    for _ in range(6):
+        with medidor:
+            time.sleep(0.01)
+        time.sleep(0.01)
+    assert 0.2 < medidor.ocupacao < 0.8
@@ -0,0 +1,73 @@
+import numpy as np
+
+from central_manager.core_advanced.deteccoes import Deteccoes
+from central_manager.core_advanced.rastreador import RastreadorDeteccoes, RastreadorIoU, iou_matriz
+
+
+def _deteccoes(*caixas, cls=0):
+    return Deteccoes(np.array(caixas, dtype=np.int32).reshape(-1, 4), np.full(len(caixas), 0.9, dtype=np.float32),
+                     np.full(len(caixas), cls, dtype=np.int32))
+
+
+def test_iou_matriz():
+    a = np.array([[0, 0, 10, 10], [20, 20, 30, 30]])
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10]])
+    iou = iou_matriz(a, b)
+    assert iou.shape == (2, 2)
+    np.testing.assert_allclose(iou[0], [1.0, 50 / 150], rtol=1e-6)
+    np.testing.assert_allclose(iou[1], [0.0, 0.0])
+    assert iou_matriz(a, np.empty((0, 4))).shape == (2, 0)
+
+
+def test_ids_estaveis_entre_keyframes():
+    rastreador = RastreadorIoU(limiar_iou=0.3, max_idade=2)
+    primeiro = rastreador.atualizar(_deteccoes([0, 0, 10, 10], [50, 50, 60, 60]))
+    segundo = rastreador.atualizar(_deteccoes([52, 51, 62, 61], [1, 0, 11, 10]))
+    assert primeiro.ids.tolist() == [0, 1]
+    assert segundo.ids.tolist() == [1, 0]
+
+
+def test_classes_diferentes_nao_se_associam():
+    rastreador = RastreadorIoU()
+    rastreador.atualizar(_deteccoes([0, 0, 10, 10], cls=0))
+    assert rastreador.atualizar(_deteccoes([0, 0, 10, 10], cls=1)).ids.tolist() == [1]
+
+
+def test_associacao_um_para_um():
+    rastreador = RastreadorIoU(limiar_iou=0.1)
+    rastreador.atualizar(_deteccoes([0, 0, 10, 10]))
+    # Duas detecções sobre a mesma trilha: só a de maior IoU herda o ID
+    ids = rastreador.atualizar(_deteccoes([1, 0, 11, 10], [0, 0, 10, 10])).ids.tolist()
+    assert sorted(ids) == [0, 1] and ids[1] == 0
+
+
+def test_trilha_perdida_e_descartada_apos_max_idade():
+    rastreador = RastreadorIoU(max_idade=1)
+    rastreador.atualizar(_deteccoes([0, 0, 10, 10]))
+    rastreador.atualizar(Deteccoes())
+    assert len(rastreador) == 1
+    rastreador.atualizar(Deteccoes())
+    assert len(rastreador) == 0
+
+
+def test_prever_propaga_pela_velocidade():
+    rastreador = RastreadorIoU()
+    rastreador.atualizar(_deteccoes([0, 0, 10, 10]))
+    rastreador.atualizar(_deteccoes([4, 0, 14, 10]))  # Velocidade suavizada: 2 px/frame em x
+    previsto = rastreador.prever()
+    assert previsto.ids.tolist() == [0]
+    assert previsto.xyxy.tolist() == [[6, 0, 16, 10]]
+
+
+def test_keyframes_a_cada_intervalo():
+    rastreador = RastreadorDeteccoes(config={'habilitado': True, 'intervalo_keyframe': 3,
+                                             'limiar_iou': 0.3, 'max_idade': 2})
+    decisoes = []
+    for _ in range(6):
+        if rastreador.deve_propagar():
+            rastreador.prever()
+            decisoes.append('propagado')
+        else:
+            rastreador.atualizar(_deteccoes([0, 0, 10, 10]), Deteccoes())
+            decisoes.append('keyframe')
+    assert decisoes == ['keyframe', 'propagado', 'propagado'] * 2
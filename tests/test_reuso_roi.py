@@ -0,0 +1,83 @@
+import numpy as np
+
+from central_manager.core_advanced.deteccoes import Deteccoes
+from central_manager.core_advanced.reuso_roi import ReusoROI
+
+CONFIG = {'habilitado': True, 'intervalo': 4, 'limiar_movimento': 6.0, 'limiar_iou': 0.9, 'largura_reduzida': 8}
+
+
+def _caixas(*caixas):
+    return Deteccoes(np.array(caixas, dtype=np.int32).reshape(-1, 4), np.full(len(caixas), 0.9, dtype=np.float32),
+                     np.zeros(len(caixas), dtype=np.int32))
+
+
+def _frame():
+    return np.full((100, 200, 3), 50, dtype=np.uint8)
+
+
+def _parado(caixas, frame=None):
+    """Reuso com duas inferências seguidas das mesmas caixas (caixa parada)."""
+    reuso = ReusoROI(CONFIG)
+    frame = _frame() if frame is None else frame
+    reuso.memorizar(frame, caixas)
+    reuso.memorizar(frame, caixas)
+    return reuso
+
+
+def test_caixa_parada_e_reaproveitada():
+    caixas = _caixas([10, 10, 60, 60])
+    reuso = _parado(caixas)
+    assert reuso.get_status()['caixa_parada']
+    assert reuso.reaproveitar(_frame(), roi_estavel=True) is caixas
+
+
+def test_uma_inferencia_so_nao_basta():
+    reuso = ReusoROI(CONFIG)
+    reuso.memorizar(_frame(), _caixas([10, 10, 60, 60]))
+    assert reuso.reaproveitar(_frame(), roi_estavel=True) is None
+
+
+def test_roi_instavel_no_state_manager_roda_o_modelo():
+    assert _parado(_caixas([10, 10, 60, 60])).reaproveitar(_frame(), roi_estavel=False) is None
+
+
+def test_caixa_que_se_moveu_nao_esta_parada():
+    reuso = ReusoROI(CONFIG)
+    reuso.memorizar(_frame(), _caixas([10, 10, 60, 60]))
+    reuso.memorizar(_frame(), _caixas([30, 10, 80, 60]))
+    assert not reuso.get_status()['caixa_parada']
+
+
+def test_mudanca_na_regiao_forca_o_modelo():
+    reuso = _parado(_caixas([10, 10, 60, 60]))
+    frame = _frame()
+    frame[10:60, 10:60] = 200
+    assert reuso.reaproveitar(frame, roi_estavel=True) is None
+
+
+def test_intervalo_forca_o_modelo():
+    reuso = _parado(_caixas([10, 10, 60, 60]))
+    decisoes = [reuso.reaproveitar(_frame(), roi_estavel=True) is not None for _ in range(4)]
+    assert decisoes == [True, True, True, False]
+
+
+def test_qualquer_caixa_que_mudou_forca_o_modelo():
+    # Regressão: só a primeira caixa em cache era conferida
+    reuso = _parado(_caixas([10, 10, 60, 60], [120, 10, 170, 60]))
+    frame = _frame()
+    frame[10:60, 120:170] = 200
+    assert reuso.reaproveitar(frame, roi_estavel=True) is None
+    assert reuso.reaproveitar(_frame(), roi_estavel=True) is not None
+
+
+def test_numero_de_caixas_diferente_nao_esta_parado():
+    reuso = ReusoROI(CONFIG)
+    reuso.memorizar(_frame(), _caixas([10, 10, 60, 60]))
+    reuso.memorizar(_frame(), _caixas([10, 10, 60, 60], [120, 10, 170, 60]))
+    assert not reuso.get_status()['caixa_parada']
+
+
+def test_sem_caixas_limpa_o_cache():
+    reuso = _parado(_caixas([10, 10, 60, 60]))
+    reuso.memorizar(_frame(), Deteccoes())
+    assert reuso.reaproveitar(_frame(), roi_estavel=True) is None